@@ -3,6 +3,7 @@
 from .cli import cli
 from .edition import Bedrock, BlockShape, Edition, Java
 from .options import DEFAULTS, EditionType, Options, TextureOptions, VersionType
+from .version import Version, VersionKind
 
 __all__ = [
     'DEFAULTS',
@@ -13,6 +14,8 @@ __all__ = [
     'Java',
     'Options',
     'TextureOptions',
+    'Version',
+    'VersionKind',
     'VersionType',
     'cli',
     'texts',
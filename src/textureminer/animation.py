@@ -0,0 +1,201 @@
+"""Animated textures described by `.png.mcmeta` files."""
+
+import json
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from io import BytesIO
+
+from PIL import Image as Pil_Image
+
+from textureminer import texts
+from textureminer.imaging import save_png
+
+TICK_MS = 50
+"""Length of a game tick in milliseconds, the unit of frame times."""
+
+ANIMATION_FORMATS: Mapping[str, str] = {
+    'apng': '.apng',
+    'webp': '.webp',
+    'sheet': '.sheet.png',
+}
+"""Animation export formats mapped to the suffix that replaces ".png" in the file name."""
+
+
+@dataclass
+class Animation:
+    """An animated texture with each distinct frame decoded once.
+
+    Attributes
+    ----------
+        frames (list[Pil_Image.Image]): distinct frames of the animation
+        sequence (list[tuple[int, int]]): index in `frames` and time in ticks of each frame shown
+        interpolate (bool): whether frames blend into the next one over their time
+
+    """
+
+    frames: list[Pil_Image.Image]
+    sequence: list[tuple[int, int]]
+    interpolate: bool = False
+    _scaled: dict[int, list[Pil_Image.Image]] = field(default_factory=dict, repr=False)
+
+    @classmethod
+    def from_strip(cls, strip: Pil_Image.Image, mcmeta: Mapping) -> 'Animation':
+        """Split a frame strip into an animation.
+
+        Args:
+        ----
+            strip (Pil_Image.Image): texture with the frames stacked from top to bottom
+            mcmeta (Mapping): contents of the ".png.mcmeta" file of the texture
+
+        Raises:
+        ------
+            ValueError: if the file does not describe an animation of the texture
+
+        Returns:
+        -------
+            Animation: the animation with identical frames stored once
+
+        """
+        meta = mcmeta.get('animation')
+        if meta is None:
+            raise ValueError(texts.ERROR_ANIMATION_INVALID)
+
+        strip = strip.convert('RGBA')
+        frame_width = int(meta.get('width', strip.width))
+        frame_height = int(meta.get('height', frame_width))
+        columns = strip.width // frame_width
+        frame_count = columns * (strip.height // frame_height)
+        if frame_count == 0:
+            raise ValueError(texts.ERROR_ANIMATION_INVALID)
+
+        frame_time = int(meta.get('frametime', 1))
+        entries = meta.get('frames') or range(frame_count)
+
+        frames: list[Pil_Image.Image] = []
+        distinct: dict[bytes, int] = {}
+        decoded: dict[int, int] = {}
+        sequence: list[tuple[int, int]] = []
+        for entry in entries:
+            index = entry['index'] if isinstance(entry, Mapping) else entry
+            time = entry.get('time', frame_time) if isinstance(entry, Mapping) else frame_time
+            if not 0 <= index < frame_count:
+                raise ValueError(texts.ERROR_ANIMATION_INVALID)
+
+            if index not in decoded:
+                left = index % columns * frame_width
+                top = index // columns * frame_height
+                frame = strip.crop((left, top, left + frame_width, top + frame_height))
+                pixels = frame.tobytes()
+                if pixels not in distinct:
+                    distinct[pixels] = len(frames)
+                    frames.append(frame)
+                decoded[index] = distinct[pixels]
+            sequence.append((decoded[index], max(int(time), 1)))
+
+        return cls(frames, sequence, interpolate=bool(meta.get('interpolate', False)))
+
+    def frames_at(self, scale_factor: int = 1) -> list[Pil_Image.Image]:
+        """Get the distinct frames scaled by a factor. Results are cached.
+
+        Args:
+        ----
+            scale_factor (int, optional): factor that the frames are scaled by
+
+        Returns:
+        -------
+            list[Pil_Image.Image]: scaled frames
+
+        """
+        if scale_factor == 1:
+            return self.frames
+        if scale_factor not in self._scaled:
+            self._scaled[scale_factor] = [
+                frame.resize(
+                    (frame.width * scale_factor, frame.height * scale_factor),
+                    resample=Pil_Image.Resampling.NEAREST,
+                )
+                for frame in self.frames
+            ]
+        return self._scaled[scale_factor]
+
+    def timeline(self, scale_factor: int = 1) -> list[tuple[Pil_Image.Image, int]]:
+        """Get the frames as they are shown, with interpolated frames blended in.
+
+        Args:
+        ----
+            scale_factor (int, optional): factor that the frames are scaled by
+
+        Returns:
+        -------
+            list[tuple[Pil_Image.Image, int]]: frames and their durations in milliseconds
+
+        """
+        frames = self.frames_at(scale_factor)
+        if not self.interpolate:
+            return [(frames[index], time * TICK_MS) for index, time in self.sequence]
+
+        timeline: list[tuple[Pil_Image.Image, int]] = []
+        for position, (index, time) in enumerate(self.sequence):
+            following = frames[self.sequence[(position + 1) % len(self.sequence)][0]]
+            timeline.extend(
+                (Pil_Image.blend(frames[index], following, tick / time), TICK_MS)
+                for tick in range(time)
+            )
+        return timeline
+
+    def encode(self, animation_format: str, scale_factor: int = 1) -> dict[str, bytes]:
+        """Encode the animation.
+
+        Args:
+        ----
+            animation_format (str): one of `ANIMATION_FORMATS`
+            scale_factor (int, optional): factor that the frames are scaled by
+
+        Raises:
+        ------
+            ValueError: if the format is unknown
+
+        Returns:
+        -------
+            dict[str, bytes]: suffixes of the files to write mapped to their contents, a frame
+                sheet also has a ".mcmeta" file with the frame order
+
+        """
+        suffix = ANIMATION_FORMATS.get(animation_format)
+        if suffix is None:
+            raise ValueError(
+                texts.ERROR_ANIMATION_FORMAT.format(formats=', '.join(ANIMATION_FORMATS))
+            )
+
+        buffer = BytesIO()
+        if animation_format == 'sheet':
+            frames = self.frames_at(scale_factor)
+            sheet = Pil_Image.new('RGBA', (frames[0].width, frames[0].height * len(frames)))
+            for position, frame in enumerate(frames):
+                sheet.paste(frame, (0, position * frame.height))
+            save_png(sheet, buffer)
+            mcmeta = {
+                'animation': {
+                    'interpolate': self.interpolate,
+                    'frames': [{'index': index, 'time': time} for index, time in self.sequence],
+                }
+            }
+            return {
+                suffix: buffer.getvalue(),
+                f'{suffix}.mcmeta': json.dumps(mcmeta, indent=2).encode(),
+            }
+
+        images, durations = zip(*self.timeline(scale_factor), strict=True)
+        images[0].save(
+            buffer,
+            format='PNG' if animation_format == 'apng' else 'WEBP',
+            save_all=True,
+            append_images=images[1:],
+            duration=list(durations),
+            loop=0,
+            **({'lossless': True} if animation_format == 'webp' else {}),
+        )
+        return {suffix: buffer.getvalue()}
+
+
+__all__ = ['ANIMATION_FORMATS', 'Animation']
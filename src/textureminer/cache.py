@@ -0,0 +1,144 @@
+"""Persistent cache for data that is reused between runs.
+
+The cache directory can be shared by processes running at the same time. Entries are published
+atomically and created under a file lock, so a process that needs an entry that another process
+is already creating waits for it instead of creating it again.
+"""
+
+import json
+import logging
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from textureminer import texts
+from textureminer.file import atomic_path, atomic_write, file_lock
+from textureminer.options import DEFAULTS
+
+
+def get_cache_path(name: str) -> Path:
+    """Get the path of an entry in the cache directory.
+
+    Args:
+    ----
+        name (str): relative path of the entry, e.g. "recipes/<sha1>.json"
+
+    Returns:
+    -------
+        Path: path of the entry
+
+    """
+    return DEFAULTS['CACHE_DIR'] / name
+
+
+def read_json_cache(name: str, max_age: float | None = None) -> Any | None:  # noqa: ANN401
+    """Read a JSON entry from the cache.
+
+    Args:
+    ----
+        name (str): relative path of the entry
+        max_age (float | None, optional): maximum age of the entry in seconds, no limit if None
+
+    Returns:
+    -------
+        Any | None: cached data or None if the entry does not exist, is too old or is corrupted
+
+    """
+    path = get_cache_path(name)
+    if not path.is_file():
+        return None
+    if max_age is not None and time.time() - path.stat().st_mtime > max_age:
+        return None
+
+    try:
+        with path.open(encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+
+    logging.getLogger('textureminer').debug(texts.CACHE_HIT.format(path=path))
+    return data
+
+
+def write_json_cache(name: str, data: Any) -> Path:  # noqa: ANN401
+    """Write a JSON entry to the cache.
+
+    Args:
+    ----
+        name (str): relative path of the entry
+        data (Any): JSON serializable data
+
+    Returns:
+    -------
+        Path: path of the entry
+
+    """
+    path = get_cache_path(name)
+    atomic_write(path, json.dumps(data).encode())
+
+    logging.getLogger('textureminer').debug(texts.CACHE_WRITE.format(path=path))
+    return path
+
+
+def cached_json(
+    name: str,
+    create: Callable[[], Any],
+    *,
+    max_age: float | None = None,
+    refresh: bool = False,
+) -> Any:  # noqa: ANN401
+    """Get a JSON entry from the cache, creating it if it is missing or too old.
+
+    Args:
+    ----
+        name (str): relative path of the entry
+        create (Callable[[], Any]): function returning the JSON serializable data of the entry
+        max_age (float | None, optional): maximum age of the entry in seconds, no limit if None
+        refresh (bool, optional): whether to create the entry even if it is cached
+
+    Returns:
+    -------
+        Any: data of the entry
+
+    """
+    if not refresh:
+        data = read_json_cache(name, max_age)
+        if data is not None:
+            return data
+
+    with file_lock(get_cache_path(name)):
+        # another process may have created the entry while we waited for the lock
+        data = None if refresh else read_json_cache(name, max_age)
+        if data is None:
+            data = create()
+            write_json_cache(name, data)
+
+    return data
+
+
+def cached_file(name: str, create: Callable[[Path], object]) -> Path:
+    """Get a file or directory entry from the cache, creating it if it is missing.
+
+    Args:
+    ----
+        name (str): relative path of the entry
+        create (Callable[[Path], object]): function creating the entry at the given path
+
+    Returns:
+    -------
+        Path: path of the entry
+
+    """
+    path = get_cache_path(name)
+    if not path.exists():
+        with file_lock(path):
+            # another process may have created the entry while we waited for the lock
+            if not path.exists():
+                with atomic_path(path) as temp_path:
+                    create(temp_path)
+                logging.getLogger('textureminer').debug(texts.CACHE_WRITE.format(path=path))
+                return path
+
+    logging.getLogger('textureminer').debug(texts.CACHE_HIT.format(path=path))
+    return path
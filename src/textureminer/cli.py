@@ -1,9 +1,12 @@
 """Command line interface functionality."""
 
 import argparse
+import json
 import logging
 import os
-from collections.abc import Sequence
+import sys
+from collections.abc import Callable, Sequence
+from contextlib import nullcontext, suppress
 from enum import Enum
 from importlib import metadata
 from pathlib import Path
@@ -11,11 +14,23 @@ from pathlib import Path
 from fortext import Fg, style
 
 from textureminer import texts
+from textureminer.animation import ANIMATION_FORMATS
+from textureminer.cache import get_cache_path
+from textureminer.diff import DiffStatus, diff_textures, write_report
 from textureminer.edition.Bedrock import Bedrock
 from textureminer.edition.Edition import Edition
 from textureminer.edition.Java import Java
-from textureminer.logger import CustomLogger, get_logger
+from textureminer.file import rm_if_exists
+from textureminer.logger import LOG_FORMATS, CustomLogger, get_logger
+from textureminer.manifest import Manifest, read_manifest, verify_manifest
 from textureminer.options import DEFAULTS, EditionType, TextureOptions, VersionType
+from textureminer.parallel import MemoryBudget, shared_pool, thread_map
+from textureminer.progress import PROGRESS_MODES, configure_progress
+from textureminer.resource_pack import ResourcePack
+from textureminer.server import TextureHTTPServer, TextureServer
+from textureminer.storage import LocalStorage, Storage, open_storage
+from textureminer.version_index import KIND_ALIASES
+from textureminer.watch import Watcher
 
 
 class UpdateOption(Enum):
@@ -57,6 +72,584 @@ def get_edition_from_version(version: str) -> EditionType | None:
     return None
 
 
+def _location(output: Path | Storage) -> str:
+    """Get a printable location of the final textures."""
+    return output.as_posix() if isinstance(output, Path) else output.url
+
+
+EDITION_CLASSES: dict[EditionType, type[Edition]] = {
+    EditionType.JAVA: Java,
+    EditionType.BEDROCK: Bedrock,
+}
+"""Classes of the editions."""
+
+MEMORY_UNITS = {'': 1, 'K': 2**10, 'M': 2**20, 'G': 2**30}
+"""Suffixes of memory sizes given on the command line mapped to their multiplier."""
+
+
+def _memory_size(value: str) -> int:
+    """Parse a memory size like "512M" or "2G" to bytes."""
+    number, unit = value.rstrip('bB').upper(), ''
+    if number and number[-1] in MEMORY_UNITS:
+        number, unit = number[:-1], number[-1]
+    if not number.isdigit() or int(number) == 0:
+        raise argparse.ArgumentTypeError(texts.ERROR_MEMORY_SIZE_INVALID.format(size=value))
+    return int(number) * MEMORY_UNITS[unit]
+
+
+def _add_log_format_argument(parser: argparse.ArgumentParser) -> None:
+    """Add the argument setting the format of the log to a parser."""
+    parser.add_argument(
+        '--log-format',
+        choices=LOG_FORMATS,
+        default='text',
+        help='format of the log written to stderr, "json" writes an object per line with '
+        'per-stage and, with --verbose, per-texture events',
+    )
+
+
+def _add_texture_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the arguments setting texture options and rules to a parser."""
+    parser.add_argument(
+        '--animations',
+        choices=sorted(ANIMATION_FORMATS),
+        default=DEFAULTS['TEXTURE_OPTIONS']['ANIMATION_FORMAT'],
+        help='also export animated textures as animated images or a deduplicated frame sheet',
+    )
+    parser.add_argument(
+        '--crop',
+        action='store_true',
+        default=DEFAULTS['TEXTURE_OPTIONS']['DO_CROP'],
+        help='crop non-square textures to be square',
+    )
+    parser.add_argument(
+        '--deduplicate',
+        action='store_true',
+        default=DEFAULTS['TEXTURE_OPTIONS'].get('DO_DEDUPLICATE', False),
+        help='store identical textures once and map their names in aliases.json',
+    )
+    parser.add_argument(
+        '--flatten',
+        action='store_true',
+        default=DEFAULTS['TEXTURE_OPTIONS']['DO_MERGE'],
+        help='merge block and item textures into a single directory',
+    )
+    parser.add_argument(
+        '--partials',
+        action='store_true',
+        default=DEFAULTS['TEXTURE_OPTIONS']['DO_PARTIALS'],
+        help='create partial textures like stairs and slabs',
+    )
+    parser.add_argument(
+        '--replicate',
+        action='store_true',
+        default=DEFAULTS['TEXTURE_OPTIONS']['DO_REPLICATE'],
+        help='copy and rename only texture variant, e.g. "glass_pane_top" to "glass_pane"',
+    )
+    parser.add_argument(
+        '--reproducible',
+        action='store_true',
+        default=DEFAULTS['TEXTURE_OPTIONS'].get('REPRODUCIBLE', False),
+        help='set the modification times of the output files to SOURCE_DATE_EPOCH or 1980-01-01, '
+        'so the same version and options always give identical output',
+    )
+    parser.add_argument(
+        '--scale',
+        default=DEFAULTS['TEXTURE_OPTIONS']['SCALE_FACTOR'],
+        type=int,
+        help='scale factor for textures',
+        metavar='N',
+    )
+    parser.add_argument(
+        '--no-simple-structure',
+        action='store_true',
+        default=not DEFAULTS['TEXTURE_OPTIONS']['SIMPLIFY_STRUCTURE'],
+        help='do not simplify file structure of textures',
+    )
+    parser.add_argument(
+        '--rules',
+        metavar='FILE',
+        default=None,
+        type=Path,
+        help='path of a JSON file overriding the replication, overwrite and exception rules',
+    )
+
+
+def _texture_options(args: argparse.Namespace) -> TextureOptions:
+    """Get texture options from arguments added with `_add_texture_arguments`."""
+    return {
+        'ANIMATION_FORMAT': args.animations,
+        'DO_CROP': args.crop,
+        'DO_DEDUPLICATE': args.deduplicate,
+        'DO_MERGE': args.flatten,
+        'DO_PARTIALS': args.partials,
+        'DO_REPLICATE': args.replicate,
+        'REPRODUCIBLE': args.reproducible,
+        'SCALE_FACTOR': args.scale,
+        'SIMPLIFY_STRUCTURE': not args.no_simple_structure,
+    }
+
+
+def _dry_run(
+    edition_types: Sequence[EditionType],
+    args: argparse.Namespace,
+    version_or_type: VersionType | str | Path,
+    options: TextureOptions,
+) -> None:
+    """Print the counts and estimated sizes of the planned textures of each edition, then exit."""
+    logger = logging.getLogger('textureminer')
+    for edition_type in edition_types:
+        logger.info(texts.EDITION_USING_X.format(edition=edition_type.value.capitalize()))
+        with EDITION_CLASSES[edition_type](
+            rules_path=args.rules, in_memory=args.in_memory, max_memory=args.max_memory
+        ) as edition:
+            estimate = edition.estimate_textures(version_or_type, options)
+
+        logger.info(
+            texts.PLAN_TEXTURES.format(
+                textures=estimate.textures,
+                sources=estimate.sources,
+                partials=estimate.partials,
+            )
+        )
+        logger.info(
+            texts.PLAN_BYTES.format(
+                source=estimate.source_bytes / 2**20,
+                output=estimate.output_bytes / 2**20,
+                pixels=estimate.pixel_bytes / 2**20,
+                peak=estimate.peak_bytes / 2**20,
+            )
+        )
+    raise SystemExit(0)
+
+
+def _all_editions(version_or_type: VersionType | str | Path) -> list[EditionType]:
+    """Get the editions to extract with `--all-editions`, which only accepts a version type."""
+    if isinstance(version_or_type, VersionType):
+        return [EditionType.JAVA, EditionType.BEDROCK]
+    raise ValueError(texts.ERROR_ALL_EDITIONS_VERSION.format(version=version_or_type))
+
+
+def _extract_editions(
+    edition_types: Sequence[EditionType],
+    args: argparse.Namespace,
+    version_or_type: VersionType | str | Path,
+    output: Path | Storage,
+    options: TextureOptions,
+) -> list[Path | Storage | None]:
+    """Extract the textures of one or more editions at the same time.
+
+    The downloads of the editions overlap, while their image work runs on one shared pool of
+    threads under one memory budget, so it uses no more threads or memory than a single edition.
+
+    Returns
+    -------
+        list[Path | Storage | None]: output location of each edition
+
+    """
+    budget = MemoryBudget(args.max_memory) if args.max_memory is not None else None
+
+    def extract(edition_type: EditionType) -> Path | Storage | None:
+        logging.getLogger('textureminer').info(
+            texts.EDITION_USING_X.format(edition=edition_type.value.capitalize())
+        )
+        is_java = edition_type == EditionType.JAVA
+        # --in-memory only applies to java when extracting all editions
+        in_memory = args.in_memory and (is_java or not args.all_editions)
+        # java textures are published to remote storage straight from memory
+        in_memory = in_memory or (isinstance(output, Storage) and is_java)
+        with EDITION_CLASSES[edition_type](
+            rules_path=args.rules, in_memory=in_memory, max_memory=budget
+        ) as edition:
+            return edition.get_textures(
+                version_or_type=version_or_type,
+                output_dir=output,
+                options=options,
+            )
+
+    if len(edition_types) == 1:
+        return [extract(edition_types[0])]
+    with shared_pool():
+        return thread_map(extract, edition_types, max_workers=len(edition_types))
+
+
+def versions_cli(argv: Sequence[str]) -> None:
+    """CLI entrypoint for listing and querying versions.
+
+    Args:
+    ----
+        argv (Sequence[str]): command line arguments after the command name
+
+    """
+    parser = argparse.ArgumentParser(
+        prog='textureminer versions',
+        description='list minecraft versions, oldest first',
+    )
+    edition_group = parser.add_mutually_exclusive_group()
+    edition_group.add_argument('-j', '--java', action='store_true', help='use java edition')
+    edition_group.add_argument('-b', '--bedrock', action='store_true', help='use bedrock edition')
+    parser.add_argument(
+        '--since',
+        metavar='VERSION_OR_TIME',
+        help='first version or start of a time window, e.g. "24w21a", "2024" or "2024-06-13"',
+    )
+    parser.add_argument(
+        '--until',
+        metavar='VERSION_OR_TIME',
+        help='last version or end of a time window, e.g. "1.21", "2024" or "2024-06-13"',
+    )
+    parser.add_argument(
+        '--type',
+        dest='types',
+        action='append',
+        choices=sorted(KIND_ALIASES),
+        help='type of versions to list, can be repeated',
+    )
+    parser.add_argument('--last', type=int, metavar='N', help='only list the N newest versions')
+    parser.add_argument('--json', action='store_true', help='output versions as json')
+    parser.add_argument('--refresh', action='store_true', help='ignore the cached version list')
+    parser.add_argument('--verbose', action='store_true', help='enable verbose output')
+    args = parser.parse_args(argv)
+
+    logger = get_logger('textureminer', level=logging.DEBUG if args.verbose else logging.ERROR)
+
+    kinds = set().union(*(KIND_ALIASES[name] for name in args.types)) if args.types else None
+
+    try:
+        with Bedrock() if args.bedrock else Java() as edition:
+            entries = edition.get_version_index(refresh=args.refresh).query(
+                since=args.since,
+                until=args.until,
+                kinds=kinds,
+                last=args.last,
+            )
+    except Exception as e:
+        logger.exception(
+            f'Error: {e}',  # noqa: G004, TRY401
+        )
+        raise SystemExit(1, str(e)) from None
+
+    if args.json:
+        sys.stdout.write(json.dumps([entry.to_json() for entry in entries], indent=2) + '\n')
+    else:
+        sys.stdout.writelines(f'{entry.version.name}\n' for entry in entries)
+
+    raise SystemExit(0)
+
+
+def serve_cli(argv: Sequence[str]) -> None:
+    """CLI entrypoint for serving textures over HTTP.
+
+    Args:
+    ----
+        argv (Sequence[str]): command line arguments after the command name
+
+    """
+    parser = argparse.ArgumentParser(
+        prog='textureminer serve',
+        description='serve textures over http, e.g. GET /java/1.21/blocks/stone.png?scale=4'
+        '&shape=slab or GET /bedrock/latest/items.zip',
+    )
+    parser.add_argument('--host', default='127.0.0.1', help='address to listen on')
+    parser.add_argument('--port', type=int, default=8000, help='port to listen on')
+    parser.add_argument(
+        '--cache-size',
+        type=int,
+        default=256,
+        metavar='MB',
+        help='maximum size of decoded images kept in memory',
+    )
+    parser.add_argument(
+        '--rules',
+        metavar='FILE',
+        default=None,
+        type=Path,
+        help='path of a JSON file overriding the replication, overwrite and exception rules',
+    )
+    parser.add_argument('--verbose', action='store_true', help='enable verbose output')
+    _add_log_format_argument(parser)
+    args = parser.parse_args(argv)
+
+    logger = get_logger(
+        'textureminer',
+        level=logging.DEBUG if args.verbose else logging.INFO,
+        log_format=args.log_format,
+    )
+
+    textures = TextureServer(rules_path=args.rules, cache_size=args.cache_size * 1024 * 1024)
+    with TextureHTTPServer((args.host, args.port), textures) as server:
+        host, port = server.server_address[:2]
+        logger.info(texts.SERVER_LISTENING.format(host=host, port=port))
+        with suppress(KeyboardInterrupt):
+            server.serve_forever()
+
+    raise SystemExit(0)
+
+
+def watch_cli(argv: Sequence[str]) -> None:
+    """CLI entrypoint for watching for new versions.
+
+    Args:
+    ----
+        argv (Sequence[str]): command line arguments after the command name
+
+    """
+    parser = argparse.ArgumentParser(
+        prog='textureminer watch',
+        description='extract the textures of new versions once, polling for them cheaply',
+    )
+    parser.add_argument('-j', '--java', action='store_true', help='watch java edition')
+    parser.add_argument('-b', '--bedrock', action='store_true', help='watch bedrock edition')
+    parser.add_argument(
+        '--type',
+        dest='types',
+        action='append',
+        choices=[VersionType.STABLE.value, VersionType.EXPERIMENTAL.value],
+        help='type of versions to watch, can be repeated, defaults to both',
+    )
+    parser.add_argument(
+        '-o',
+        '--output',
+        metavar='DIR_OR_URL',
+        default=DEFAULTS['OUTPUT_DIR'],
+        help='path of output directory, or a storage url like "s3://bucket/prefix"',
+    )
+    _add_texture_arguments(parser)
+    parser.add_argument(
+        '--interval',
+        type=float,
+        default=3600,
+        metavar='SECONDS',
+        help='seconds between polls',
+    )
+    parser.add_argument('--once', action='store_true', help='poll once and exit, e.g. from cron')
+    parser.add_argument(
+        '--hook',
+        metavar='COMMAND',
+        help='command to run for each new version, with the output location as last argument',
+    )
+    parser.add_argument(
+        '--state',
+        metavar='FILE',
+        type=Path,
+        help='file to record processed versions in, defaults to watch.json in the cache directory',
+    )
+    parser.add_argument('--verbose', action='store_true', help='enable verbose output')
+    _add_log_format_argument(parser)
+    args = parser.parse_args(argv)
+
+    logger = get_logger(
+        'textureminer',
+        level=logging.DEBUG if args.verbose else logging.INFO,
+        log_format=args.log_format,
+    )
+
+    editions = [
+        edition
+        for edition, enabled in ((EditionType.JAVA, args.java), (EditionType.BEDROCK, args.bedrock))
+        if enabled
+    ] or [DEFAULTS['EDITION']]
+    version_types = [VersionType(name) for name in args.types or ('stable', 'experimental')]
+
+    storage = open_storage(args.output)
+    output: Path | Storage = (
+        storage.path.resolve() if isinstance(storage, LocalStorage) else storage
+    )
+    watcher = Watcher(
+        editions,
+        version_types,
+        output,
+        options=_texture_options(args),
+        state_path=args.state,
+        hook=args.hook,
+        rules_path=args.rules,
+    )
+
+    try:
+        with storage:
+            if not args.once:
+                logger.info(texts.WATCH_POLLING.format(interval=args.interval))
+            with suppress(KeyboardInterrupt):
+                watcher.run(None if args.once else args.interval)
+    except Exception as e:
+        logger.exception(
+            f'Error: {e}',  # noqa: G004, TRY401
+        )
+        raise SystemExit(1, str(e)) from None
+
+    raise SystemExit(0)
+
+
+def diff_cli(argv: Sequence[str]) -> None:
+    """CLI entrypoint for comparing the textures of two versions.
+
+    Args:
+    ----
+        argv (Sequence[str]): command line arguments after the command name
+
+    """
+    parser = argparse.ArgumentParser(
+        prog='textureminer diff',
+        description='report the textures added, removed or changed between two versions',
+    )
+    parser.add_argument('old', help='old version, e.g. "1.21" or "stable"')
+    parser.add_argument('new', help='new version, e.g. "24w33a" or "experimental"')
+    edition_group = parser.add_mutually_exclusive_group()
+    edition_group.add_argument('-j', '--java', action='store_true', help='use java edition')
+    edition_group.add_argument('-b', '--bedrock', action='store_true', help='use bedrock edition')
+    parser.add_argument(
+        '-o',
+        '--output',
+        metavar='DIR',
+        type=Path,
+        help='directory of the report, defaults to diff/<old>..<new> in the output directory',
+    )
+    parser.add_argument(
+        '--rules',
+        metavar='FILE',
+        default=None,
+        type=Path,
+        help='path of a JSON file overriding the replication, overwrite and exception rules',
+    )
+    parser.add_argument('--json', action='store_true', help='also print the report as json')
+    parser.add_argument('--verbose', action='store_true', help='enable verbose output')
+    _add_log_format_argument(parser)
+    args = parser.parse_args(argv)
+
+    logger = get_logger(
+        'textureminer',
+        level=logging.DEBUG if args.verbose else logging.INFO,
+        log_format=args.log_format,
+    )
+
+    try:
+        if args.bedrock:
+            edition = EditionType.BEDROCK
+        elif args.java:
+            edition = EditionType.JAVA
+        else:
+            edition = get_edition_from_version(args.old) or DEFAULTS['EDITION']
+
+        # versions are extracted once into the cache directory and shared with the server
+        textures = TextureServer(rules_path=args.rules)
+        old, new = (
+            textures.resolve_version(edition, version)[0] for version in (args.old, args.new)
+        )
+        old_dir, new_dir = thread_map(
+            lambda version: textures.materialize(edition, version), [old, new]
+        )
+
+        output_dir = args.output or DEFAULTS['OUTPUT_DIR'] / 'diff' / f'{old}..{new}'
+        # images of an earlier report to the same directory would be mixed with the new ones
+        for images in ('old', 'new', 'diff'):
+            rm_if_exists(output_dir / images)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        report = diff_textures(old_dir, new_dir, old=old, new=new, image_dir=output_dir / 'diff')
+        write_report(report, output_dir, old_dir, new_dir)
+    except Exception as e:
+        logger.exception(
+            f'Error: {e}',  # noqa: G004, TRY401
+        )
+        raise SystemExit(1, str(e)) from None
+
+    logger.info(
+        texts.DIFF_SUMMARY.format(
+            old=old,
+            new=new,
+            added=report.count(DiffStatus.ADDED),
+            removed=report.count(DiffStatus.REMOVED),
+            changed=report.count(DiffStatus.CHANGED) + report.count(DiffStatus.RESIZED),
+            unchanged=report.unchanged,
+        )
+    )
+    logger.info(texts.DIFF_REPORT.format(path=(output_dir / 'report.html').as_posix()))
+    if args.json:
+        sys.stdout.write(json.dumps(report.to_json(), indent=2) + '\n')
+
+    raise SystemExit(0)
+
+
+def _verify_source(args: argparse.Namespace, manifest: Manifest) -> Path | None:
+    """Get the source to check the source textures of a manifest in, if it is available."""
+    if args.source is not None:
+        return args.source
+    if manifest.source is not None and manifest.source.startswith('jar:'):
+        # client .jar files are kept in the cache by their SHA-1
+        jar = get_cache_path(f'jars/{manifest.source.removeprefix("jar:")}.jar')
+        if jar.is_file():
+            return jar
+    return None
+
+
+def verify_cli(argv: Sequence[str]) -> None:
+    """CLI entrypoint for checking an output directory against its manifest.
+
+    Args:
+    ----
+        argv (Sequence[str]): command line arguments after the command name
+
+    """
+    parser = argparse.ArgumentParser(
+        prog='textureminer verify',
+        description='check the textures of an output directory against its manifest',
+    )
+    parser.add_argument('directory', type=Path, help='output directory, e.g. "textures/java/1.21"')
+    parser.add_argument(
+        '--source',
+        metavar='PATH',
+        type=Path,
+        help='client .jar or resource pack to check the source textures in, the cached client '
+        '.jar is used for java versions when it is available',
+    )
+    parser.add_argument(
+        '--fingerprint',
+        metavar='HASH',
+        help='fingerprint of the texture options the textures should have been made with',
+    )
+    parser.add_argument('--json', action='store_true', help='print the problems as json')
+    parser.add_argument('--verbose', action='store_true', help='enable verbose output')
+    _add_log_format_argument(parser)
+    args = parser.parse_args(argv)
+
+    logger = get_logger(
+        'textureminer',
+        level=logging.DEBUG if args.verbose else logging.INFO,
+        log_format=args.log_format,
+    )
+
+    try:
+        manifest = read_manifest(args.directory)
+        source_path = _verify_source(args, manifest)
+        with ResourcePack(source_path) if source_path is not None else nullcontext() as source:
+            problems = verify_manifest(args.directory, source=source, fingerprint=args.fingerprint)
+    except Exception as e:
+        logger.exception(
+            f'Error: {e}',  # noqa: G004, TRY401
+        )
+        raise SystemExit(1, str(e)) from None
+
+    if args.json:
+        sys.stdout.write(json.dumps([problem.to_json() for problem in problems], indent=2) + '\n')
+    else:
+        sys.stdout.writelines(f'{problem}\n' for problem in problems)
+
+    if problems:
+        logger.error(texts.VERIFY_FAILED.format(count=len(problems), files=len(manifest.files)))
+        raise SystemExit(1)
+    logger.info(texts.VERIFY_OK.format(files=len(manifest.files)))
+    raise SystemExit(0)
+
+
+COMMANDS: dict[str, Callable[[Sequence[str]], None]] = {
+    'diff': diff_cli,
+    'serve': serve_cli,
+    'verify': verify_cli,
+    'versions': versions_cli,
+    'watch': watch_cli,
+}
+"""Commands that are run as `textureminer <command>` instead of extracting textures."""
+
+
 def cli(argv: Sequence[str] | None = None) -> None:  # noqa: C901, PLR0912, PLR0915
     """CLI entrypoint for textureminer.
 
@@ -65,10 +658,15 @@ def cli(argv: Sequence[str] | None = None) -> None:  # noqa: C901, PLR0912, PLR0
         argv (Sequence[str] | None, optional): command line arguments, uses sys.argv if None
 
     """
+    argv = list(argv) if argv is not None else sys.argv[1:]
+    if argv and argv[0] in COMMANDS:
+        COMMANDS[argv[0]](argv[1:])
+
     try:
         parser = argparse.ArgumentParser(
             prog='textureminer',
             description='extract and scale minecraft textures',
+            epilog='other commands: ' + ', '.join(COMMANDS) + ' (see textureminer COMMAND --help)',
         )
         parser.add_argument(
             'update',
@@ -90,55 +688,59 @@ def cli(argv: Sequence[str] | None = None) -> None:  # noqa: C901, PLR0912, PLR0
             action='store_true',
             help='use bedrock edition',
         )
+        edition_group.add_argument(
+            '--all-editions',
+            action='store_true',
+            help='extract java and bedrock edition textures at the same time, '
+            'needs a version type like "stable" instead of a version',
+        )
 
         parser.add_argument(
             '-o',
             '--output',
-            metavar='DIR',
+            metavar='DIR_OR_URL',
             default=DEFAULTS['OUTPUT_DIR'],
-            type=Path,
-            help='path of output directory',
+            help='path of output directory, or a storage url like "s3://bucket/prefix", '
+            '"zip:///path/to/textures.zip" or "memory://"',
         )
         parser.add_argument(
-            '--crop',
-            action='store_true',
-            default=DEFAULTS['TEXTURE_OPTIONS']['DO_CROP'],
-            help='crop non-square textures to be square',
+            '--pack',
+            metavar='PATH',
+            type=Path,
+            help='read the textures from a resource pack zip file or directory instead of a '
+            'version, the edition is detected from the pack unless given',
         )
+        _add_texture_arguments(parser)
         parser.add_argument(
-            '--flatten',
+            '--in-memory',
             action='store_true',
-            default=DEFAULTS['TEXTURE_OPTIONS']['DO_MERGE'],
-            help='merge block and item textures into a single directory',
+            help='keep intermediate files in memory instead of a temporary directory (java only)',
         )
         parser.add_argument(
-            '--partials',
-            action='store_true',
-            default=DEFAULTS['TEXTURE_OPTIONS']['DO_PARTIALS'],
-            help='create partial textures like stairs and slabs',
+            '--max-memory',
+            metavar='SIZE',
+            type=_memory_size,
+            default=None,
+            help='memory that textures being processed at the same time may use, e.g. "512M" or '
+            '"2G", scaled textures are written to disk when they would not fit',
         )
         parser.add_argument(
-            '--replicate',
+            '--dry-run',
             action='store_true',
-            default=DEFAULTS['TEXTURE_OPTIONS']['DO_REPLICATE'],
-            help='copy and rename only texture variant, e.g. "glass_pane_top" to "glass_pane"',
-        )
-        parser.add_argument(
-            '--scale',
-            default=DEFAULTS['TEXTURE_OPTIONS']['SCALE_FACTOR'],
-            type=int,
-            help='scale factor for textures',
-            metavar='N',
+            help='plan the textures and print their counts and estimated sizes without '
+            'processing them (java and resource packs only)',
         )
         parser.add_argument(
-            '--no-simple-structure',
-            action='store_true',
-            default=not DEFAULTS['TEXTURE_OPTIONS']['SIMPLIFY_STRUCTURE'],
-            help='do not simplify file structure of textures',
+            '--progress',
+            choices=PROGRESS_MODES,
+            default='auto',
+            help='how to report the progress of downloads and textures, "auto" draws a bar on a '
+            'terminal and writes a progress line every few seconds otherwise',
         )
         parser.add_argument('--no-color', action='store_true', help='disable color output')
         parser.add_argument('--silent', action='store_true', help='silence output')
         parser.add_argument('--verbose', action='store_true', help='enable verbose output')
+        _add_log_format_argument(parser)
         parser.add_argument(
             '-v',
             '--version',
@@ -158,11 +760,16 @@ def cli(argv: Sequence[str] | None = None) -> None:  # noqa: C901, PLR0912, PLR0
         logger: CustomLogger = get_logger(
             'textureminer',
             level=logging.DEBUG if args.verbose else logging.ERROR if args.silent else logging.INFO,
+            log_format=args.log_format,
         )  # type: ignore[assignment]
+        configure_progress(
+            'off' if args.silent else args.progress, json_log=args.log_format == 'json'
+        )
 
         logger.debug('Arguments: {args}'.format(args=args))  # noqa: G001, UP032
 
-        logger.info(style(texts.TITLE, fg=Fg.CYAN) if not color_disabled else texts.TITLE)
+        if args.log_format == 'text':
+            logger.info(style(texts.TITLE, fg=Fg.CYAN) if not color_disabled else texts.TITLE)
 
         edition_type: EditionType | None = None
         update: str | VersionType | None = None
@@ -183,28 +790,31 @@ def cli(argv: Sequence[str] | None = None) -> None:  # noqa: C901, PLR0912, PLR0
             edition_type = EditionType.BEDROCK
         elif args.java or args.update == UpdateOption.SNAPSHOT.value:
             edition_type = EditionType.JAVA
+        elif args.pack is not None:
+            with ResourcePack(args.pack) as pack:
+                edition_type = pack.edition
         elif args.update and args.update not in VersionType:
             edition_type = get_edition_from_version(args.update)
 
         if edition_type is None:
             edition_type = DEFAULTS['EDITION']
 
-        logger.info(texts.EDITION_USING_X.format(edition=edition_type.value.capitalize()))
+        version_or_type = args.pack or update or DEFAULTS['VERSION']
+        edition_types = _all_editions(version_or_type) if args.all_editions else [edition_type]
+
+        texture_options = _texture_options(args)
+
+        if args.dry_run:
+            _dry_run(edition_types, args, version_or_type, texture_options)
+
+        storage = open_storage(args.output)
+        output: Path | Storage = (
+            storage.path.resolve() if isinstance(storage, LocalStorage) else storage
+        )
 
-        texture_options: TextureOptions = {
-            'DO_CROP': args.crop,
-            'DO_MERGE': args.flatten,
-            'DO_PARTIALS': args.partials,
-            'DO_REPLICATE': args.replicate,
-            'SCALE_FACTOR': args.scale,
-            'SIMPLIFY_STRUCTURE': not args.no_simple_structure,
-        }
-
-        with Bedrock() if edition_type == EditionType.BEDROCK else Java() as edition:
-            output_path = edition.get_textures(
-                version_or_type=update or DEFAULTS['VERSION'],
-                output_dir=args.output.resolve(),
-                options=texture_options,
+        with storage:
+            output_paths = _extract_editions(
+                edition_types, args, version_or_type, output, texture_options
             )
 
     except Exception as e:
@@ -213,13 +823,14 @@ def cli(argv: Sequence[str] | None = None) -> None:  # noqa: C901, PLR0912, PLR0
         )
         raise SystemExit(1, str(e)) from None
 
+    locations = [_location(path) for path in output_paths if path is not None]
     if not color_disabled:
         logger.info(style(texts.COMPLETED, fg=Fg.GREEN))
-        if output_path is not None:
-            logger.info(style(output_path.as_posix(), fg=Fg.GREEN))
+        for location in locations:
+            logger.info(style(location, fg=Fg.GREEN))
     else:
-        logger.info(texts.COMPLETED.format(output_dir=output_path))
-        if output_path is not None:
-            logger.info(output_path)
+        logger.info(texts.COMPLETED)
+        for location in locations:
+            logger.info(location)
 
     raise SystemExit(0)
@@ -0,0 +1,327 @@
+"""Texture differences between two versions, with pixel metrics and highlighted images."""
+
+import html
+import json
+import shutil
+from dataclasses import dataclass
+from enum import Enum
+from pathlib import Path
+from typing import Any
+
+from PIL import Image as Pil_Image
+from PIL import ImageChops, ImageStat
+
+from textureminer.imaging import save_png
+from textureminer.parallel import thread_map
+
+HIGHLIGHT_COLOR = (255, 0, 64, 255)
+"""Color of the changed pixels in the diff images."""
+
+
+class DiffStatus(Enum):
+    """Enum class representing how a texture differs between two versions."""
+
+    ADDED = 'added'
+    """only in the new version
+    """
+    REMOVED = 'removed'
+    """only in the old version
+    """
+    CHANGED = 'changed'
+    """same dimensions, different pixels
+    """
+    RESIZED = 'resized'
+    """different dimensions
+    """
+
+
+@dataclass(frozen=True, slots=True)
+class TextureDiff:
+    """Difference of a texture between two versions.
+
+    Attributes
+    ----------
+        name (str): path of the texture, e.g. "blocks/stone.png"
+        status (DiffStatus): how the texture differs
+        old_size (tuple[int, int] | None): dimensions in the old version
+        new_size (tuple[int, int] | None): dimensions in the new version
+        changed_pixels (int): number of pixels with any different channel
+        changed_ratio (float): fraction of the pixels that changed
+        mean_difference (float): mean absolute difference of all channels, from 0 to 1
+        max_difference (float): largest absolute difference of a channel, from 0 to 1
+        bbox (tuple[int, int, int, int] | None): box around the changed pixels
+
+    """
+
+    name: str
+    status: DiffStatus
+    old_size: tuple[int, int] | None = None
+    new_size: tuple[int, int] | None = None
+    changed_pixels: int = 0
+    changed_ratio: float = 0.0
+    mean_difference: float = 0.0
+    max_difference: float = 0.0
+    bbox: tuple[int, int, int, int] | None = None
+
+    def to_json(self) -> dict[str, Any]:
+        """Convert the difference to a JSON serializable dictionary.
+
+        Returns
+        -------
+            dict[str, Any]: the difference as a dictionary
+
+        """
+        return {
+            'name': self.name,
+            'status': self.status.value,
+            'old_size': self.old_size,
+            'new_size': self.new_size,
+            'changed_pixels': self.changed_pixels,
+            'changed_ratio': round(self.changed_ratio, 6),
+            'mean_difference': round(self.mean_difference, 6),
+            'max_difference': round(self.max_difference, 6),
+            'bbox': self.bbox,
+        }
+
+
+@dataclass(frozen=True, slots=True)
+class DiffReport:
+    """Differences of the textures of two versions.
+
+    Attributes
+    ----------
+        old (str): old version
+        new (str): new version
+        unchanged (int): number of textures that are the same in both versions
+        textures (list[TextureDiff]): textures that differ, sorted by name
+
+    """
+
+    old: str
+    new: str
+    unchanged: int
+    textures: list[TextureDiff]
+
+    def count(self, status: DiffStatus) -> int:
+        """Count the textures that differ in a certain way.
+
+        Args:
+        ----
+            status (DiffStatus): how the textures differ
+
+        Returns:
+        -------
+            int: number of textures
+
+        """
+        return sum(1 for texture in self.textures if texture.status == status)
+
+    def to_json(self) -> dict[str, Any]:
+        """Convert the report to a JSON serializable dictionary.
+
+        Returns
+        -------
+            dict[str, Any]: the report as a dictionary
+
+        """
+        return {
+            'old': self.old,
+            'new': self.new,
+            'summary': {
+                'unchanged': self.unchanged,
+                **{status.value: self.count(status) for status in DiffStatus},
+            },
+            'textures': [texture.to_json() for texture in self.textures],
+        }
+
+
+def compare_images(
+    old: Pil_Image.Image,
+    new: Pil_Image.Image,
+) -> tuple[dict[str, Any], Pil_Image.Image | None]:
+    """Compare two images of the same dimensions.
+
+    The channels are compared as whole images, so the comparison runs in native code instead of
+    looping over the pixels in Python.
+
+    Args:
+    ----
+        old (Pil_Image.Image): image in the old version
+        new (Pil_Image.Image): image in the new version
+
+    Returns:
+    -------
+        tuple[dict[str, Any], Pil_Image.Image | None]: metrics of the difference as keyword
+            arguments of `TextureDiff`, and the new image with the changed pixels highlighted, or
+            None if the images are the same
+
+    """
+    old, new = old.convert('RGBA'), new.convert('RGBA')
+    difference = ImageChops.difference(old, new)
+    red, green, blue, alpha = difference.split()
+    # largest difference of any channel of each pixel
+    largest = ImageChops.lighter(ImageChops.lighter(red, green), ImageChops.lighter(blue, alpha))
+
+    bbox = largest.getbbox()
+    if bbox is None:
+        return {}, None
+
+    histogram = largest.histogram()
+    changed = new.width * new.height - histogram[0]
+    metrics = {
+        'changed_pixels': changed,
+        'changed_ratio': changed / (new.width * new.height),
+        'mean_difference': sum(ImageStat.Stat(difference).mean) / (4 * 255),
+        'max_difference': max(value for value, count in enumerate(histogram) if count) / 255,
+        'bbox': bbox,
+    }
+
+    mask = largest.point(lambda value: 255 if value else 0)
+    faded = Pil_Image.blend(
+        Pil_Image.new('RGBA', new.size, (255, 255, 255, 255)),
+        new.convert('LA').convert('RGBA'),
+        0.35,
+    )
+    highlighted = Pil_Image.composite(Pil_Image.new('RGBA', new.size, HIGHLIGHT_COLOR), faded, mask)
+    return metrics, highlighted
+
+
+def diff_textures(
+    old_dir: Path,
+    new_dir: Path,
+    *,
+    old: str = 'old',
+    new: str = 'new',
+    image_dir: Path | None = None,
+) -> DiffReport:
+    """Compare the textures of two versions, in parallel.
+
+    Args:
+    ----
+        old_dir (Path): directory with the textures of the old version
+        new_dir (Path): directory with the textures of the new version
+        old (str, optional): name of the old version
+        new (str, optional): name of the new version
+        image_dir (Path | None, optional): directory to save the highlighted images of the changed
+            textures to, by texture path, not saved if None
+
+    Returns:
+    -------
+        DiffReport: differences of the textures
+
+    """
+    old_names = {path.relative_to(old_dir).as_posix() for path in old_dir.rglob('*.png')}
+    new_names = {path.relative_to(new_dir).as_posix() for path in new_dir.rglob('*.png')}
+
+    def compare(name: str) -> TextureDiff | None:
+        if name not in new_names:
+            with Pil_Image.open(old_dir / name) as old_img:
+                return TextureDiff(name, DiffStatus.REMOVED, old_size=old_img.size)
+        if name not in old_names:
+            with Pil_Image.open(new_dir / name) as new_img:
+                return TextureDiff(name, DiffStatus.ADDED, new_size=new_img.size)
+
+        with Pil_Image.open(old_dir / name) as old_img, Pil_Image.open(new_dir / name) as new_img:
+            if old_img.size != new_img.size:
+                return TextureDiff(
+                    name, DiffStatus.RESIZED, old_size=old_img.size, new_size=new_img.size
+                )
+            size = new_img.size
+            metrics, highlighted = compare_images(old_img, new_img)
+
+        if highlighted is None:
+            return None
+        if image_dir is not None:
+            (image_dir / name).parent.mkdir(parents=True, exist_ok=True)
+            save_png(highlighted, image_dir / name)
+        return TextureDiff(name, DiffStatus.CHANGED, old_size=size, new_size=size, **metrics)
+
+    names = sorted(old_names | new_names)
+    diffs = thread_map(compare, names)
+    textures = [diff for diff in diffs if diff is not None]
+    return DiffReport(old, new, len(names) - len(textures), textures)
+
+
+def write_report(report: DiffReport, output_dir: Path, old_dir: Path, new_dir: Path) -> None:
+    """Write a report as `report.json` and a browsable `report.html` to a directory.
+
+    The textures that differ are copied next to the report, so it can be moved and shared.
+
+    Args:
+    ----
+        report (DiffReport): report to write
+        output_dir (Path): directory of the report, with the diff images in a `diff` subdirectory
+        old_dir (Path): directory with the textures of the old version
+        new_dir (Path): directory with the textures of the new version
+
+    """
+    for texture in report.textures:
+        for source, side in ((old_dir, 'old'), (new_dir, 'new')):
+            if (source / texture.name).is_file():
+                (output_dir / side / texture.name).parent.mkdir(parents=True, exist_ok=True)
+                shutil.copyfile(source / texture.name, output_dir / side / texture.name)
+
+    with (output_dir / 'report.json').open('w', encoding='utf-8') as f:
+        json.dump(report.to_json(), f, indent=2)
+    (output_dir / 'report.html').write_text(_render_html(report, output_dir), encoding='utf-8')
+
+
+def _render_html(report: DiffReport, output_dir: Path) -> str:
+    """Render a report as a standalone HTML page that links the images next to it."""
+
+    def image(side: str, name: str) -> str:
+        if not (output_dir / side / name).is_file():
+            return '<td></td>'
+        return f'<td><img src="{html.escape(f"{side}/{name}")}" alt="{side}"></td>'
+
+    rows = [
+        '<tr>'
+        f'<td>{html.escape(texture.name)}</td>'
+        f'<td class="{texture.status.value}">{texture.status.value}</td>'
+        f'<td>{texture.changed_pixels} ({texture.changed_ratio:.1%})</td>'
+        f'<td>{texture.mean_difference:.3f}</td>'
+        f'<td>{texture.max_difference:.3f}</td>'
+        f'{image("old", texture.name)}{image("new", texture.name)}{image("diff", texture.name)}'
+        '</tr>'
+        for texture in report.textures
+    ]
+    summary = ', '.join(
+        f'{count} {status}' for status, count in report.to_json()['summary'].items()
+    )
+    title = html.escape(f'Texture differences from {report.old} to {report.new}')
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+<style>
+body {{ font-family: sans-serif; }}
+table {{ border-collapse: collapse; }}
+th, td {{ border: 1px solid #ccc; padding: 4px 8px; text-align: left; }}
+img {{ width: 64px; image-rendering: pixelated; background: #eee; }}
+.added {{ color: #080; }}
+.removed {{ color: #a00; }}
+.changed, .resized {{ color: #a60; }}
+</style>
+</head>
+<body>
+<h1>{title}</h1>
+<p>{html.escape(summary)}</p>
+<table>
+<tr><th>Texture</th><th>Status</th><th>Changed pixels</th><th>Mean difference</th>
+<th>Max difference</th><th>Old</th><th>New</th><th>Diff</th></tr>
+{chr(10).join(rows)}
+</table>
+</body>
+</html>
+"""
+
+
+__all__ = [
+    'DiffReport',
+    'DiffStatus',
+    'TextureDiff',
+    'compare_images',
+    'diff_textures',
+    'write_report',
+]
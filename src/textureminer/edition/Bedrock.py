@@ -7,16 +7,21 @@ import platform
 import re
 import subprocess
 from collections.abc import Sequence
+from functools import cached_property
 from pathlib import Path
 from shutil import copyfile
 from typing import Any, ClassVar, Literal, override
 
-import requests  # type: ignore[import]
-
 from textureminer import texts
+from textureminer.cache import cached_file, cached_json
 from textureminer.edition.Edition import BlockShape, Edition, TextureOptions
-from textureminer.file import rm_if_exists
+from textureminer.file import file_lock, rm_if_exists
+from textureminer.logger import log_stage
 from textureminer.options import DEFAULTS, EditionType, VersionType
+from textureminer.parallel import MemoryBudget, thread_map
+from textureminer.rules import RuleSet, load_rules
+from textureminer.storage import Storage
+from textureminer.version_index import KIND_ALIASES, VersionIndex
 
 
 class Bedrock(Edition):
@@ -25,54 +30,47 @@ class Bedrock(Edition):
     Attributes
     ----------
         REPO_URL (str): The URL of the Bedrock Edition repository.
-        REPLICATE_MAP (dict): A dictionary mapping texture names to their replication counterparts.
+        MIRROR_CACHE (str): Name of the sparse clone of the repository in the cache directory.
+        TAGS_CACHE (str): Name of the repository tag list in the cache directory.
+        TAGS_MAX_AGE (int): Seconds the cached tag list is used for.
 
     """
 
+    EDITION_TYPE: ClassVar[EditionType] = EditionType.BEDROCK
     REPO_URL = 'https://github.com/Mojang/bedrock-samples'
-
-    REPLICATE_MAP: ClassVar[dict[str, str]] = {
-        'glass_pane_top': 'glass_pane',
-        'glass_pane_top_red': 'red_stained_glass_pane',
-        'glass_pane_top_orange': 'orange_stained_glass_pane',
-        'glass_pane_top_yellow': 'yellow_stained_glass_pane',
-        'glass_pane_top_lime': 'lime_stained_glass_pane',
-        'glass_pane_top_green': 'green_stained_glass_pane',
-        'glass_pane_top_cyan': 'cyan_stained_glass_pane',
-        'glass_pane_top_light_blue': 'light_blue_stained_glass_pane',
-        'glass_pane_top_blue': 'blue_stained_glass_pane',
-        'glass_pane_top_purple': 'purple_stained_glass_pane',
-        'glass_pane_top_magenta': 'magenta_stained_glass_pane',
-        'glass_pane_top_pink': 'pink_stained_glass_pane',
-        'glass_pane_top_white': 'white_stained_glass_pane',
-        'glass_pane_top_silver': 'silver_stained_glass_pane',
-        'glass_pane_top_gray': 'gray_stained_glass_pane',
-        'glass_pane_top_black': 'black_stained_glass_pane',
-        'glass_pane_top_brown': 'brown_stained_glass_pane',
-        'copper_chest_inventory_front': 'copper_chest',
-        'weathered_copper_chest_inventory_front': 'weathered_copper_chest',
-        'exposed_copper_chest_inventory_front': 'exposed_copper_chest',
-        'oxidized_copper_chest_inventory_front': 'oxidized_copper_chest',
-        'copper_chain1': 'copper_chain',
-        'weathered_copper_chain1': 'weathered_copper_chain',
-        'exposed_copper_chain1': 'exposed_copper_chain',
-        'oxidized_copper_chain1': 'oxidized_copper_chain',
-    }
-
-    OVERWRITE_TEXTURES: ClassVar[dict[str, str]] = {
-        'snow': 'snow_block',
-    }
-
-    blocks_cache: dict[str, Any] | None = None
-    terrain_texture_cache: dict[str, Any] | None = None
+    MIRROR_CACHE = 'bedrock-samples'
+    TAGS_CACHE = 'bedrock-samples-tags.json'
+    TAGS_MAX_AGE = 300
 
     _git_executable: Literal['git', '/usr/bin/git']
 
     repo_dir: Path | None = None
 
-    def __init__(self) -> None:
-        """Initialize the Bedrock Edition."""
-        super().__init__()
+    def __init__(
+        self,
+        *,
+        rules_path: Path | None = None,
+        in_memory: bool = False,
+        max_memory: int | MemoryBudget | None = None,
+    ) -> None:
+        """Initialize the Bedrock Edition.
+
+        Args:
+        ----
+            rules_path (Path | None, optional): rules file overriding the bundled texture rules
+            in_memory (bool, optional): not supported, the textures are read from a git checkout
+            max_memory (int | MemoryBudget | None, optional): bytes that textures being processed
+                at the same time may use, estimated from their dimensions, or a budget shared with
+                other editions, unlimited if None
+
+        Raises:
+        ------
+            ValueError: if in_memory is True
+
+        """
+        if in_memory:
+            raise ValueError(texts.ERROR_IN_MEMORY_UNSUPPORTED.format(edition='Bedrock'))
+        super().__init__(rules_path=rules_path, max_memory=max_memory)
 
         if platform.system() == 'Linux':
             self._git_executable = '/usr/bin/git'
@@ -82,66 +80,102 @@ class Bedrock(Edition):
             texts.USING_GIT_EXECUTABLE.format(git=self._git_executable)
         )
 
+    @cached_property
+    def rules(self) -> RuleSet:
+        """Texture rules of the Bedrock Edition."""
+        return load_rules(EditionType.BEDROCK, self.rules_path)
+
     @override
     def get_textures(
         self,
-        version_or_type: VersionType | str,
-        output_dir: Path = DEFAULTS['OUTPUT_DIR'],
+        version_or_type: VersionType | str | Path,
+        output_dir: Path | Storage = DEFAULTS['OUTPUT_DIR'],
         options: TextureOptions | None = None,
-    ) -> Path | None:
+    ) -> Path | Storage | None:
         if options is None:
             options = DEFAULTS['TEXTURE_OPTIONS']
         logging.getLogger('textureminer').debug(texts.TEXTURE_OPTIONS.format(options=options))
 
+        if isinstance(version_or_type, Path):
+            return self.get_pack_textures(version_or_type, output_dir, options)
+
         if isinstance(version_or_type, str) and not Edition.validate_version(
             version_or_type,
             edition=EditionType.BEDROCK,
         ):
             raise ValueError(texts.ERROR_VERSION_INVALID.format(version=version_or_type))
 
-        version_type = (
-            version_or_type if isinstance(version_or_type, VersionType) else VersionType.ALL
-        )
-        version = None
-
-        repo_dir = self.temp_dir / 'bedrock-samples'
-        self._clone_repo(repo_dir)
-
         if isinstance(version_or_type, str):
             version = version_or_type
         else:
-            version = self.get_latest_version(version_type)
-            if version is None:
-                raise ValueError(texts.ERROR_NO_LATEST_VERSION.format(version=version_or_type))
+            # resolved from the remote tags, so the repository is only cloned once there is a
+            # version to extract
+            latest = self.get_latest_version(version_or_type)
+            if latest is None:
+                raise ValueError(
+                    texts.ERROR_NO_LATEST_VERSION.format(version_type=version_or_type.value)
+                )
+            version = latest
 
         self.version = version
         logging.getLogger('textureminer').info(texts.VERSION_USING_X.format(version=version))
 
-        self._change_repo_version(version)
-
-        filtered = Edition.filter_unwanted(
-            repo_dir,
-            output_dir / 'bedrock' / version,
-            edition=EditionType.BEDROCK,
-        )
+        with log_stage('clone'):
+            repo_dir = cached_file(self.MIRROR_CACHE, self._clone_repo)
+        self.repo_dir = repo_dir
+
+        # the working tree of the mirror is shared with other processes
+        with file_lock(repo_dir):
+            with log_stage('checkout'):
+                self._change_repo_version(version)
+                commit = self._checked_out_commit()
+
+            with log_stage('plan'):
+                # the index of partials is built from the checked out blocks.json
+                partials = self._partial_plan() if options['DO_PARTIALS'] else []
+
+            with log_stage('filter'):
+                filtered = Edition.filter_unwanted(
+                    repo_dir,
+                    self._staging_dir(output_dir) / 'bedrock' / version,
+                    edition=EditionType.BEDROCK,
+                )
 
         if options['DO_REPLICATE']:
-            Edition.replicate_textures(filtered, self.REPLICATE_MAP)
+            with log_stage('replicate'):
+                Edition.replicate_textures(filtered, self.rules.replicate)
 
         if options['DO_PARTIALS']:
-            self._create_partial_textures(filtered, version_type)
+            with log_stage('partials'):
+                self._create_partial_textures(filtered, partials)
 
         if options['SIMPLIFY_STRUCTURE']:
-            Edition.simplify_structure(EditionType.BEDROCK, filtered)
+            with log_stage('simplify'):
+                Edition.simplify_structure(EditionType.BEDROCK, filtered)
+
+        with log_stage('scale'):
+            Edition.scale_textures(
+                filtered,
+                options['SCALE_FACTOR'],
+                do_merge=options['DO_MERGE'],
+                do_crop=options['DO_CROP'],
+                reencode=options.get('REPRODUCIBLE', False),
+                budget=self.memory_budget,
+            )
 
-        Edition.scale_textures(
-            filtered,
-            options['SCALE_FACTOR'],
-            do_merge=options['DO_MERGE'],
-            do_crop=options['DO_CROP'],
-        )
+        if options.get('DO_DEDUPLICATE', False):
+            with log_stage('deduplicate'):
+                Edition.deduplicate_textures(filtered)
 
-        return filtered
+        with log_stage('manifest'):
+            self._write_manifest(filtered, version, options, source=f'git:{commit}')
+
+        with log_stage('publish'):
+            return self._publish(
+                filtered,
+                output_dir / 'bedrock' / version,
+                reproducible=options.get('REPRODUCIBLE', False),
+            )
 
     @override
     def get_version_type(self, version: str) -> VersionType | None:
@@ -163,41 +197,60 @@ class Bedrock(Edition):
 
     @override
     def get_latest_version(self, version_type: VersionType) -> str | None:
-        if self.repo_dir is None:
-            repo_not_found_msg = 'Repository not found. Please clone the repository first.'
-            raise OSError(repo_not_found_msg)
+        logging.getLogger('textureminer').info(
+            texts.VERSION_LATEST_FINDING.format(version_type=version_type.value)
+        )
+        # the tags are listed without cloning the repository and cached for a few minutes
+        kinds = KIND_ALIASES[version_type.value] if version_type != VersionType.ALL else None
+        entries = self.get_version_index().query(kinds=kinds, last=1)
+        return entries[0].version.name if entries else None
 
-        self._run_git_command(
-            (self._git_executable, 'fetch', '--tags'),
-            check=False,
+    @override
+    def get_version_index(self, *, refresh: bool = False) -> VersionIndex:
+        return VersionIndex.from_bedrock_tags(self._list_remote_tags(refresh=refresh))
+
+    def _list_remote_tags(self, *, refresh: bool = False) -> list[str]:
+        """List the tags of the remote repository without cloning it. Caches the result on disk.
+
+        Args:
+        ----
+            refresh (bool, optional): whether to bypass the cached tag list
+
+        Returns:
+        -------
+            list[str]: tag names
+
+        """
+        return cached_json(
+            self.TAGS_CACHE,
+            self._fetch_remote_tags,
+            max_age=self.TAGS_MAX_AGE,
+            refresh=refresh,
         )
 
+    def _fetch_remote_tags(self) -> list[str]:
+        """List the tags of the remote repository without cloning it or caching the result.
+
+        Returns
+        -------
+            list[str]: tag names
+
+        """
         out = self._run_git_command(
-            (self._git_executable, 'tag', '--list', '--sort=-creatordate'),
-            check=False,
+            (self._git_executable, 'ls-remote', '--tags', '--refs', self.REPO_URL),
+            cwd=self.temp_dir,
+            check=True,
             capture_output=True,
         )
-
         if not out:
             err = 'Failed to get tags.'
             raise ChildProcessError(err)
 
-        tags = out.stdout.splitlines()
-        logging.getLogger('textureminer').debug(
-            texts.GIT_TAGS_FOUND.format(
-                tags=', '.join(tags),
-            )
-        )
-
-        for tag in tags:
-            if Edition.validate_version(
-                version=tag,
-                version_type=version_type if version_type != VersionType.ALL else None,
-                edition=EditionType.BEDROCK,
-            ):
-                return tag
-
-        return None
+        return [
+            line.split('refs/tags/', 1)[1]
+            for line in out.stdout.splitlines()
+            if 'refs/tags/' in line
+        ]
 
     def _run_git_command(
         self,
@@ -313,6 +366,7 @@ class Bedrock(Edition):
             logging.getLogger('textureminer').exception(
                 texts.ERROR_COMMAND_FAILED.format(error_code=err.returncode, error_msg=err.stderr),
             )
+            raise
 
     def _change_repo_version(self, version: str, *, fetch_tags: bool = True) -> None:
         """Change the version of the repository.
@@ -320,7 +374,8 @@ class Bedrock(Edition):
         Args:
         ----
             version (str): version to change the repository to
-            fetch_tags (bool, optional): whether to fetch tags from the repository
+            fetch_tags (bool, optional): whether to fetch the tag of the version if the repository
+                does not have it yet
 
         """
         if not self.repo_dir or not self.repo_dir.exists() or not self.repo_dir.is_dir():
@@ -328,33 +383,32 @@ class Bedrock(Edition):
                 'Repository directory not found. Please clone the repository first.'
             )
             raise OSError(repo_dir_not_found_msg)
-        if fetch_tags:
-            self._run_git_command(
-                (self._git_executable, 'fetch', '--tags'),
-                check=False,
-            )
 
-        version_type = self.get_version_type(version)
-        if version_type == VersionType.EXPERIMENTAL:
-            logging.getLogger('textureminer').debug(
-                texts.GIT_SWITCHING_BRANCH.format(branch='preview')
+        version_regex = re.compile(r'^v\d+\.\d+\.\d+(\.\d+)?(-preview)?$')
+        if not version_regex.match(version):
+            invalid_version_msg = (
+                f'Invalid version. The version should follow the regex {version_regex.pattern}.'
             )
+            raise ValueError(invalid_version_msg)
+
+        tag = f'refs/tags/{version}'
+        has_tag = self._run_git_command(
+            (self._git_executable, 'rev-parse', '--quiet', '--verify', tag),
+            check=False,
+            capture_output=True,
+        )
+        if fetch_tags and (has_tag is None or has_tag.returncode != 0):
+            # only the tag of the version is fetched, the others were listed with ls-remote
             self._run_git_command(
-                (self._git_executable, 'switch', 'preview'),
-                check=True,
+                (self._git_executable, 'fetch', '--no-tags', 'origin', f'{tag}:{tag}'),
+                check=False,
             )
 
         try:
-            version_regex = re.compile(r'^v\d+\.\d+\.\d+(\.\d+)?(-preview)?$')
-            if not version_regex.match(version):
-                invalid_version_msg = (
-                    f'Invalid version. The version should follow the regex {version_regex.pattern}.'
-                )
-                raise ValueError(invalid_version_msg)
-
+            # previews are tagged on the preview branch, but a tag can be checked out from any
             self._run_git_command(
-                (self._git_executable, 'checkout', f'tags/v{version}'),
-                check=False,
+                (self._git_executable, 'checkout', tag),
+                check=True,
             )
         except subprocess.CalledProcessError as err:
             logging.getLogger('textureminer').exception(
@@ -362,184 +416,218 @@ class Bedrock(Edition):
             )
             raise
 
-    def _create_partial_textures(  # noqa: C901, PLR0915
+    def _create_partial_textures(
         self,
         texture_dir: Path,
-        version_type: VersionType,
-        *,
-        prevent_overwrite: bool = True,
+        partials: Sequence[tuple[str, BlockShape | None, str]],
     ) -> None:
         """Create partial textures like stairs and slabs for the Bedrock Edition.
 
+        The copies are made before the crops, so a texture copied to prevent its overwrite is
+        copied before it is cropped. Both are done in parallel.
+
         Args:
         ----
             texture_dir (Path): directory where the textures are
-            version_type (VersionType): type of version to create partials for
-            prevent_overwrite (bool, optional): whether to copy textures to prevent overwrite
+            partials (Sequence[tuple[str, BlockShape | None, str]]): path of the base texture,
+                shape to crop it to or None to copy it, and path of the partial texture
 
         """
-        unused_textures: Sequence[str] = ('carpet',)
-
         logging.getLogger('textureminer').info(texts.CREATING_PARTIALS)
-        texture_dict = self._get_blocks_json(version_type=version_type)
 
-        for texture_name in texture_dict:
-            if texture_name in unused_textures:
-                continue
+        copies = [(base, name) for base, shape, name in partials if shape is None]
+        thread_map(lambda copy: copyfile(texture_dir / copy[0], texture_dir / copy[1]), copies)
+
+        Edition.crop_textures(
+            [
+                (texture_dir / base, shape, texture_dir / name)
+                for base, shape, name in partials
+                if shape is not None
+            ]
+        )
 
-            blocks_dir = texture_dir / 'blocks'
+    def _partial_plan(
+        self, *, prevent_overwrite: bool = True
+    ) -> list[tuple[str, BlockShape | None, str]]:
+        """Get the partial textures to create for the checked out version.
 
+        Args:
+        ----
+            prevent_overwrite (bool, optional): whether to copy textures to prevent overwrite
+
+        Returns:
+        -------
+            list[tuple[str, BlockShape | None, str]]: path of the base texture, shape to crop it to
+                or None to copy it, and path of the partial texture
+
+        """
+        plan: list[tuple[str, BlockShape | None, str]] = []
+        for texture_name, base_texture in self._get_texture_dict().items():
             if (
-                prevent_overwrite
-                and texture_name in self.OVERWRITE_TEXTURES
-                and texture_name == texture_dict[texture_name]['textures']
+                texture_name == base_texture
+                and prevent_overwrite
+                and texture_name in self.rules.overwrite
             ):
-                copyfile(
-                    blocks_dir / f'{texture_name}.png',
-                    blocks_dir / f'{self.OVERWRITE_TEXTURES[texture_name]}.png',
-                )
+                overwritten = self.rules.overwrite[texture_name]
+                plan.append((f'blocks/{texture_name}.png', None, f'blocks/{overwritten}.png'))
 
             if 'slab' in texture_name and 'double_slab' not in texture_name:
-                identifier = texture_dict[texture_name]['textures']
-                base_texture = self._identifier_to_filename(identifier, version_type)
-                sub_dir = base_texture.split('/').pop(0) if '/' in base_texture else ''
-                in_path = blocks_dir / f'{base_texture}.png'
-                out_path = blocks_dir / sub_dir / f'{texture_name}.png'
-                Edition.crop_texture(in_path, BlockShape.SLAB, out_path)
+                shape: BlockShape | None = BlockShape.SLAB
             elif 'stairs' in texture_name:
-                identifier = texture_dict[texture_name]['textures']
-                base_texture = self._identifier_to_filename(identifier, version_type)
-                sub_dir = base_texture.split('/').pop(0) if '/' in base_texture else ''
-                in_path = blocks_dir / f'{base_texture}.png'
-                out_path = blocks_dir / sub_dir / f'{texture_name}.png'
-                Edition.crop_texture(in_path, BlockShape.STAIR, out_path)
+                shape = BlockShape.STAIR
             elif 'carpet' in texture_name:
-                if 'moss' in texture_name:
-                    base_texture = 'moss_block'
-                else:
-                    base_texture = 'wool_colored_' + texture_name.replace('_carpet', '').replace(
-                        'light_gray',
-                        'silver',
-                    )
-                sub_dir = base_texture.split('/').pop(0) if '/' in base_texture else ''
-                in_path = blocks_dir / f'{base_texture}.png'
-                out_path = blocks_dir / sub_dir / f'{texture_name}.png'
-                Edition.crop_texture(in_path, BlockShape.CARPET, out_path)
-
+                shape = BlockShape.CARPET
             elif texture_name == 'snow':
-                base_texture = 'snow'
-                sub_dir = base_texture.split('/').pop(0) if '/' in base_texture else ''
-                in_path = blocks_dir / f'{base_texture}.png'
-                out_path = blocks_dir / sub_dir / f'{texture_name}.png'
-                Edition.crop_texture(in_path, BlockShape.SNOW, out_path)
-
+                shape = BlockShape.SNOW
             # waxed copper blocks use same texture as the base variant
             elif (
                 'copper' in texture_name
                 and 'waxed' in texture_name
                 and 'golem_statue' not in texture_name
             ):
-                base_texture = texture_name.replace('waxed_', '')
-
-                if '_door' in texture_name:
-                    base_texture_top = base_texture + '_top'
-                    base_texture_bottom = base_texture + '_bottom'
-                    in_path_top = blocks_dir / f'{base_texture_top}.png'
-                    in_path_bottom = blocks_dir / f'{base_texture_bottom}.png'
-                    out_path_top = blocks_dir / f'{texture_name}_top.png'
-                    out_path_bottom = blocks_dir / f'{texture_name}_bottom.png'
-                    copyfile(in_path_top, out_path_top)
-                    copyfile(in_path_bottom, out_path_bottom)
-                    continue
-
-                base_texture = (
-                    base_texture.replace('copper', 'copper_block')
-                    if base_texture == 'copper'
-                    else base_texture
-                )
-                in_path = blocks_dir / f'{base_texture}.png'
-                out_path = blocks_dir / sub_dir / f'{texture_name}.png'
-                copyfile(in_path, out_path)
+                shape = None
+            else:
+                continue
 
-    def _get_blocks_json(self, version_type: VersionType) -> dict[str, Any]:
-        """Fetch the blocks dictionary.
+            sub_dir = base_texture.split('/')[0] + '/' if '/' in base_texture else ''
+            plan.append(
+                (f'blocks/{base_texture}.png', shape, f'blocks/{sub_dir}{texture_name}.png')
+            )
 
-        Args:
-        ----
-            version_type (VersionType): type of version to fetch the blocks dictionary for
+        return plan
 
-        Returns:
+    def _get_texture_dict(self) -> dict[str, str]:
+        """Get the base textures of the partial textures of the checked out version.
+
+        The index is built once per commit of the repository and kept in the cache directory.
+
+        Returns
         -------
-            dict[str, Any]: blocks dictionary
+            dict[str, str]: partial texture names mapped to their base textures, textures that are
+                their own base can be overwritten by another texture
 
         """
-        if self.blocks_cache is not None:
-            return self.blocks_cache
+        return cached_json(
+            f'bedrock-partials/{self._checked_out_commit()}.json',
+            self._build_texture_dict,
+        )
 
-        branch = 'preview' if version_type == VersionType.EXPERIMENTAL else 'main'
+    def _checked_out_commit(self) -> str:
+        """Get the commit checked out in the repository.
 
-        url = f'https://raw.githubusercontent.com/Mojang/bedrock-samples/{branch}/resource_pack/blocks.json'
-        logging.getLogger('textureminer').debug(texts.FETCHING_BLOCKS_JSON.format(url=url))
-        file = requests.get(url, timeout=10)
+        Raises
+        ------
+            ChildProcessError: if the commit cannot be read
 
-        data = file.json()
+        Returns
+        -------
+            str: hash of the commit
 
-        self.blocks_cache = data
-        return data
+        """
+        out = self._run_git_command(
+            (self._git_executable, 'rev-parse', 'HEAD'),
+            check=True,
+            capture_output=True,
+        )
+        if not out:
+            err = 'Failed to get the checked out commit.'
+            raise ChildProcessError(err)
+        return out.stdout.strip()
 
-    def _identifier_to_filename(self, identifier: str, version_type: VersionType) -> str:
-        """Convert a block identifier to a texture filename.
+    def _build_texture_dict(self) -> dict[str, str]:
+        """Build the base textures of the partial textures of the checked out version.
 
-        Args:
-        ----
-            identifier (str): block identifier
-            version_type (VersionType): type of version to convert the identifier for
+        Raises
+        ------
+            OSError: if the repository has not been cloned
 
-        Returns:
+        Returns
         -------
-            str: texture filename
+            dict[str, str]: partial texture names mapped to their base textures
 
         """
-        if isinstance(identifier, dict) and 'side' in identifier:
-            identifier = identifier['side']
+        if self.repo_dir is None:
+            repo_not_found_msg = 'Repository not found. Please clone the repository first.'
+            raise OSError(repo_not_found_msg)
 
-        data = self._get_terrain_texture_json(version_type=version_type)
-        textures = data['texture_data'][identifier]['textures']
+        resource_pack = self.repo_dir / 'resource_pack'
+        with (resource_pack / 'blocks.json').open(encoding='utf-8') as f:
+            blocks: dict[str, Any] = json.load(f)
+        terrain_textures = Bedrock._read_terrain_textures(resource_pack)
 
-        if isinstance(textures, list):
-            return textures[0].replace('textures/blocks/', '')
+        texture_dict: dict[str, str] = {}
+        for texture_name, block in blocks.items():
+            if not isinstance(block, dict) or texture_name == 'carpet':
+                continue
+            identifier = block.get('textures')
+            if texture_name in (identifier, 'snow'):
+                texture_dict[texture_name] = texture_name
+            if isinstance(identifier, dict):
+                identifier = identifier.get('side')
+
+            if 'slab' in texture_name or 'stairs' in texture_name:
+                if identifier in terrain_textures and 'double_slab' not in texture_name:
+                    texture_dict[texture_name] = terrain_textures[identifier]
+            elif 'carpet' in texture_name:
+                color = texture_name.replace('_carpet', '').replace('light_gray', 'silver')
+                texture_dict[texture_name] = (
+                    'moss_block' if 'moss' in texture_name else f'wool_colored_{color}'
+                )
+            elif (
+                'copper' in texture_name
+                and 'waxed' in texture_name
+                and 'golem_statue' not in texture_name
+            ):
+                texture_dict.update(Bedrock._waxed_copper_textures(texture_name))
 
-        return textures.replace('textures/blocks/', '')
+        return texture_dict
 
-    def _get_terrain_texture_json(self, version_type: VersionType) -> dict[str, Any]:
-        """Fetch the terrain texture dictionary.
+    @staticmethod
+    def _read_terrain_textures(resource_pack: Path) -> dict[str, str]:
+        """Read the texture paths of the block identifiers in terrain_texture.json.
 
         Args:
         ----
-            version_type (VersionType): type of version to fetch the terrain texture dictionary for
+            resource_pack (Path): resource pack directory of the repository
 
         Returns:
         -------
-            dict[str, Any]: terrain texture dictionary
+            dict[str, str]: block identifiers mapped to the paths of their first texture,
+                relative to the blocks directory and without the extension
 
         """
-        if self.terrain_texture_cache is not None:
-            return self.terrain_texture_cache
+        with (resource_pack / 'textures' / 'terrain_texture.json').open(encoding='utf-8') as f:
+            # the file has comment lines, which are not valid JSON
+            terrain = json.loads(
+                '\n'.join(line for line in f.read().splitlines() if not line.startswith('//'))
+            )
 
-        branch = 'main' if version_type == VersionType.STABLE else 'preview'
+        terrain_textures: dict[str, str] = {}
+        for identifier, data in terrain['texture_data'].items():
+            textures = data['textures']
+            texture = textures[0] if isinstance(textures, list) else textures
+            if isinstance(texture, dict):
+                texture = texture['path']
+            terrain_textures[identifier] = texture.replace('textures/blocks/', '')
+        return terrain_textures
 
-        url = f'https://raw.githubusercontent.com/Mojang/bedrock-samples/{branch}/resource_pack/textures/terrain_texture.json'
-        logging.getLogger('textureminer').debug(texts.FETCHING_TERRAIN_TEXTURE_JSON.format(url=url))
-        file = requests.get(url, timeout=10)
-        text = file.text
+    @staticmethod
+    def _waxed_copper_textures(texture_name: str) -> dict[str, str]:
+        """Get the base textures of a waxed copper block, the textures of its unwaxed variant.
 
-        json_text = ''
-        for line in text.splitlines():
-            if line.startswith('//'):
-                continue
-            json_text += line + '\n'
+        Args:
+        ----
+            texture_name (str): name of the waxed copper block
 
-        data = json.loads(json_text)
+        Returns:
+        -------
+            dict[str, str]: texture names of the block mapped to their base textures
 
-        self.terrain_texture_cache = data
-        return data
+        """
+        base_texture = texture_name.replace('waxed_', '')
+        if '_door' in texture_name:
+            return {
+                f'{texture_name}_top': f'{base_texture}_top',
+                f'{texture_name}_bottom': f'{base_texture}_bottom',
+            }
+        return {texture_name: 'copper_block' if base_texture == 'copper' else base_texture}
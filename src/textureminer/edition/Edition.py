@@ -1,30 +1,55 @@
 """Types and a base class for Minecraft editions."""  # noqa: N999
 
+import json
 import logging
-import re
 from abc import ABC, abstractmethod
+from collections.abc import Callable, Iterable, Iterator, Mapping, Sequence
 from enum import Enum
+from functools import cache
 from pathlib import Path
 from shutil import copyfile, copytree, rmtree
 from types import TracebackType
-from typing import Self
+from typing import TYPE_CHECKING, ClassVar, Self
 from uuid import uuid4
 
-from forfiles import fs, image
 from PIL import Image as Pil_Image
 
 from textureminer import texts
-from textureminer.file import mk_dir, rm_if_exists
+from textureminer.file import (
+    index_files,
+    mk_dir,
+    move_tree,
+    replace_dir,
+    reproducible_mtime,
+    rm_if_exists,
+    set_mtimes,
+)
+from textureminer.imaging import (
+    PNG_HEADER_SIZE,
+    alias_map,
+    hash_pixels,
+    save_png,
+    texture_footprint,
+)
+from textureminer.logger import log_event
 from textureminer.options import DEFAULTS, EditionType, TextureOptions, VersionType
-
-REGEX_BEDROCK_RELEASE = r'^v1\.[0-9]{2}\.[0-9]{1,3}\.[0-9]{1,2}$'
-REGEX_BEDROCK_PREVIEW = r'^v1\.[0-9]{2}\.[0-9]{1,3}\.[0-9]{1,2}-preview$'
-
-# regex format `(pre-26-format) | (post-26-format)`
-REGEX_JAVA_SNAPSHOT = r'^(([0-9]{2}w[0-9]{2}[a-z])|([0-9]+\.?[0-9]+-snapshot-[0-9]?))$'
-REGEX_JAVA_PRE = r'^(([0-9]\.[0-9]+\.?[0-9]+-pre[0-9]?)|([0-9]+\.?[0-9]+-pre-[0-9]?))$'
-REGEX_JAVA_RC = r'^(([0-9]\.[0-9]+\.?[0-9]+-rc[0-9]?)|([0-9]+\.?[0-9]+-rc-[0-9]?))$'
-REGEX_JAVA_RELEASE = r'^(([0-9]\.[0-9]+(\.[0-9]+)?)|([0-9]+\.[0-9]+(\.[0-9]+)?))$'
+from textureminer.parallel import MemoryBudget, thread_map
+from textureminer.progress import Progress
+from textureminer.resource_pack import ResourcePack
+from textureminer.rules import RuleSet
+from textureminer.storage import LocalStorage, Storage
+from textureminer.version import (
+    PATTERN_BEDROCK_PREVIEW,
+    PATTERN_BEDROCK_RELEASE,
+    PATTERN_JAVA_PRE,
+    PATTERN_JAVA_RC,
+    PATTERN_JAVA_RELEASE,
+    PATTERN_JAVA_SNAPSHOT,
+)
+from textureminer.version_index import VersionIndex
+
+if TYPE_CHECKING:
+    from textureminer.textures import PlanEstimate, TexturePlan
 
 
 class BlockShape(Enum):
@@ -50,20 +75,61 @@ class BlockShape(Enum):
     """
 
 
+SHAPE_CUTOUTS: Mapping[BlockShape, tuple[tuple[int, int, int, int], ...]] = {
+    BlockShape.SQUARE: (),
+    BlockShape.SLAB: ((0, 0, 16, 8),),
+    BlockShape.STAIR: ((8, 0, 16, 8),),
+    BlockShape.CARPET: ((0, 0, 16, 15),),
+    BlockShape.SNOW: ((0, 0, 16, 14),),
+    BlockShape.GLASS_PANE: ((0, 0, 7, 16), (9, 0, 16, 16)),
+}
+"""Transparent boxes of each shape in sixteenths of the texture width, from the top left corner."""
+
+
 class Edition(ABC):
-    """Base class for Minecraft editions."""
+    """Base class for Minecraft editions.
+
+    Attributes
+    ----------
+        EDITION_TYPE (EditionType): type of the edition
+
+    """
+
+    EDITION_TYPE: ClassVar[EditionType]
+
+    def __init__(
+        self,
+        *,
+        rules_path: Path | None = None,
+        in_memory: bool = False,
+        max_memory: int | MemoryBudget | None = None,
+    ) -> None:
+        """Initialize the Edition.
+
+        Args:
+        ----
+            rules_path (Path | None, optional): rules file overriding the bundled texture rules
+            in_memory (bool, optional): keep intermediate files in memory instead of a temporary
+                directory, only the final textures are written to disk
+            max_memory (int | MemoryBudget | None, optional): bytes that textures being processed
+                at the same time may use, estimated from their dimensions, or a budget shared with
+                other editions, unlimited if None
 
-    def __init__(self) -> None:
-        """Initialize the Edition."""
+        """
         self.id = uuid4()
+        self.rules_path = rules_path
+        self.in_memory = in_memory
+        self.memory_budget = MemoryBudget(max_memory) if isinstance(max_memory, int) else max_memory
+        self._staging_roots: set[Path] = set()
         self.temp_dir = DEFAULTS['TEMP_PATH'] / self.id.__str__()
         self.type = None
         logging.getLogger('textureminer').debug(texts.EDITION_ID.format(id=self.id))
+        if in_memory:
+            return
         logging.getLogger('textureminer').debug(texts.TEMP_DIR.format(temp=self.temp_dir))
 
-        if self.temp_dir.is_dir():
-            rmtree(self.temp_dir)
-        mk_dir(self.temp_dir)
+        # the directory is unique to this instance, so it never belongs to another process
+        self.temp_dir.mkdir(parents=True)
 
     def __enter__(self) -> Self:
         """Enter the context manager."""
@@ -79,30 +145,382 @@ class Edition(ABC):
         self.cleanup()
 
     def cleanup(self) -> None:
-        """Clean up temporary files."""
+        """Clean up temporary files, and staged textures of runs that did not finish."""
         logging.getLogger('textureminer').debug(texts.CLEARING_TEMP)
         rm_if_exists(self.temp_dir)
+        for root in self._staging_roots:
+            rm_if_exists(root)
+        self._staging_roots.clear()
 
     @abstractmethod
     def get_textures(
         self,
-        version_or_type: VersionType | str,
-        output_dir: Path = DEFAULTS['OUTPUT_DIR'],
+        version_or_type: VersionType | str | Path,
+        output_dir: Path | Storage = DEFAULTS['OUTPUT_DIR'],
         options: TextureOptions | None = None,
-    ) -> Path | None:
+    ) -> Path | Storage | None:
         """Extract, filter, and scale item and block textures.
 
+        Args:
+        ----
+            version_or_type (str): a Minecraft version type, a version string, or the path of a
+                resource pack zip file or directory to read the textures from instead
+            output_dir (Path | Storage, optional): directory or storage that the final textures
+                will go
+            options (TextureOptions | None, optional): options for the textures
+
+        Returns:
+        -------
+            Path | Storage | None: directory or storage of the final textures or None if invalid
+                input
+
+        """
+
+    def get_pack_textures(
+        self,
+        pack: Path,
+        output_dir: Path | Storage = DEFAULTS['OUTPUT_DIR'],
+        options: TextureOptions | None = None,
+    ) -> Path | Storage:
+        """Filter and scale the item and block textures of a resource pack.
+
+        The textures are read from the pack and processed one at a time by a pool of threads, with
+        a bounded number in flight, so large packs are never unpacked.
+
+        Args:
+        ----
+            pack (Path): path of the resource pack zip file or directory
+            output_dir (Path | Storage, optional): directory or storage that the final textures
+                will go, under "<edition>/<pack name>"
+            options (TextureOptions | None, optional): options for the textures
+
+        Raises:
+        ------
+            ValueError: if the pack is for another edition or has no textures
+
+        Returns:
+        -------
+            Path | Storage: directory or storage of the final textures
+
+        """
+        if options is None:
+            options = DEFAULTS['TEXTURE_OPTIONS']
+
+        with ResourcePack(pack) as resource_pack:
+            if resource_pack.edition != self.EDITION_TYPE:
+                raise ValueError(
+                    texts.ERROR_PACK_EDITION.format(
+                        path=pack, edition=resource_pack.edition.value.capitalize()
+                    )
+                )
+            logging.getLogger('textureminer').info(
+                texts.PACK_USING_X.format(
+                    pack=resource_pack.name, texture_amount=len(resource_pack.textures)
+                )
+            )
+
+            plan = self._plan_pack(resource_pack, options)
+
+            staging = self._staging_dir(output_dir) / self.EDITION_TYPE.value / resource_pack.name
+            mk_dir(staging, del_prev=True)
+            plan.execute(resource_pack, staging, budget=self.memory_budget)
+
+        if options.get('DO_DEDUPLICATE', False):
+            Edition.deduplicate_textures(staging)
+
+        self._write_manifest(
+            staging, resource_pack.name, options, source=f'pack:{resource_pack.name}', plan=plan
+        )
+        return self._publish(
+            staging,
+            output_dir / self.EDITION_TYPE.value / resource_pack.name,
+            reproducible=options.get('REPRODUCIBLE', False),
+        )
+
+    def estimate_textures(
+        self,
+        version_or_type: VersionType | str | Path,
+        options: TextureOptions | None = None,
+    ) -> 'PlanEstimate':
+        """Plan the textures like `get_textures` and estimate their cost without processing them.
+
+        Args:
+        ----
+            version_or_type (VersionType | str | Path): a Minecraft version type, a version
+                string, or the path of a resource pack zip file or directory
+            options (TextureOptions | None, optional): options for the textures
+
+        Raises:
+        ------
+            ValueError: if the pack is for another edition, or the edition cannot plan versions
+
+        Returns:
+        -------
+            PlanEstimate: counts and estimated bytes of the textures
+
+        """
+        if options is None:
+            options = DEFAULTS['TEXTURE_OPTIONS']
+
+        if not isinstance(version_or_type, Path):
+            return self._estimate_version(version_or_type, options)
+
+        with ResourcePack(version_or_type) as resource_pack:
+            if resource_pack.edition != self.EDITION_TYPE:
+                raise ValueError(
+                    texts.ERROR_PACK_EDITION.format(
+                        path=version_or_type, edition=resource_pack.edition.value.capitalize()
+                    )
+                )
+            return self._plan_pack(resource_pack, options).estimate(
+                resource_pack, resource_pack.size
+            )
+
+    def _estimate_version(
+        self,
+        version_or_type: VersionType | str,  # noqa: ARG002
+        options: TextureOptions,  # noqa: ARG002
+    ) -> 'PlanEstimate':
+        """Estimate the cost of getting the textures of a version, see `estimate_textures`.
+
+        Raises
+        ------
+            ValueError: if the edition cannot plan versions
+
+        """
+        raise ValueError(
+            texts.ERROR_PLAN_UNSUPPORTED.format(edition=self.EDITION_TYPE.value.capitalize())
+        )
+
+    def _plan_pack(
+        self,
+        resource_pack: ResourcePack,
+        options: TextureOptions,
+        partials: Callable[[], Iterable[tuple[str, BlockShape | None, str]]] | None = None,
+    ) -> 'TexturePlan':
+        """Plan the textures made from a resource pack without reading any of them.
+
+        Args:
+        ----
+            resource_pack (ResourcePack): the resource pack
+            options (TextureOptions): options for the textures
+            partials (Callable[[], Iterable[tuple[str, BlockShape | None, str]]] | None, optional):
+                gets the partial textures to create, `_pack_partials` if None
+
+        Returns:
+        -------
+            TexturePlan: replicated, partial, simplified and merged textures as set in the options
+
+        """
+        from textureminer.textures import TexturePlan  # noqa: PLC0415
+
+        plan = TexturePlan.from_sources(resource_pack.textures, options)
+
+        if options['DO_REPLICATE']:
+            plan.replicate(self.rules.replicate)
+
+        if options['DO_PARTIALS']:
+            plan.add_partials(partials() if partials is not None else self._pack_partials())
+
+        if options['SIMPLIFY_STRUCTURE']:
+            plan.simplify_structure()
+
+        if options['DO_MERGE']:
+            plan.merge()
+
+        return plan
+
+    def _pack_partials(self) -> list[tuple[str, BlockShape | None, str]]:
+        """Get the partial textures to create for resource packs.
+
+        Editions that cannot create partial textures without their own game files return nothing.
+
+        Returns
+        -------
+            list[tuple[str, BlockShape | None, str]]: path of the base texture, shape to crop it to
+                or None to copy it, and path of the partial texture
+
+        """
+        return []
+
+    def iter_textures(
+        self,
+        version_or_type: VersionType | str,
+        options: TextureOptions | None = None,
+        *,
+        decode: bool = False,
+    ) -> Iterator[tuple[str, str, Pil_Image.Image | bytes]]:
+        """Extract, filter, and scale item and block textures, yielding them one by one.
+
+        Nothing is written to an output directory. Deduplication is not supported, as the
+        canonical texture of a group is only known once every texture has been processed.
+
         Args:
         ----
             version_or_type (str): a Minecraft version type, or a version string.
-            output_dir (Path, optional): directory that the final textures will go
             options (TextureOptions | None, optional): options for the textures
+            decode (bool, optional): yield decoded images instead of PNG data
+
+        Raises:
+        ------
+            ValueError: if deduplication is enabled in the options
+
+        Yields:
+        ------
+            tuple[str, str, Pil_Image.Image | bytes]: category of the texture, "blocks" or
+                "items" or an empty string when merged, its path within the category, e.g.
+                "stone.png", and the texture itself
+
+        """
+        if options is None:
+            options = DEFAULTS['TEXTURE_OPTIONS']
+        if options.get('DO_DEDUPLICATE', False):
+            raise ValueError(texts.ERROR_ITER_DEDUPLICATE)
+
+        for name, texture in self._iter_textures(version_or_type, options, decode=decode):
+            category, _, subpath = name.partition('/')
+            if category not in ('blocks', 'items'):
+                category, subpath = '', name
+            yield category, subpath, texture
+
+    def _iter_textures(
+        self,
+        version_or_type: VersionType | str,
+        options: TextureOptions,
+        *,
+        decode: bool,
+    ) -> Iterator[tuple[str, Pil_Image.Image | bytes]]:
+        """Yield the final textures by their path relative to the output directory.
+
+        Editions without a streaming pipeline write the textures to the temporary directory and
+        read them back.
+
+        Args:
+        ----
+            version_or_type (str): a Minecraft version type, or a version string.
+            options (TextureOptions): options for the textures
+            decode (bool): yield decoded images instead of PNG data
+
+        Yields:
+        ------
+            tuple[str, Pil_Image.Image | bytes]: path of the texture and the texture itself
+
+        """
+        output = self.get_textures(version_or_type, self.temp_dir / 'iter', options)
+        if not isinstance(output, Path):
+            return
+
+        for file in sorted(output.rglob('*.png')):
+            name = file.relative_to(output).as_posix()
+            if not decode:
+                yield name, file.read_bytes()
+                continue
+            with Pil_Image.open(file) as img:
+                img.load()
+                yield name, img
+
+    def _staging_dir(self, output_dir: Path | Storage) -> Path:
+        """Get the local directory that the directory based steps write the textures to.
+
+        Args:
+        ----
+            output_dir (Path | Storage): directory or storage that the final textures will go
+
+        Returns:
+        -------
+            Path: a hidden directory in the output directory if it is on the local disk, so the
+                textures are published by renaming them, otherwise a directory in the temporary
+                directory, published with `_publish`
+
+        """
+        if isinstance(output_dir, Path | LocalStorage):
+            root = output_dir if isinstance(output_dir, Path) else output_dir.path
+            staging = root / f'.staging-{self.id}'
+            self._staging_roots.add(staging)
+            return staging
+        return self.temp_dir / 'output'
+
+    def _write_manifest(
+        self,
+        files: Path | dict[str, bytes],
+        version: str,
+        options: TextureOptions,
+        *,
+        source: str | None = None,
+        plan: 'TexturePlan | None' = None,
+    ) -> None:
+        """Record the final textures in a manifest next to them, for `textureminer verify`.
+
+        Args:
+        ----
+            files (Path | dict[str, bytes]): directory of the final textures, or their paths mapped
+                to their PNG data, which the manifest is added to
+            version (str): version or resource pack the textures were made from
+            options (TextureOptions): options the textures were made with
+            source (str | None, optional): identity of the source, e.g. "jar:<sha1>"
+            plan (TexturePlan | None, optional): executed plan with the source of each texture
+
+        """
+        from textureminer.manifest import (  # noqa: PLC0415
+            MANIFEST_FILE,
+            build_manifest,
+            write_manifest,
+        )
+
+        manifest = build_manifest(
+            files,
+            edition=self.EDITION_TYPE.value,
+            version=version,
+            options=options,
+            source=source,
+            sources={name: op.source for name, op in plan.textures.items()} if plan else None,
+            source_digests=plan.source_digests if plan else None,
+        )
+        if isinstance(files, Path):
+            write_manifest(files, manifest)
+        else:
+            files[MANIFEST_FILE] = json.dumps(manifest.to_json(), indent=2).encode()
+
+    def _publish(
+        self,
+        local_dir: Path,
+        output: Path | Storage,
+        *,
+        reproducible: bool = False,
+    ) -> Path | Storage:
+        """Publish textures from a local directory to their final location.
+
+        Args:
+        ----
+            local_dir (Path): directory with the final textures, from `_staging_dir`
+            output (Path | Storage): final location of the textures
+            reproducible (bool, optional): set the modification times of a local output to a
+                fixed time, see `reproducible_mtime`
 
         Returns:
         -------
-            Path | None: directory of the final textures or None if invalid input
+            Path | Storage: the final location
 
         """
+        if isinstance(output, Path | LocalStorage):
+            output_path = output if isinstance(output, Path) else output.path
+            replace_dir(local_dir, output_path)
+            if reproducible:
+                # set after the rename, which can change the time of the moved directory
+                set_mtimes(output_path, reproducible_mtime())
+            for root in [root for root in self._staging_roots if local_dir.is_relative_to(root)]:
+                rm_if_exists(root)
+                self._staging_roots.discard(root)
+            return output
+
+        output.clear()
+        output.put_tree(local_dir)
+        return output
+
+    @property
+    @abstractmethod
+    def rules(self) -> RuleSet:
+        """Texture rules of the edition."""
 
     @abstractmethod
     def get_version_type(self, version: str) -> VersionType | None:
@@ -132,13 +550,28 @@ class Edition(ABC):
 
         """
 
+    @abstractmethod
+    def get_version_index(self, *, refresh: bool = False) -> VersionIndex:
+        """Get an index of all known versions for range and time-window queries.
+
+        Args:
+        ----
+            refresh (bool, optional): whether to bypass the locally cached version list
+
+        Returns:
+        -------
+            VersionIndex: index of the versions
+
+        """
+
     @staticmethod
+    @cache
     def validate_version(  # noqa: C901, PLR0911
         version: str,
         version_type: VersionType | None = None,
         edition: EditionType | None = None,
     ) -> bool:
-        """Validate a version string based on the version type using regex.
+        """Validate a version string based on the version type using regex. Results are cached.
 
         Args:
         ----
@@ -156,38 +589,38 @@ class Edition(ABC):
                 version = f'v{version}'
             if version_type is None:
                 return bool(
-                    re.match(REGEX_BEDROCK_RELEASE, version)
-                    or re.match(REGEX_BEDROCK_PREVIEW, version),
+                    PATTERN_BEDROCK_RELEASE.match(version)
+                    or PATTERN_BEDROCK_PREVIEW.match(version),
                 )
             if version_type == VersionType.STABLE:
-                return bool(re.match(REGEX_BEDROCK_RELEASE, version))
+                return bool(PATTERN_BEDROCK_RELEASE.match(version))
             if version_type == VersionType.EXPERIMENTAL:
-                return bool(re.match(REGEX_BEDROCK_PREVIEW, version))
+                return bool(PATTERN_BEDROCK_PREVIEW.match(version))
 
         if edition == EditionType.JAVA:
             if version_type is None:
                 return bool(
-                    re.match(REGEX_JAVA_RELEASE, version)
-                    or re.match(REGEX_JAVA_SNAPSHOT, version)
-                    or re.match(REGEX_JAVA_PRE, version)
-                    or re.match(REGEX_JAVA_RC, version),
+                    PATTERN_JAVA_RELEASE.match(version)
+                    or PATTERN_JAVA_SNAPSHOT.match(version)
+                    or PATTERN_JAVA_PRE.match(version)
+                    or PATTERN_JAVA_RC.match(version),
                 )
             if version_type == VersionType.STABLE:
-                return bool(re.match(REGEX_JAVA_RELEASE, version))
+                return bool(PATTERN_JAVA_RELEASE.match(version))
             if version_type == VersionType.EXPERIMENTAL:
                 return bool(
-                    re.match(REGEX_JAVA_SNAPSHOT, version)
-                    or re.match(REGEX_JAVA_PRE, version)
-                    or re.match(REGEX_JAVA_RC, version),
+                    PATTERN_JAVA_SNAPSHOT.match(version)
+                    or PATTERN_JAVA_PRE.match(version)
+                    or PATTERN_JAVA_RC.match(version),
                 )
 
         is_valid = (
-            re.match(REGEX_BEDROCK_PREVIEW, version)
-            or re.match(REGEX_BEDROCK_RELEASE, version)
-            or re.match(REGEX_JAVA_RELEASE, version)
-            or re.match(REGEX_JAVA_SNAPSHOT, version)
-            or re.match(REGEX_JAVA_PRE, version)
-            or re.match(REGEX_JAVA_RC, version)
+            PATTERN_BEDROCK_PREVIEW.match(version)
+            or PATTERN_BEDROCK_RELEASE.match(version)
+            or PATTERN_JAVA_RELEASE.match(version)
+            or PATTERN_JAVA_SNAPSHOT.match(version)
+            or PATTERN_JAVA_PRE.match(version)
+            or PATTERN_JAVA_RC.match(version)
         )
 
         if is_valid:
@@ -197,12 +630,12 @@ class Edition(ABC):
             version = f'v{version}'
 
         return bool(
-            re.match(REGEX_BEDROCK_PREVIEW, version)
-            or re.match(REGEX_BEDROCK_RELEASE, version)
-            or re.match(REGEX_JAVA_RELEASE, version)
-            or re.match(REGEX_JAVA_SNAPSHOT, version)
-            or re.match(REGEX_JAVA_PRE, version)
-            or re.match(REGEX_JAVA_RC, version),
+            PATTERN_BEDROCK_PREVIEW.match(version)
+            or PATTERN_BEDROCK_RELEASE.match(version)
+            or PATTERN_JAVA_RELEASE.match(version)
+            or PATTERN_JAVA_SNAPSHOT.match(version)
+            or PATTERN_JAVA_PRE.match(version)
+            or PATTERN_JAVA_RC.match(version),
         )
 
     @staticmethod
@@ -211,7 +644,7 @@ class Edition(ABC):
         output_dir: Path,
         edition: EditionType = EditionType.JAVA,
     ) -> Path:
-        """Remove files that are not item or block textures.
+        """Copy the item and block textures, leaving out every file that is not a PNG image.
 
         Args:
         ----
@@ -236,13 +669,20 @@ class Edition(ABC):
         blocks_output = output_dir / 'blocks'
         items_output = output_dir / 'items'
 
+        def ignore_non_png(directory: str, names: list[str]) -> list[str]:
+            return [
+                name
+                for name in names
+                if not name.endswith('.png') and not (Path(directory) / name).is_dir()
+            ]
+
         logging.getLogger('textureminer').debug(
             texts.COPYING_TEXTURES.format(
                 input=blocks_input,
                 output=blocks_output,
             )
         )
-        copytree(blocks_input, blocks_output)
+        copytree(blocks_input, blocks_output, ignore=ignore_non_png)
 
         logging.getLogger('textureminer').debug(
             texts.COPYING_TEXTURES.format(
@@ -250,11 +690,7 @@ class Edition(ABC):
                 output=items_output,
             )
         )
-        copytree(items_input, items_output)
-
-        logging.getLogger('textureminer').debug(texts.FILTERING_TEXTURES)
-        fs.filter_type(blocks_output.as_posix(), ('.png',))
-        fs.filter_type(items_output.as_posix(), ('.png',))
+        copytree(items_input, items_output, ignore=ignore_non_png)
 
         return output_dir
 
@@ -276,50 +712,123 @@ class Edition(ABC):
         if output_path is None:
             output_path = image_path
 
-        transparent_color = (255, 255, 255, 0)
+        with Pil_Image.open(image_path) as img:
+            cropped = Edition.crop_image(img, crop_shape)
+        save_png(cropped, output_path)
 
-        match crop_shape:
-            case BlockShape.SQUARE:
-                Pil_Image.open(image_path).crop((0, 0, 16, 16)).save(output_path)
+    @staticmethod
+    def crop_textures(crops: Sequence[tuple[Path, BlockShape, Path]]) -> None:
+        """Crop many textures in parallel.
+
+        Every texture is read before any is written, so a texture can be both the input of one
+        crop and the output of another.
+
+        Args:
+        ----
+            crops (Sequence[tuple[Path, BlockShape, Path]]): path of the texture to crop, shape to
+                crop it to and path to save the cropped texture to
+
+        """
 
-            case BlockShape.SLAB:
-                img = Pil_Image.open(image_path).convert('RGBA')
-                img.paste(transparent_color, (0, 0, 16, 8))
-                img.save(output_path)
+        def crop(job: tuple[Path, BlockShape, Path]) -> Pil_Image.Image:
+            with Pil_Image.open(job[0]) as img:
+                return Edition.crop_image(img, job[1])
 
-            case BlockShape.STAIR:
-                img = Pil_Image.open(image_path).convert('RGBA')
-                img.paste(transparent_color, (8, 0, 16, 8))
-                img.save(output_path)
+        cropped = thread_map(crop, crops)
+        thread_map(lambda item: save_png(item[0], item[1][2]), zip(cropped, crops, strict=True))
 
-            case BlockShape.CARPET:
-                img = Pil_Image.open(image_path).convert('RGBA')
-                img.paste(transparent_color, (0, 0, 16, 15))
-                img.save(output_path)
+    @staticmethod
+    def crop_image(img: Pil_Image.Image, crop_shape: BlockShape) -> Pil_Image.Image:
+        """Crop an opened texture to a specific shape.
 
-            case BlockShape.SNOW:
-                img = Pil_Image.open(image_path).convert('RGBA')
-                img.paste(transparent_color, (0, 0, 16, 14))
-                img.save(output_path)
+        The shape is scaled to the width of the texture, so high resolution textures get the same
+        shape as the 16x16 ones. Only the first frame of an animated texture is cropped.
 
-            case BlockShape.GLASS_PANE:
-                img = Pil_Image.open(image_path).convert('RGBA')
-                img.paste(transparent_color, (0, 0, 7, 16))
-                img.paste(transparent_color, (9, 0, 16, 16))
-                img.save(output_path)
+        Args:
+        ----
+            img (Pil_Image.Image): texture to crop
+            crop_shape (BlockShape): shape to crop the texture to
 
-            case _:
-                unknown_block_shape_msg = f'Unknown block shape {crop_shape}'
-                raise ValueError(unknown_block_shape_msg)
+        Returns:
+        -------
+            Pil_Image.Image: cropped texture
+
+        """
+        if crop_shape not in SHAPE_CUTOUTS:
+            unknown_block_shape_msg = f'Unknown block shape {crop_shape}'
+            raise ValueError(unknown_block_shape_msg)
+
+        if crop_shape == BlockShape.SQUARE:
+            side = min(img.width, img.height)
+            return img.crop((0, 0, side, side))
+
+        img = img.convert('RGBA')
+        mask, background = Edition.shape_mask(crop_shape, img.width, img.height)
+        return Pil_Image.composite(img, background, mask)
+
+    @staticmethod
+    def crop_images(
+        images: Iterable[Pil_Image.Image],
+        crop_shape: BlockShape,
+    ) -> list[Pil_Image.Image]:
+        """Crop many opened textures to a specific shape in parallel.
+
+        Args:
+        ----
+            images (Iterable[Pil_Image.Image]): textures to crop
+            crop_shape (BlockShape): shape to crop the textures to
+
+        Returns:
+        -------
+            list[Pil_Image.Image]: cropped textures in the same order
+
+        """
+        return thread_map(lambda img: Edition.crop_image(img, crop_shape), images)
 
     @staticmethod
-    def replicate_textures(asset_dir: Path, replication_rules: dict[str, str]) -> int:
+    @cache
+    def shape_mask(
+        crop_shape: BlockShape,
+        width: int,
+        height: int,
+    ) -> tuple[Pil_Image.Image, Pil_Image.Image]:
+        """Get the alpha mask of a shape for a texture size. Results are cached.
+
+        Args:
+        ----
+            crop_shape (BlockShape): shape of the mask
+            width (int): width of the texture
+            height (int): height of the texture
+
+        Returns:
+        -------
+            tuple[Pil_Image.Image, Pil_Image.Image]: mask that is opaque where the texture is kept,
+                and the transparent background that replaces the rest
+
+        """
+        mask = Pil_Image.new('L', (width, height), 255)
+        for left, top, right, bottom in SHAPE_CUTOUTS[crop_shape]:
+            mask.paste(
+                0,
+                (left * width // 16, top * width // 16, right * width // 16, bottom * width // 16),
+            )
+        background = Pil_Image.new('RGBA', (width, height), (255, 255, 255, 0))
+        return mask, background
+
+    @staticmethod
+    def replicate_textures(
+        asset_dir: Path,
+        replication_rules: Mapping[str, str],
+        index: Mapping[str, list[Path]] | None = None,
+    ) -> int:
         """Replicate textures in a directory.
 
         Args:
         ----
             asset_dir (Path): path to the directory containing the textures
-            replication_rules (dict): dictionary containing the replication rules
+            replication_rules (Mapping[str, str]): texture names mapped to their replicated names
+            index (Mapping[str, list[Path]] | None, optional): textures of the directory indexed
+                by name, built from the directory if None
 
         Returns:
         -------
@@ -328,15 +837,13 @@ class Edition(ABC):
         """
         logging.getLogger('textureminer').info(texts.TEXTURES_REPLICATING)
 
+        if index is None:
+            index = index_files(asset_dir)
+
         count = 0
-        originals = list(replication_rules.keys())
-        for subpath in asset_dir.rglob('*'):
-            if not subpath.is_file() or subpath.suffix != '.png':
-                continue
-            file_name = subpath.stem
-            if file_name in originals:
-                replicated_path = subpath.parent / f'{replication_rules[file_name]}.png'
-                copyfile(subpath, replicated_path)
+        for original, replicated in replication_rules.items():
+            for subpath in index.get(original, ()):
+                copyfile(subpath, subpath.parent / f'{replicated}.png')
                 count += 1
 
         return count
@@ -348,15 +855,23 @@ class Edition(ABC):
         *,
         do_merge: bool = DEFAULTS['TEXTURE_OPTIONS']['DO_MERGE'],
         do_crop: bool = DEFAULTS['TEXTURE_OPTIONS']['DO_CROP'],
+        reencode: bool = False,
+        budget: MemoryBudget | None = None,
     ) -> Path:
         """Scales textures within a directory by a factor.
 
+        Textures are processed in parallel, admitted under the memory budget by the size of the
+        decoded and scaled texture read from the PNG header.
+
         Args:
         ----
             path (Path): path of the textures that will be scaled
             scale_factor (int, optional): factor that the textures will be scaled by
             do_merge (bool, optional): merge block and item texture files into a single directory
             do_crop (bool, optional): crop non-square textures to be square
+            reencode (bool, optional): also decode and encode again the textures that are not
+                cropped or scaled, so none keeps the metadata chunks of its source
+            budget (MemoryBudget | None, optional): memory budget that textures are scaled under
 
         Returns:
         -------
@@ -367,20 +882,87 @@ class Edition(ABC):
             Edition.merge_dirs(path, path)
 
         logging.getLogger('textureminer').info(texts.TEXTURES_FILTERING)
-        for file in path.rglob('*'):
-            if not file.is_file():
-                continue
+        files = [file for file in path.rglob('*') if file.is_file()]
+        for file in files:
             if file.suffix != '.png':
                 file.unlink()
+        files = [file for file in files if file.suffix == '.png']
 
+        # checked once, so the per-texture events cost nothing unless they are logged
+        log_files = logging.getLogger('textureminer').isEnabledFor(logging.DEBUG)
+
+        def scale(file: Path) -> None:
             if do_crop:
                 Edition.crop_texture(file, BlockShape.SQUARE, file)
 
             if scale_factor != 1:
-                image.scale(file.as_posix(), scale_factor, scale_factor)
+                with Pil_Image.open(file) as img:
+                    scaled = img.resize(
+                        (img.width * scale_factor, img.height * scale_factor),
+                        resample=Pil_Image.Resampling.NEAREST,
+                    )
+                save_png(scaled, file)
+            elif reencode and not do_crop:
+                with Pil_Image.open(file) as img:
+                    img.load()
+                save_png(img, file)
+
+            if log_files:
+                log_event(
+                    'texture', name=file.relative_to(path).as_posix(), bytes=file.stat().st_size
+                )
+            progress.advance()
+
+        def cost(file: Path) -> int:
+            with file.open('rb') as f:
+                return texture_footprint(f.read(PNG_HEADER_SIZE), scale_factor)
+
+        with Progress('scale', len(files)) as progress:
+            thread_map(scale, files, budget=budget, cost=cost)
 
         return path
 
+    @staticmethod
+    def deduplicate_textures(path: Path, aliases_file: str = 'aliases.json') -> int:
+        """Store pixel-identical textures only once and write an alias map for the removed ones.
+
+        The canonical file of each group of identical textures is the one with the shortest name,
+        which is usually the base variant, for example "copper_block" over "waxed_copper_block".
+
+        Args:
+        ----
+            path (Path): directory of the textures that will be deduplicated
+            aliases_file (str, optional): name of the alias map written to the directory
+
+        Returns:
+        -------
+            int: number of duplicate textures removed
+
+        """
+        logging.getLogger('textureminer').info(texts.TEXTURES_DEDUPLICATING)
+
+        files = sorted(path.rglob('*.png'))
+        digests = thread_map(hash_pixels, files)
+
+        aliases = alias_map(
+            {
+                file.relative_to(path).as_posix(): digest
+                for file, digest in zip(files, digests, strict=True)
+            }
+        )
+
+        count = 0
+        for name, canonical in aliases.items():
+            if name != canonical:
+                (path / name).unlink()
+                count += 1
+
+        with (path / aliases_file).open('w', encoding='utf-8') as f:
+            json.dump(aliases, f, indent=2)
+
+        logging.getLogger('textureminer').debug(texts.TEXTURES_DEDUPLICATED_N.format(count=count))
+        return count
+
     @staticmethod
     def simplify_structure(_edition_type: EditionType, input_root: Path) -> None:
         """Simplify file structure of textures.
@@ -415,10 +997,5 @@ class Edition(ABC):
         """
         logging.getLogger('textureminer').info(texts.TEXTURES_MERGING)
 
-        block_folder = input_dir / 'blocks'
-        item_folder = input_dir / 'items'
-
-        copytree(block_folder, output_dir, dirs_exist_ok=True)
-        rmtree(block_folder)
-        copytree(item_folder, output_dir, dirs_exist_ok=True)
-        rmtree(item_folder)
+        move_tree(input_dir / 'blocks', output_dir)
+        move_tree(input_dir / 'items', output_dir)
@@ -1,34 +1,56 @@
 # noqa: N999
 """Provides a class representing the Java edition of Minecraft."""
 
+import hashlib
 import json
 import logging
-import re
 import string
-from collections.abc import Sequence
+from collections.abc import Iterator, Mapping, Sequence
+from collections.abc import Set as AbstractSet
 from enum import Enum
-from pathlib import Path
-from shutil import copyfile, copytree
-from typing import Any, ClassVar, override
+from functools import cached_property
+from http import HTTPStatus
+from io import BytesIO
+from pathlib import Path, PurePosixPath
+from typing import IO, Any, ClassVar, override
 from urllib.request import urlretrieve
 from zipfile import ZipFile
 
 import requests  # type: ignore[import]
+from PIL import Image as Pil_Image
 
 from textureminer import texts
+from textureminer.animation import Animation
+from textureminer.cache import cached_file, cached_json, read_json_cache, write_json_cache
 from textureminer.exceptions import FileFormatError
 from textureminer.file import mk_dir
+from textureminer.logger import log_stage
 from textureminer.options import DEFAULTS, EditionType, VersionType
-
-from .Edition import (
-    REGEX_JAVA_PRE,
-    REGEX_JAVA_RC,
-    REGEX_JAVA_RELEASE,
-    REGEX_JAVA_SNAPSHOT,
-    BlockShape,
-    Edition,
-    TextureOptions,
+from textureminer.parallel import thread_map
+from textureminer.progress import Progress
+from textureminer.resource_pack import ResourcePack
+from textureminer.rules import RuleSet, load_rules
+from textureminer.storage import LocalStorage, Storage
+from textureminer.textures import (
+    JAVA_TEXTURE_DIRS,
+    PlanEstimate,
+    TexturePlan,
+    deduplicate_files,
+    merged_path,
+    simplified_path,
+    write_files,
+)
+from textureminer.version import (
+    PATTERN_JAVA_PRE,
+    PATTERN_JAVA_RC,
+    PATTERN_JAVA_RELEASE,
+    PATTERN_JAVA_SNAPSHOT,
+    Version,
+    VersionKind,
 )
+from textureminer.version_index import VersionIndex
+
+from .Edition import BlockShape, Edition, TextureOptions
 
 
 class VersionManifestIdentifiers(Enum):
@@ -48,13 +70,17 @@ class Java(Edition):
     Attributes
     ----------
         VERSION_MANIFEST_URL (str): The URL of the version manifest.
-        VERSION_MANIFEST (dict): The cached version manifest.
+        VERSION_MANIFEST_CACHE (str): Name of the version manifest in the cache directory.
+        VERSION_MANIFEST_MAX_AGE (int): Seconds the cached version manifest is used for.
 
     """
 
+    EDITION_TYPE: ClassVar[EditionType] = EditionType.JAVA
     VERSION_MANIFEST_URL: ClassVar[str] = (
         'https://piston-meta.mojang.com/mc/game/version_manifest_v2.json'
     )
+    VERSION_MANIFEST_CACHE: ClassVar[str] = 'version_manifest_v2.json'
+    VERSION_MANIFEST_MAX_AGE: ClassVar[int] = 300
     ALLOWED_PARTIAL_SUFFIXES: ClassVar[Sequence[str]] = (
         '_slab',
         '_stairs',
@@ -69,54 +95,188 @@ class Java(Edition):
         ('dye_', '_slab'),  # re-dyed slabs
     )
 
-    TEXTURE_EXCEPTIONS: ClassVar[Sequence[dict[str, str]]] = (
-        {'from': 'smooth_quartz', 'to': 'quartz_block_bottom'},
-        {'from': 'smooth_sandstone', 'to': 'sandstone_top'},
-        {'from': 'smooth_red_sandstone', 'to': 'red_sandstone_top'},
-        {'from': 'smooth_stone', 'to': 'smooth_stone_slab_side'},
-    )
-
-    REPLICATE_MAP: ClassVar[dict[str, str]] = {
-        'glass_pane_top': 'glass_pane',
-        'red_stained_glass_pane_top': 'red_stained_glass_pane',
-        'orange_stained_glass_pane_top': 'orange_stained_glass_pane',
-        'yellow_stained_glass_pane_top': 'yellow_stained_glass_pane',
-        'lime_stained_glass_pane_top': 'lime_stained_glass_pane',
-        'green_stained_glass_pane_top': 'green_stained_glass_pane',
-        'cyan_stained_glass_pane_top': 'cyan_stained_glass_pane',
-        'light_blue_stained_glass_pane_top': 'light_blue_stained_glass_pane',
-        'blue_stained_glass_pane_top': 'blue_stained_glass_pane',
-        'purple_stained_glass_pane_top': 'purple_stained_glass_pane',
-        'magenta_stained_glass_pane_top': 'magenta_stained_glass_pane',
-        'pink_stained_glass_pane_top': 'pink_stained_glass_pane',
-        'white_stained_glass_pane_top': 'white_stained_glass_pane',
-        'light_gray_stained_glass_pane_top': 'light_gray_stained_glass_pane',
-        'gray_stained_glass_pane_top': 'gray_stained_glass_pane',
-        'black_stained_glass_pane_top': 'black_stained_glass_pane',
-        'brown_stained_glass_pane_top': 'brown_stained_glass_pane',
-    }
-
-    OVERWRITE_TEXTURES: ClassVar[dict[str, str]] = {
-        'snow': 'snow_block',
-    }
-
     version_manifest_cache: dict | None = None
 
+    jar_sha1: str | None = None
+
     _LETTER_TO_NUMBER: ClassVar[dict[str, int]] = {
         letter: index for index, letter in enumerate(string.ascii_lowercase)
     }
 
+    @cached_property
+    def rules(self) -> RuleSet:
+        """Texture rules of the Java Edition."""
+        return load_rules(EditionType.JAVA, self.rules_path)
+
     @override
     def get_textures(
         self,
-        version_or_type: VersionType | str,
-        output_dir: Path = DEFAULTS['OUTPUT_DIR'],
+        version_or_type: VersionType | str | Path,
+        output_dir: Path | Storage = DEFAULTS['OUTPUT_DIR'],
         options: TextureOptions | None = None,
-    ) -> Path | None:
+    ) -> Path | Storage | None:
         if options is None:
             options = DEFAULTS['TEXTURE_OPTIONS']
         logging.getLogger('textureminer').debug(texts.TEXTURE_OPTIONS.format(options=options))
 
+        if isinstance(version_or_type, Path):
+            return self.get_pack_textures(version_or_type, output_dir, options)
+
+        version = self._resolve_version(version_or_type)
+        jar = self._client_jar(version)
+        output = output_dir / 'java' / version
+        origin = f'jar:{self.jar_sha1}' if self.jar_sha1 is not None else None
+        reproducible = options.get('REPRODUCIBLE', False)
+
+        with ResourcePack(jar, version) as source:
+            with log_stage('plan'):
+                plan = self._plan_jar(source, jar, options)
+
+            if self.in_memory and not self._exceeds_budget(plan, source):
+                files: dict[str, bytes] = {}
+                with log_stage('execute'):
+                    plan.execute(source, files, budget=self.memory_budget)
+                    files.update(self._export_animations(jar, options))
+                if options.get('DO_DEDUPLICATE', False):
+                    with log_stage('deduplicate'):
+                        aliases = deduplicate_files(files)
+                    files['aliases.json'] = json.dumps(aliases, indent=2).encode()
+                with log_stage('manifest'):
+                    self._write_manifest(files, version, options, source=origin, plan=plan)
+                with log_stage('publish'):
+                    if not isinstance(output_dir, Path | LocalStorage):
+                        return write_files(files, output)
+                    # staged and renamed over the output, like the textures processed on disk
+                    staging = self._staging_dir(output_dir) / 'java' / version
+                    write_files(files, staging)
+                    return self._publish(staging, output, reproducible=reproducible)
+
+            staging = self._staging_dir(output_dir) / 'java' / version
+            mk_dir(staging, del_prev=True)
+            with log_stage('execute'):
+                plan.execute(source, staging, budget=self.memory_budget)
+
+        with log_stage('animations'):
+            for name, data in self._export_animations(jar, options).items():
+                (staging / name).write_bytes(data)
+
+        if options.get('DO_DEDUPLICATE', False):
+            with log_stage('deduplicate'):
+                Edition.deduplicate_textures(staging)
+
+        with log_stage('manifest'):
+            self._write_manifest(staging, version, options, source=origin, plan=plan)
+
+        with log_stage('publish'):
+            return self._publish(staging, output, reproducible=reproducible)
+
+    @override
+    def _estimate_version(
+        self,
+        version_or_type: VersionType | str,
+        options: TextureOptions,
+    ) -> PlanEstimate:
+        version = self._resolve_version(version_or_type)
+        jar = self._client_jar(version)
+        with ResourcePack(jar, version) as source:
+            return self._plan_jar(source, jar, options).estimate(source, source.size)
+
+    @override
+    def _iter_textures(
+        self,
+        version_or_type: VersionType | str,
+        options: TextureOptions,
+        *,
+        decode: bool,
+    ) -> Iterator[tuple[str, Pil_Image.Image | bytes]]:
+        version = self._resolve_version(version_or_type)
+        jar = self._client_jar(version)
+
+        with ResourcePack(jar, version) as source:
+            yield from self._plan_jar(source, jar, options).iter_execute(
+                source,
+                decode=decode,
+                budget=self.memory_budget,
+            )
+        yield from self._export_animations(jar, options).items()
+
+    def _client_jar(self, version: str) -> Path | IO[bytes]:
+        """Get the client .jar file of a version, in memory when running in memory.
+
+        Args:
+        ----
+            version (str): version to get the client .jar file of
+
+        Returns:
+        -------
+            Path | IO[bytes]: path or contents of the client .jar file
+
+        """
+        if self.in_memory:
+            return self._fetch_client_jar(version)
+        return self._download_client_jar(version, self.temp_dir / 'version-jars')
+
+    def _plan_jar(
+        self,
+        source: ResourcePack,
+        jar: Path | IO[bytes],
+        options: TextureOptions,
+    ) -> TexturePlan:
+        """Plan the textures of a client .jar file without decoding any of them.
+
+        Args:
+        ----
+            source (ResourcePack): the client .jar file opened as a resource pack
+            jar (Path | IO[bytes]): path or contents of the client .jar file with the recipes
+            options (TextureOptions): options for the textures
+
+        Returns:
+        -------
+            TexturePlan: replicated, partial, simplified and merged textures as set in the options
+
+        """
+        logging.getLogger('textureminer').info(texts.VERSION_USING_X.format(version=self.version))
+        return self._plan_pack(source, options, lambda: self._partial_plan(jar))
+
+    def _exceeds_budget(self, plan: TexturePlan, source: ResourcePack) -> bool:
+        """Check if the textures of a plan would not fit in the memory budget once encoded.
+
+        Args:
+        ----
+            plan (TexturePlan): plan of the textures
+            source (ResourcePack): source of the textures
+
+        Returns:
+        -------
+            bool: True if the textures should be written to disk instead of held in memory
+
+        """
+        if self.memory_budget is None:
+            return False
+        output_bytes = plan.estimate(source, source.size).output_bytes
+        if output_bytes <= self.memory_budget.limit:
+            return False
+        logging.getLogger('textureminer').info(
+            texts.TEXTURES_SPILLING.format(size=output_bytes // 2**20)
+        )
+        return True
+
+    def _resolve_version(self, version_or_type: VersionType | str) -> str:
+        """Resolve a version type to its latest version and validate the version.
+
+        Args:
+        ----
+            version_or_type (VersionType | str): a Minecraft version type, or a version string
+
+        Raises:
+        ------
+            ValueError: if the version is invalid or the latest version is not found
+
+        Returns:
+        -------
+            str: the version
+
+        """
         version = None
 
         if isinstance(version_or_type, VersionType):
@@ -132,38 +292,101 @@ class Java(Edition):
             raise ValueError(texts.ERROR_VERSION_INVALID.format(version=version_or_type))
 
         self.version = version
+        return version
 
-        assets = self._download_client_jar(version, self.temp_dir / 'version-jars')
-        logging.getLogger('textureminer').info(texts.VERSION_USING_X.format(version=version))
+    def _export_animations(
+        self,
+        jar: Path | IO[bytes],
+        options: TextureOptions,
+    ) -> dict[str, bytes]:
+        """Export the animated textures of a client .jar as set in the options.
 
-        extracted = self._extract_jar(assets, self.temp_dir / 'extracted-files')
+        Args:
+        ----
+            jar (Path | IO[bytes]): path or contents of the client .jar file
+            options (TextureOptions): options for the textures
 
-        textures_path = self.temp_dir / 'extracted-textures' / 'textures'
-        copytree(extracted / 'assets' / 'minecraft' / 'textures', textures_path)
+        Returns:
+        -------
+            dict[str, bytes]: paths relative to the output directory mapped to file contents,
+                empty if animations are not exported
 
-        filtered = Edition.filter_unwanted(
-            textures_path,
-            output_dir / 'java' / version,
-            edition=EditionType.JAVA,
-        )
+        """
+        animation_format = options.get('ANIMATION_FORMAT')
+        if animation_format is None:
+            return {}
 
-        if options['DO_REPLICATE']:
-            Edition.replicate_textures(filtered, self.REPLICATE_MAP)
+        animations = self._read_animations(jar)
 
-        if options['DO_PARTIALS']:
-            self._create_partial_textures(extracted, textures_path)
+        if options['DO_REPLICATE']:
+            for original, replicated in self.rules.replicate.items():
+                for name in [name for name in animations if PurePosixPath(name).stem == original]:
+                    animations[str(PurePosixPath(name).with_stem(replicated))] = animations[name]
 
         if options['SIMPLIFY_STRUCTURE']:
-            Edition.simplify_structure(EditionType.JAVA, filtered)
+            animations = {
+                simplified_path(name): animation for name, animation in animations.items()
+            }
+
+        if options['DO_MERGE']:
+            animations = {
+                merged_path(name): animations[name]
+                for name in sorted(animations, key=lambda name: name.startswith('items/'))
+            }
 
-        Edition.scale_textures(
-            filtered,
-            options['SCALE_FACTOR'],
-            do_merge=options['DO_MERGE'],
-            do_crop=options['DO_CROP'],
+        logging.getLogger('textureminer').info(
+            texts.ANIMATIONS_EXPORTING_N.format(count=len(animations))
         )
 
-        return filtered
+        def export(item: tuple[str, Animation]) -> dict[str, bytes]:
+            name, animation = item
+            stem = name.removesuffix('.png')
+            return {
+                f'{stem}{suffix}': data
+                for suffix, data in animation.encode(
+                    animation_format, options['SCALE_FACTOR']
+                ).items()
+            }
+
+        files: dict[str, bytes] = {}
+        for exported in thread_map(export, animations.items()):
+            files.update(exported)
+        return files
+
+    @staticmethod
+    def _read_animations(jar: Path | IO[bytes]) -> dict[str, Animation]:
+        """Read the animated block and item textures of a client .jar file.
+
+        Args:
+        ----
+            jar (Path | IO[bytes]): path or contents of the client .jar file
+
+        Returns:
+        -------
+            dict[str, Animation]: paths of the textures, e.g. "blocks/fire_0.png", mapped to
+                their animations
+
+        """
+        animations: dict[str, Animation] = {}
+        with ZipFile(jar, 'r') as zip_object:
+            names = set(zip_object.namelist())
+            for name in sorted(names):
+                texture = name.removesuffix('.mcmeta')
+                if texture == name or texture not in names:
+                    continue
+                for prefix, output in JAVA_TEXTURE_DIRS.items():
+                    if not texture.startswith(prefix):
+                        continue
+                    try:
+                        mcmeta = json.loads(zip_object.read(name))
+                        with Pil_Image.open(BytesIO(zip_object.read(texture))) as strip:
+                            animation = Animation.from_strip(strip, mcmeta)
+                    except (ValueError, KeyError, TypeError):
+                        # not an animation, e.g. only texture properties
+                        continue
+                    animations[f'{output}/{texture.removeprefix(prefix)}'] = animation
+
+        return animations
 
     @override
     def get_version_type(self, version: str) -> VersionType | None:
@@ -206,7 +429,7 @@ class Java(Edition):
             bool: True if version is a snapshot version, False otherwise
 
         """
-        return bool(re.match(REGEX_JAVA_SNAPSHOT, version))
+        return bool(PATTERN_JAVA_SNAPSHOT.match(version))
 
     @staticmethod
     def parse_snapshot(version: str) -> tuple[int, int, int]:
@@ -245,7 +468,7 @@ class Java(Edition):
             bool: True if version is a pre-release version, False otherwise
 
         """
-        return bool(re.match(REGEX_JAVA_PRE, version))
+        return bool(PATTERN_JAVA_PRE.match(version))
 
     @staticmethod
     def parse_pre(version: str) -> tuple[int, int, int]:
@@ -286,7 +509,7 @@ class Java(Edition):
             bool: True if version is a release candidate version, False otherwise
 
         """
-        return bool(re.match(REGEX_JAVA_RC, version))
+        return bool(PATTERN_JAVA_RC.match(version))
 
     @staticmethod
     def parse_rc(version: str) -> tuple[int, int, int]:
@@ -327,7 +550,7 @@ class Java(Edition):
             bool: True if version is a stable version, False otherwise
 
         """
-        return bool(re.match(REGEX_JAVA_RELEASE, version))
+        return bool(PATTERN_JAVA_RELEASE.match(version))
 
     @staticmethod
     def parse_stable(version: str) -> tuple[int, int]:
@@ -357,7 +580,7 @@ class Java(Edition):
         return int(parts[0]), int(parts[1])
 
     @staticmethod
-    def is_version_after(  # noqa: C901, PLR0911, PLR0912
+    def is_version_after(
         version: str,
         stable: str,
         snapshot: str | None = None,
@@ -380,82 +603,123 @@ class Java(Edition):
             bool: True if `version` is after or equal to a version of the same type, False otherwise
 
         """
-        if stable and not Java.is_stable(stable):
-            raise ValueError(texts.ERROR_VERSION_INVALID.format(version=stable))
-        if snapshot and not Java.is_snapshot(snapshot):
-            raise ValueError(texts.ERROR_VERSION_INVALID.format(version=snapshot))
-        if pre and not Java.is_pre(pre):
-            raise ValueError(texts.ERROR_VERSION_INVALID.format(version=pre))
-        if rc and not Java.is_rc(rc):
-            raise ValueError(texts.ERROR_VERSION_INVALID.format(version=rc))
-
-        if stable and Java.is_stable(version):
-            self_major, self_minor = Java.parse_stable(version)
-            other_major, other_minor = Java.parse_stable(stable)
-
-            if self_major != other_major:
-                return self_major > other_major
-            return self_minor >= other_minor
-
-        if snapshot and Java.is_snapshot(version):
-            year, week, self_build = Java.parse_snapshot(version)
-            other_year, other_week, other_build = Java.parse_snapshot(snapshot)
-
-            if year != other_year:
-                return year > other_year
-            if week != other_week:
-                return week > other_week
-            return self_build >= other_build
-
-        if pre and Java.is_pre(version):
-            self_major, self_minor, self_build = Java.parse_pre(version)
-            other_major, other_minor, other_build = Java.parse_pre(pre)
-
-            if self_major != other_major:
-                return self_major > other_major
-            if self_minor != other_minor:
-                return self_minor > other_minor
-            return self_build >= other_build
-
-        if rc and Java.is_rc(version):
-            self_major, self_minor, self_build = Java.parse_rc(version)
-            other_major, other_minor, other_build = Java.parse_rc(rc)
-
-            if self_major != other_major:
-                return self_major > other_major
-            if self_minor != other_minor:
-                return self_minor > other_minor
-            return self_build >= other_build
-
-        return False
-
-    def _get_version_manifest(self) -> dict:
-        """Fetch the version manifest from Mojang. Caches the result.
+        references: dict[VersionKind, str | None] = {
+            VersionKind.RELEASE: stable,
+            VersionKind.SNAPSHOT: snapshot,
+            VersionKind.PRE: pre,
+            VersionKind.RC: rc,
+        }
+        reference_versions: dict[VersionKind, Version] = {}
+        for kind, reference in references.items():
+            if not reference:
+                continue
+            reference_version = Version.try_parse(reference, EditionType.JAVA)
+            if reference_version is None or reference_version.kind != kind:
+                raise ValueError(texts.ERROR_VERSION_INVALID.format(version=reference))
+            reference_versions[kind] = reference_version
 
-        Returns
+        parsed = Version.try_parse(version, EditionType.JAVA)
+        if parsed is None or parsed.kind not in reference_versions:
+            return False
+
+        return parsed >= reference_versions[parsed.kind]
+
+    @override
+    def get_version_index(self, *, refresh: bool = False) -> VersionIndex:
+        return VersionIndex.from_java_manifest(self._get_version_manifest(refresh=refresh))
+
+    def _get_version_manifest(self, *, refresh: bool = False) -> dict:
+        """Fetch the version manifest from Mojang. Caches the result in memory and on disk.
+
+        Args:
+        ----
+            refresh (bool, optional): whether to bypass the cached version manifest
+
+        Returns:
         -------
             dict: The version manifest.
 
         """
-        if Java.version_manifest_cache is None:
-            logging.getLogger('textureminer').debug(
-                texts.FETCHING_VERSION_MANIFEST.format(url=Java.VERSION_MANIFEST_URL)
+        if Java.version_manifest_cache is None or refresh:
+            Java.version_manifest_cache = cached_json(
+                Java.VERSION_MANIFEST_CACHE,
+                Java._fetch_version_manifest,
+                max_age=Java.VERSION_MANIFEST_MAX_AGE,
+                refresh=refresh,
             )
-            Java.version_manifest_cache = requests.get(Java.VERSION_MANIFEST_URL, timeout=10).json()
 
         return Java.version_manifest_cache
 
-    def _download_client_jar(self, version: str, download_dir: Path) -> Path:
-        """Download the client .jar file for a specific version from Mojang's servers.
+    def poll_version_manifest(self, validators: Mapping[str, str]) -> dict[str, str]:
+        """Fetch the version manifest only if it changed since it was last fetched.
+
+        Sends a conditional request with the validators of the previous response, so an
+        unchanged manifest costs a single empty response. A changed manifest replaces the cached
+        one.
 
         Args:
         ----
-            version (str): version to download.
-            download_dir (Path): directory to download the file to
+            validators (Mapping[str, str]): "etag" and "last_modified" of the previous response
 
         Returns:
         -------
-            Path: path of the downloaded file.
+            dict[str, str]: validators of the current manifest, to pass to the next poll
+
+        """
+        cached = read_json_cache(Java.VERSION_MANIFEST_CACHE)
+        headers = {}
+        if cached is not None:
+            if 'etag' in validators:
+                headers['If-None-Match'] = validators['etag']
+            if 'last_modified' in validators:
+                headers['If-Modified-Since'] = validators['last_modified']
+
+        logging.getLogger('textureminer').debug(
+            texts.FETCHING_VERSION_MANIFEST.format(url=Java.VERSION_MANIFEST_URL)
+        )
+        response = requests.get(Java.VERSION_MANIFEST_URL, headers=headers, timeout=10)
+        if response.status_code == HTTPStatus.NOT_MODIFIED:
+            logging.getLogger('textureminer').debug(texts.VERSION_MANIFEST_NOT_MODIFIED)
+            # keep the cached manifest fresh for the regular readers
+            write_json_cache(Java.VERSION_MANIFEST_CACHE, cached)
+            Java.version_manifest_cache = cached
+            return dict(validators)
+
+        response.raise_for_status()
+        Java.version_manifest_cache = response.json()
+        write_json_cache(Java.VERSION_MANIFEST_CACHE, Java.version_manifest_cache)
+
+        header_names = {'etag': 'ETag', 'last_modified': 'Last-Modified'}
+        return {
+            name: response.headers[header]
+            for name, header in header_names.items()
+            if response.headers.get(header)
+        }
+
+    @staticmethod
+    def _fetch_version_manifest() -> dict:
+        """Fetch the version manifest from Mojang without caching.
+
+        Returns
+        -------
+            dict: The version manifest.
+
+        """
+        logging.getLogger('textureminer').debug(
+            texts.FETCHING_VERSION_MANIFEST.format(url=Java.VERSION_MANIFEST_URL)
+        )
+        return requests.get(Java.VERSION_MANIFEST_URL, timeout=10).json()
+
+    def _get_client_jar_url(self, version: str) -> str:
+        """Get the URL of the client .jar file for a specific version and remember its SHA-1.
+
+        Args:
+        ----
+            version (str): version to get the URL of
+
+        Returns:
+        -------
+            str: URL of the client .jar file
 
         """
         url = None
@@ -470,87 +734,154 @@ class Java(Edition):
 
         resp_json = requests.get(url, timeout=10).json()
         client_jar_url = resp_json['downloads']['client']['url']
+        self.jar_sha1 = resp_json['downloads']['client'].get('sha1')
         if type(client_jar_url) is not str:
             client_jar_url_msg = 'Client jar URL is not a string.'
             raise TypeError(client_jar_url_msg)
 
-        mk_dir(download_dir)
-        logging.getLogger('textureminer').info(texts.FILES_DOWNLOADING)
-
         if not client_jar_url.startswith(('http:', 'https:')):
             invalid_url_format_msg = 'URL must start with "http:" or "https:".'
             raise ValueError(invalid_url_format_msg)
-        jar_file = download_dir / f'{version}.jar'
-        urlretrieve(client_jar_url, jar_file)  # noqa: S310
-        return jar_file
+        return client_jar_url
 
-    def _extract_jar(self, jar_path: Path, output_dir: Path) -> Path:
-        """Extract files from a .jar file.
+    def _download_client_jar(self, version: str, download_dir: Path) -> Path:
+        """Download the client .jar file for a specific version from Mojang's servers.
+
+        When the SHA-1 of the file is known, the file is kept in the cache directory and shared
+        with other processes, which wait for a download in progress instead of repeating it.
 
         Args:
         ----
-            jar_path (Path): The path of the .jar file.
-            output_dir (Path): The path of the output directory.
+            version (str): version to download.
+            download_dir (Path): directory to download the file to if its SHA-1 is unknown
 
         Returns:
         -------
-            Path: The path of the output directory.
+            Path: path of the downloaded file.
 
         """
-        with ZipFile(jar_path, 'r') as zip_object:
-            file_amount = len(zip_object.namelist())
-            logging.getLogger('textureminer').info(
-                texts.FILES_EXTRACTING_N.format(file_amount=file_amount)
+        client_jar_url = self._get_client_jar_url(version)
+
+        if self.jar_sha1 is not None:
+            sha1 = self.jar_sha1
+            return cached_file(
+                f'jars/{sha1}.jar',
+                lambda path: Java._retrieve_file(client_jar_url, path, sha1),
             )
-            zip_object.extractall(output_dir)
 
-        return output_dir
+        mk_dir(download_dir)
+        return Java._retrieve_file(client_jar_url, download_dir / f'{version}.jar')
 
-    def _create_partial_textures(
-        self,
-        extracted_dir: Path,
-        texture_dir: Path,
-        *,
-        prevent_overwrite: bool = True,
-    ) -> None:
-        """Create partial textures like stairs and slabs for the Java Edition.
+    @staticmethod
+    def _retrieve_file(url: str, path: Path, sha1: str | None = None) -> Path:
+        """Download a file and verify its checksum.
 
         Args:
         ----
-            extracted_dir (Path): directory where the extracted files are
-            texture_dir (Path): directory where the textures are
-            prevent_overwrite (bool, optional): whether to copy textures to prevent overwrite
+            url (str): URL of the file
+            path (Path): path to download the file to
+            sha1 (str | None, optional): expected SHA-1 of the file, not verified if None
+
+        Raises:
+        ------
+            ValueError: if the SHA-1 of the downloaded file does not match
+
+        Returns:
+        -------
+            Path: path of the downloaded file
 
         """
-        logging.getLogger('textureminer').info(texts.CREATING_PARTIALS)
+        logging.getLogger('textureminer').info(texts.FILES_DOWNLOADING)
+        with Progress('download', unit='B') as progress:
 
-        # https://4mbl.link/textureminer/refs/recipe-directory/24w21a
-        if Java.is_version_after(
-            self.version,
-            '1.21',
-            snapshot='24w21a',
-            pre='1.21-pre1',
-            rc='1.21-rc1',
+            def report(blocks: int, block_size: int, total_size: int) -> None:
+                progress.set_total(total_size if total_size > 0 else None)
+                if blocks:
+                    progress.advance(block_size)
+
+            urlretrieve(url, path, report)  # noqa: S310
+
+        if sha1 is not None:
+            with path.open('rb') as f:
+                actual = hashlib.file_digest(f, 'sha1').hexdigest()
+            if actual != sha1:
+                raise ValueError(
+                    texts.ERROR_CHECKSUM_MISMATCH.format(path=path, expected=sha1, actual=actual)
+                )
+
+        return path
+
+    def _fetch_client_jar(self, version: str) -> BytesIO:
+        """Download the client .jar file for a specific version into memory.
+
+        Args:
+        ----
+            version (str): version to download.
+
+        Raises:
+        ------
+            ValueError: if the SHA-1 of the downloaded file does not match
+
+        Returns:
+        -------
+            BytesIO: contents of the client .jar file
+
+        """
+        client_jar_url = self._get_client_jar_url(version)
+
+        logging.getLogger('textureminer').info(texts.FILES_DOWNLOADING)
+        contents = BytesIO()
+        with (
+            requests.get(client_jar_url, timeout=60, stream=True) as response,
+            Progress('download', unit='B') as progress,
         ):
-            recipe_data_dir = extracted_dir / 'data' / 'minecraft' / 'recipe'
-        else:
-            recipe_data_dir = extracted_dir / 'data' / 'minecraft' / 'recipes'
+            response.raise_for_status()
+            length = response.headers.get('Content-Length')
+            progress.set_total(int(length) if length else None)
+            for chunk in response.iter_content(chunk_size=2**16):
+                contents.write(chunk)
+                progress.advance(len(chunk))
+
+        if self.jar_sha1 is not None:
+            actual = hashlib.sha1(contents.getbuffer()).hexdigest()  # noqa: S324
+            if actual != self.jar_sha1:
+                raise ValueError(
+                    texts.ERROR_CHECKSUM_MISMATCH.format(
+                        path=client_jar_url, expected=self.jar_sha1, actual=actual
+                    )
+                )
 
-        recipe_dir = self.temp_dir / 'extracted-textures' / 'recipes'
-        copytree(recipe_data_dir, recipe_dir)
+        contents.seek(0)
+        return contents
 
-        texture_dict = self._get_texture_dict(recipe_dir, texture_dir)
+    def _partial_plan(
+        self,
+        jar_path: Path | IO[bytes],
+        *,
+        prevent_overwrite: bool = True,
+    ) -> list[tuple[str, BlockShape | None, str]]:
+        """Get the partial textures to create from the recipes of a client .jar file.
+
+        Args:
+        ----
+            jar_path (Path | IO[bytes]): path or contents of the client .jar file with the recipes
+            prevent_overwrite (bool, optional): whether to copy textures to prevent overwrite
 
-        for texture_name, base_texture in texture_dict.items():
+        Returns:
+        -------
+            list[tuple[str, BlockShape | None, str]]: path of the base texture, shape to crop it to
+                or None to copy it, and path of the partial texture
+
+        """
+        plan: list[tuple[str, BlockShape | None, str]] = []
+        for texture_name, base_texture in self._get_texture_dict(jar_path).items():
             if (
                 texture_name == base_texture
                 and prevent_overwrite
-                and texture_name in self.OVERWRITE_TEXTURES
+                and texture_name in self.rules.overwrite
             ):
-                copyfile(
-                    texture_dir / 'block' / f'{texture_name}.png',
-                    texture_dir / 'block' / f'{self.OVERWRITE_TEXTURES[texture_name]}.png',
-                )
+                overwritten = self.rules.overwrite[texture_name]
+                plan.append((f'blocks/{texture_name}.png', None, f'blocks/{overwritten}.png'))
 
             if 'slab' in texture_name:
                 shape = BlockShape.SLAB
@@ -563,47 +894,115 @@ class Java(Edition):
             else:
                 continue
 
-            in_path = texture_dir / 'block' / f'{base_texture}.png'
-            out_path = texture_dir / 'block' / f'{texture_name}.png'
-            Edition.crop_texture(in_path, shape, out_path)
+            plan.append((f'blocks/{base_texture}.png', shape, f'blocks/{texture_name}.png'))
 
-    def _get_texture_dict(self, recipe_dir: Path, texture_dir: Path) -> dict[str, str]:
-        """Get texture-material mapping from recipe files.
+        return plan
+
+    @override
+    def _pack_partials(self) -> list[tuple[str, BlockShape | None, str]]:
+        """Get the partial textures to create for resource packs.
+
+        Resource packs have no recipes, so the ones of the latest stable version are used.
+
+        Returns
+        -------
+            list[tuple[str, BlockShape | None, str]]: path of the base texture, shape to crop it to
+                or None to copy it, and path of the partial texture
+
+        """
+        version = self._resolve_version(VersionType.STABLE)
+        jar = self._download_client_jar(version, self.temp_dir / 'version-jars')
+        return self._partial_plan(jar)
+
+    def _get_texture_dict(self, jar_path: Path | IO[bytes]) -> dict[str, str]:
+        """Get texture-material mapping from the recipes of a client .jar file.
+
+        The mapping is persisted in the cache by the SHA-1 of the .jar file and the texture rules,
+        so the recipes of a version are only parsed once.
 
         Args:
         ----
-            recipe_dir (Path): directory where the recipe files are
-            texture_dir (Path): directory where the texture files are
+            jar_path (Path | IO[bytes]): path or contents of the client .jar file
 
         Raises:
         ------
-            FileFormatException: if the recipe file cannot be parsed
+            FileFormatException: if a recipe cannot be parsed
 
         Returns:
         -------
             dict[str, str]: texture-material mapping
 
         """
-        texture_dict = {}
-        for recipe_file in Path(recipe_dir).rglob('*.json'):
-            product = recipe_file.stem
+        if self.jar_sha1 is None:
+            return self._build_texture_dict(jar_path)
 
-            if any(
-                all(skip in product for skip in skips) for skips in self.SKIPPED_PARTIAL_RECIPES
-            ):
-                continue
+        return cached_json(
+            f'recipes/{self.jar_sha1}-{self.rules.fingerprint[:16]}.json',
+            lambda: self._build_texture_dict(jar_path),
+        )
 
-            if not any(partial in product for partial in self.ALLOWED_PARTIAL_SUFFIXES) and not any(
-                literal == product for literal in self.ALLOWED_PARTIAL_LITERALS
-            ):
-                continue
+    def _build_texture_dict(self, jar_path: Path | IO[bytes]) -> dict[str, str]:
+        """Parse the texture-material mapping from the recipes of a client .jar file.
+
+        Args:
+        ----
+            jar_path (Path | IO[bytes]): path or contents of the client .jar file
+
+        Raises:
+        ------
+            FileFormatException: if a recipe cannot be parsed
+
+        Returns:
+        -------
+            dict[str, str]: texture-material mapping
+
+        """
+        # https://4mbl.link/textureminer/refs/recipe-directory/24w21a
+        if Java.is_version_after(
+            self.version,
+            '1.21',
+            snapshot='24w21a',
+            pre='1.21-pre1',
+            rc='1.21-rc1',
+        ):
+            recipe_prefix = 'data/minecraft/recipe/'
+        else:
+            recipe_prefix = 'data/minecraft/recipes/'
+        texture_prefix = 'assets/minecraft/textures/block/'
+
+        with ZipFile(jar_path, 'r') as zip_object:
+            names = zip_object.namelist()
+            texture_names = {
+                PurePosixPath(name).stem
+                for name in names
+                if name.startswith(texture_prefix) and name.endswith('.png')
+            }
+            recipe_names = [
+                name
+                for name in names
+                if name.startswith(recipe_prefix)
+                and name.endswith('.json')
+                and self._is_partial_recipe(PurePosixPath(name).stem)
+            ]
+            logging.getLogger('textureminer').debug(
+                texts.PARSING_RECIPES_N.format(recipe_amount=len(recipe_names))
+            )
 
-            try:
-                base_material = self._get_base_material_from_recipe(recipe_file, texture_dir)
-            except FileFormatError:
-                unknown_recipe_msg = f'Unknown recipe file format: {recipe_file}'
-                raise FileFormatError(unknown_recipe_msg) from None
+            def parse_recipe(recipe_name: str) -> str | None:
+                try:
+                    recipe_data = json.loads(zip_object.read(recipe_name))
+                    return self._get_base_material_from_recipe(
+                        recipe_name, recipe_data, texture_names
+                    )
+                except FileFormatError:
+                    unknown_recipe_msg = f'Unknown recipe file format: {recipe_name}'
+                    raise FileFormatError(unknown_recipe_msg) from None
 
+            base_materials = thread_map(parse_recipe, recipe_names)
+
+        texture_dict = {}
+        for recipe_name, base_material in zip(recipe_names, base_materials, strict=True):
+            product = PurePosixPath(recipe_name).stem
             if base_material is None:
                 not_found_msg = f'Could not find base material for {product}'
                 raise FileFormatError(not_found_msg)
@@ -612,68 +1011,88 @@ class Java(Edition):
 
         return texture_dict
 
+    def _is_partial_recipe(self, product: str) -> bool:
+        """Check if a recipe produces a block that has a partial texture.
+
+        Args:
+        ----
+            product (str): name of the recipe
+
+        Returns:
+        -------
+            bool: True if the recipe produces a partial block, False otherwise
+
+        """
+        if any(all(skip in product for skip in skips) for skips in self.SKIPPED_PARTIAL_RECIPES):
+            return False
+
+        return any(partial in product for partial in self.ALLOWED_PARTIAL_SUFFIXES) or any(
+            literal == product for literal in self.ALLOWED_PARTIAL_LITERALS
+        )
+
     def _get_base_material_from_recipe(
-        self, recipe_file_path: Path, texture_dir: Path
+        self,
+        recipe_name: str,
+        recipe_data: dict[str, Any],
+        texture_names: AbstractSet[str],
     ) -> str | None:
-        """Get the base material from a recipe file.
+        """Get the base material from a recipe.
 
         Args:
         ----
-            recipe_file_path (Path): path of the recipe file
-            texture_dir (Path): directory where the texture files are
+            recipe_name (str): name of the recipe file
+            recipe_data (dict[str, Any]): parsed recipe
+            texture_names (AbstractSet[str]): names of the existing block textures
 
         Raises:
         ------
-            FileFormatException: if the recipe file cannot be parsed
+            FileFormatException: if the recipe cannot be parsed
 
         Returns:
         -------
             str | None: base material name or None if not found
 
         """
-        with recipe_file_path.open(encoding='utf-8') as f:
-            recipe_data = json.load(f)
-
-            i = 0
-            while True:
-                if 'key' in recipe_data:
-                    materials = recipe_data['key']['#']
-                    if isinstance(materials, list):
-                        if i >= len(materials):
-                            unknown_recipe_msg = f'Unknown recipe file format: {recipe_file_path}'
-                            raise FileFormatError(unknown_recipe_msg)
-                        base_material = self._handle_recipe_incredient_format(materials[i])
-                    else:
-                        base_material = self._handle_recipe_incredient_format(materials)
-                        break
-                elif 'ingredients' in recipe_data:
-                    ingredients = recipe_data['ingredients']
-                    if isinstance(ingredients, list):
-                        if i >= len(ingredients):
-                            unknown_recipe_msg = f'Unknown recipe file format: {recipe_file_path}'
-                            raise FileFormatError(unknown_recipe_msg)
-                        base_material = self._handle_recipe_incredient_format(
-                            ingredients[i],
-                        )
-                    else:
-                        unknown_recipe_msg = f'Unknown recipe file format: {recipe_file_path}'
+        i = 0
+        while True:
+            if 'key' in recipe_data:
+                materials = recipe_data['key']['#']
+                if isinstance(materials, list):
+                    if i >= len(materials):
+                        unknown_recipe_msg = f'Unknown recipe file format: {recipe_name}'
                         raise FileFormatError(unknown_recipe_msg)
+                    base_material = self._handle_recipe_incredient_format(materials[i])
                 else:
-                    unknown_recipe_msg = f'Unknown recipe file format: {recipe_file_path}'
+                    base_material = self._handle_recipe_incredient_format(materials)
+                    break
+            elif 'ingredients' in recipe_data:
+                ingredients = recipe_data['ingredients']
+                if isinstance(ingredients, list):
+                    if i >= len(ingredients):
+                        unknown_recipe_msg = f'Unknown recipe file format: {recipe_name}'
+                        raise FileFormatError(unknown_recipe_msg)
+                    base_material = self._handle_recipe_incredient_format(
+                        ingredients[i],
+                    )
+                else:
+                    unknown_recipe_msg = f'Unknown recipe file format: {recipe_name}'
                     raise FileFormatError(unknown_recipe_msg)
+            else:
+                unknown_recipe_msg = f'Unknown recipe file format: {recipe_name}'
+                raise FileFormatError(unknown_recipe_msg)
 
-                if base_material is not None:
-                    break
-                i += 1
-            base_material = base_material.replace('minecraft:', '')
-            base_material = self._handle_texture_exceptions(
-                base_material,
-                self.TEXTURE_EXCEPTIONS,
-                texture_dir,
-            )
+            if base_material is not None:
+                break
+            i += 1
+        base_material = base_material.replace('minecraft:', '')
+        base_material = self._handle_texture_exceptions(
+            base_material,
+            self.rules.texture_exceptions,
+            texture_names,
+        )
 
-            if self._texture_exists(base_material, texture_dir):
-                return base_material
+        if base_material in texture_names:
+            return base_material
 
         return None
 
@@ -706,16 +1125,16 @@ class Java(Edition):
     def _handle_texture_exceptions(
         self,
         texture_name: str,
-        texture_exceptions: Sequence[dict[str, str]],
-        texture_dir: Path,
+        texture_exceptions: Mapping[str, str],
+        texture_names: AbstractSet[str],
     ) -> str:
         """Handle texture exceptions.
 
         Args:
         ----
             texture_name (str): name of the texture to handle
-            texture_exceptions (Sequence[dict[str, str]]): list of texture exception rules
-            texture_dir (Path): directory where the texture files are
+            texture_exceptions (Mapping[str, str]): base materials mapped to their texture names
+            texture_names (AbstractSet[str]): names of the existing block textures
 
         Returns:
         -------
@@ -725,23 +1144,10 @@ class Java(Edition):
         # waxed copper blocks use same texture as the base variant
         if 'copper' in texture_name:
             texture_name = texture_name.replace('waxed_', '')
-            if self._texture_exists(texture_name, texture_dir):
+            if texture_name in texture_names:
                 return texture_name
 
         if texture_name == 'snow_block':
             return 'snow'
 
-        for texture_exception in texture_exceptions:
-            if texture_name == texture_exception['from']:
-                texture_name = texture_exception['to']
-                if self._texture_exists(texture_name, texture_dir):
-                    return texture_name
-
-        return texture_name
-
-    def _texture_exists(self, texture_name: str, texture_dir: Path) -> bool:
-        return (
-            (texture_dir / 'block' / f'{texture_name}.png').is_file()
-            if texture_name is not None
-            else False
-        )
+        return texture_exceptions.get(texture_name, texture_name)
@@ -1,9 +1,54 @@
 """File utilities."""
 
+import logging
+import os
 import stat
-from collections.abc import Callable
+import sys
+import tempfile
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager, suppress
 from pathlib import Path
-from shutil import rmtree
+from shutil import copy2, rmtree
+from typing import BinaryIO
+
+from textureminer import texts
+
+if sys.platform == 'win32':
+    import msvcrt
+
+    def _try_lock(f: BinaryIO) -> bool:
+        f.seek(0)
+        try:
+            msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+        except OSError:
+            return False
+        return True
+
+    def _lock(f: BinaryIO) -> None:
+        while not _try_lock(f):
+            # LK_LOCK gives up after 10 seconds, so poll instead
+            time.sleep(0.1)
+
+    def _unlock(f: BinaryIO) -> None:
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+else:
+    import fcntl
+
+    def _try_lock(f: BinaryIO) -> bool:
+        try:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            return False
+        return True
+
+    def _lock(f: BinaryIO) -> None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+
+    def _unlock(f: BinaryIO) -> None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
 
 
 def rm_read_only(_func: Callable, path: str, _exc_info: object) -> None:
@@ -52,3 +97,173 @@ def mk_dir(path: Path, *, del_prev: bool = False) -> bool:
         path.mkdir(parents=True)
         return True
     return False
+
+
+def move_tree(src: Path, dst: Path) -> None:
+    """Move the files of a directory into another, replacing files with the same relative path.
+
+    Files are renamed, so nothing is copied when both directories are on the same filesystem.
+    The source directory is removed afterwards.
+
+    Args:
+    ----
+        src (Path): directory whose files are moved
+        dst (Path): directory the files are moved into, may contain the source directory
+
+    """
+    for file in sorted(src.rglob('*')):
+        if file.is_dir():
+            continue
+        target = dst / file.relative_to(src)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            file.replace(target)
+        except OSError:
+            # on another filesystem
+            copy2(file, target)
+            file.unlink()
+    rmtree(src, onexc=rm_read_only)
+
+
+def replace_dir(src: Path, dst: Path) -> None:
+    """Replace a directory with another one on the same filesystem by renaming it.
+
+    The previous directory is renamed out of the way before and removed after, so the path is
+    only missing between two renames and nothing is copied.
+
+    Args:
+    ----
+        src (Path): directory with the new contents
+        dst (Path): directory that will be replaced
+
+    """
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    previous = dst.with_name(f'.{dst.name}.{os.getpid()}.previous')
+    rm_if_exists(previous)
+    if dst.exists():
+        dst.rename(previous)
+    src.rename(dst)
+    rm_if_exists(previous)
+
+
+def index_files(root: Path, suffix: str = '.png') -> dict[str, list[Path]]:
+    """Index the files in a directory tree by their name without the suffix.
+
+    Args:
+    ----
+        root (Path): directory that will be indexed
+        suffix (str, optional): suffix of the files to index
+
+    Returns:
+    -------
+        dict[str, list[Path]]: paths of the files with each name
+
+    """
+    index: dict[str, list[Path]] = {}
+    for path in root.rglob(f'*{suffix}'):
+        if path.is_file():
+            index.setdefault(path.stem, []).append(path)
+    return index
+
+
+REPRODUCIBLE_MTIME = 315532800
+"""Modification time of reproducible outputs, 1980-01-01, the earliest time a zip file can hold."""
+
+
+def reproducible_mtime() -> int:
+    """Get the modification time of reproducible outputs.
+
+    Returns
+    -------
+        int: SOURCE_DATE_EPOCH if it is set, like other reproducible builds, else REPRODUCIBLE_MTIME
+
+    """
+    epoch = os.getenv('SOURCE_DATE_EPOCH', '')
+    return int(epoch) if epoch.isdigit() else REPRODUCIBLE_MTIME
+
+
+def set_mtimes(root: Path, mtime: float) -> None:
+    """Set the access and modification times of a directory tree, including the directories.
+
+    Args:
+    ----
+        root (Path): directory whose files and directories are changed
+        mtime (float): the new time, in seconds since the epoch
+
+    """
+    for path in root.rglob('*'):
+        os.utime(path, (mtime, mtime), follow_symlinks=False)
+    os.utime(root, (mtime, mtime))
+
+
+@contextmanager
+def file_lock(path: Path) -> Iterator[None]:
+    """Hold an exclusive lock on a path that is shared between processes.
+
+    The lock is taken on a "<name>.lock" file next to the path, so the path itself can be created,
+    replaced or removed while the lock is held. Blocks until the lock is available.
+
+    Args:
+    ----
+        path (Path): file or directory to lock
+
+    """
+    lock_path = path.with_name(f'{path.name}.lock')
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+
+    with lock_path.open('a+b') as f:
+        if not _try_lock(f):
+            logging.getLogger('textureminer').debug(texts.LOCK_WAITING.format(path=path))
+            _lock(f)
+        try:
+            yield
+        finally:
+            _unlock(f)
+
+
+@contextmanager
+def atomic_path(path: Path) -> Iterator[Path]:
+    """Create a file or directory under a temporary name and move it to its path when done.
+
+    Readers never see a partially written result. If the block raises, the temporary file or
+    directory is removed and the path is left untouched.
+
+    Args:
+    ----
+        path (Path): final path of the file or directory
+
+    Yields:
+    ------
+        Path: temporary path in the same directory to write to, which does not exist yet
+
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, temp_name = tempfile.mkstemp(prefix=f'.{path.name}.', suffix='.tmp', dir=path.parent)
+    os.close(fd)
+    temp_path = Path(temp_name)
+    temp_path.unlink()
+
+    try:
+        yield temp_path
+        if temp_path.is_dir():
+            rm_if_exists(path)
+        temp_path.replace(path)
+    finally:
+        if temp_path.is_dir():
+            rmtree(temp_path, onexc=rm_read_only)
+        else:
+            with suppress(FileNotFoundError):
+                temp_path.unlink()
+
+
+def atomic_write(path: Path, data: bytes) -> None:
+    """Write a file so that readers see either the previous or the complete new contents.
+
+    Args:
+    ----
+        path (Path): file that will be written
+        data (bytes): contents of the file
+
+    """
+    with atomic_path(path) as temp_path:
+        temp_path.write_bytes(data)
@@ -0,0 +1,118 @@
+"""In-memory image utilities."""
+
+import hashlib
+import struct
+from collections.abc import Mapping
+from pathlib import Path, PurePosixPath
+from typing import IO
+
+from PIL import Image as Pil_Image
+
+
+def hash_pixels(image_path: Path | IO[bytes]) -> str:
+    """Hash the decoded pixels of an image.
+
+    Images that look the same hash the same even if their encoded bytes differ,
+    for example because of a different palette or compression level.
+
+    Args:
+    ----
+        image_path (Path | IO[bytes]): path or file object of the image to hash
+
+    Returns:
+    -------
+        str: hex digest of the image dimensions and RGBA pixel data
+
+    """
+    with Pil_Image.open(image_path) as img:
+        rgba = img.convert('RGBA')
+        digest = hashlib.sha256(f'{rgba.width}x{rgba.height}:'.encode())
+        digest.update(rgba.tobytes())
+    return digest.hexdigest()
+
+
+def save_png(img: Pil_Image.Image, fp: Path | IO[bytes]) -> None:
+    """Save an image as PNG with fixed encoder settings and no metadata.
+
+    Ancillary data carried over from the source, like an ICC profile or EXIF data, is dropped, so
+    equal images always encode to the same bytes.
+
+    Args:
+    ----
+        img (Pil_Image.Image): image to save
+        fp (Path | IO[bytes]): path or file object to save the image to
+
+    """
+    img.save(fp, format='PNG', optimize=False, compress_level=6, icc_profile=None)
+
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+PNG_HEADER_SIZE = 24
+"""Bytes at the start of a PNG file that hold the signature and the image dimensions."""
+
+
+def png_size(header: bytes) -> tuple[int, int] | None:
+    """Read the dimensions of a PNG image from its header without decoding it.
+
+    Args:
+    ----
+        header (bytes): at least the first `PNG_HEADER_SIZE` bytes of the image
+
+    Returns:
+    -------
+        tuple[int, int] | None: width and height, None if the data is not a PNG image
+
+    """
+    if len(header) < PNG_HEADER_SIZE or not header.startswith(PNG_SIGNATURE):
+        return None
+    width, height = struct.unpack('>II', header[16:24])
+    return width, height
+
+
+def texture_footprint(header: bytes, scale_factor: int = 1) -> int:
+    """Estimate the peak memory used to crop and scale a texture.
+
+    Both the decoded texture and the scaled texture are held as RGBA at the same time.
+
+    Args:
+    ----
+        header (bytes): at least the first `PNG_HEADER_SIZE` bytes of the texture
+        scale_factor (int, optional): factor that the texture is scaled by
+
+    Returns:
+    -------
+        int: estimated bytes, 0 if the data is not a PNG image
+
+    """
+    size = png_size(header)
+    if size is None:
+        return 0
+    return 4 * size[0] * size[1] * (1 + scale_factor**2)
+
+
+def alias_map(digests: Mapping[str, str]) -> dict[str, str]:
+    """Map each image to the canonical image of the group of images with the same pixel hash.
+
+    The canonical image of a group is the one with the shortest file name, which is usually the
+    base variant, for example "copper_block" over "waxed_copper_block".
+
+    Args:
+    ----
+        digests (Mapping[str, str]): relative POSIX paths of the images mapped to their pixel hash
+
+    Returns:
+    -------
+        dict[str, str]: every path mapped to its canonical path, sorted by path
+
+    """
+    groups: dict[str, list[str]] = {}
+    for name, digest in digests.items():
+        groups.setdefault(digest, []).append(name)
+
+    aliases: dict[str, str] = {}
+    for group in groups.values():
+        canonical = min(group, key=lambda name: (len(PurePosixPath(name).name), name))
+        for name in group:
+            aliases[name] = canonical
+
+    return dict(sorted(aliases.items()))
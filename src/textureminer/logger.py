@@ -1,8 +1,18 @@
 """Logging utilities."""
 
+import atexit
+import copy
+import json
 import logging
 import os
-from typing import Any, override
+import queue
+import sys
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Literal, override
 
 from fortext import Fg, style
 
@@ -14,6 +24,11 @@ COLOR_MAP: dict[int, Fg] = {
     logging.CRITICAL: Fg.MAGENTA,
 }
 
+LOG_FORMATS = ('text', 'json')
+"""Formats the log can be written in."""
+
+LogFormat = Literal['text', 'json']
+
 
 class CustomLogger(logging.Logger):
     """Logger supporting NO_COLOR environment variable and tabbed output."""
@@ -22,6 +37,7 @@ class CustomLogger(logging.Logger):
     def __init__(self, name: str, level: int = 0) -> None:
         super().__init__(name, level)
         self.color_disabled = os.getenv('NO_COLOR') == '1'
+        self._tabs = {level: self._make_tab(color) for level, color in COLOR_MAP.items()}
 
     def _make_tab(self, color: Fg) -> str:
         asterisk = '*' if self.color_disabled else style('*', fg=color)
@@ -38,9 +54,19 @@ class CustomLogger(logging.Logger):
         stacklevel: int = 1,
         extra: Any | None = None,
     ) -> None:
+        # nothing is formatted for messages below the level, e.g. debug messages in loops
+        if not self.isEnabledFor(level):
+            return
         msg_str = str(msg)
-        tab = self._make_tab(COLOR_MAP[level])
-        super().log(level, tab + msg_str if '\n' not in msg_str else msg_str, *args)
+        super().log(
+            level,
+            self._tabs[level] + msg_str if '\n' not in msg_str else msg_str,
+            *args,
+            exc_info=exc_info,
+            stack_info=stack_info,
+            stacklevel=stacklevel,
+            extra={'text': msg_str, **(extra or {})},
+        )
 
     @override
     def debug(self, msg: object, *args: object, **kwargs: Any) -> None:
@@ -85,17 +111,203 @@ class CustomFormatter(logging.Formatter):
     @override
     def format(self, record: logging.LogRecord) -> str:
         if self.level == logging.DEBUG:
-            return f'{record.relativeCreated:07.0f} {record.msg}'
-        return record.msg
+            return f'{record.relativeCreated:07.0f} {record.getMessage()}'
+        return record.getMessage()
+
+
+class JsonFormatter(logging.Formatter):
+    """Formatter writing each record as a JSON object on its own line.
+
+    Records logged with `log_event` carry the name of the event and its fields, other records are
+    "message" events.
+    """
+
+    @override
+    def format(self, record: logging.LogRecord) -> str:
+        event = {
+            'time': round(record.created, 6),
+            'level': record.levelname.lower(),
+            'event': getattr(record, 'event', 'message'),
+            'message': getattr(record, 'text', None) or record.getMessage(),
+            **getattr(record, 'fields', {}),
+        }
+        if record.exc_info:
+            event['exception'] = self.formatException(record.exc_info)
+        return json.dumps(event, default=str)
+
+
+class RecordQueueHandler(QueueHandler):
+    """Queue handler passing records to the listener with their arguments merged."""
+
+    @override
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # unlike the default, the message is not formatted here, so the formatter of the listener
+        # decides whether tracebacks are shown
+        record = copy.copy(record)
+        text = getattr(record, 'text', None)
+        if text is not None and record.args:
+            record.text = text % record.args
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+class StatusLine:
+    """Line kept below the log on stderr, e.g. a progress bar.
 
+    Log records written while the line is shown clear it first, and it is drawn again once the
+    batch of records is flushed, so records never end up in the middle of the line.
+
+    Attributes
+    ----------
+        lock (threading.RLock): lock held while anything is written to stderr
+        text (str | None): text of the line, None if there is no line
+        drawn (bool): whether the line is currently shown
+
+    """
+
+    def __init__(self) -> None:
+        """Initialize the status line."""
+        self.lock = threading.RLock()
+        self.text: str | None = None
+        self.drawn = False
+
+    def draw(self, text: str, *, final: bool = False) -> None:
+        """Draw the line, replacing its previous text.
+
+        Args:
+        ----
+            text (str): text of the line
+            final (bool, optional): end the line so it stays above later records, instead of
+                drawing it again below them
+
+        """
+        with self.lock:
+            # \033[K clears the rest of a longer previous line
+            sys.stderr.write('\r' + text + '\033[K' + ('\n' if final else ''))
+            sys.stderr.flush()
+            self.text = None if final else text
+            self.drawn = not final
+
+    def clear(self) -> None:
+        """Clear the line before other output, until it is restored or drawn again."""
+        with self.lock:
+            if self.drawn:
+                sys.stderr.write('\r\033[K')
+                self.drawn = False
+
+    def restore(self) -> None:
+        """Draw the line again after other output."""
+        with self.lock:
+            if self.text is not None and not self.drawn:
+                sys.stderr.write('\r' + self.text + '\033[K')
+                self.drawn = True
+
+
+STATUS_LINE = StatusLine()
+"""Status line shared by the progress bars and the log records written to stderr."""
+
+
+class BatchStreamHandler(logging.StreamHandler):
+    """Handler writing records to stderr, leaving flushing to `BatchQueueListener`.
+
+    `sys.stderr` is looked up on every write, as it can be replaced after the logger is set up,
+    and records are written around the `STATUS_LINE`.
+    """
 
-def get_logger(name: str | None = None, *, level: int = logging.INFO) -> logging.Logger:
+    @override
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            msg = self.format(record) + self.terminator
+            with STATUS_LINE.lock:
+                STATUS_LINE.clear()
+                sys.stderr.write(msg)
+        except Exception:  # noqa: BLE001
+            self.handleError(record)
+
+    @override
+    def flush(self) -> None:
+        with STATUS_LINE.lock:
+            STATUS_LINE.restore()
+            sys.stderr.flush()
+
+
+class BatchQueueListener(QueueListener):
+    """Queue listener that flushes its handlers only once the queue is empty."""
+
+    @override
+    def handle(self, record: logging.LogRecord) -> None:
+        super().handle(record)
+        if self.queue.empty():  # type: ignore[attr-defined]
+            for handler in self.handlers:
+                handler.flush()
+
+    @override
+    def stop(self) -> None:
+        # stopped both when the logger is set up again and at exit
+        if self._thread is not None:
+            super().stop()
+            # the last batch can end with the sentinel that stops the thread still queued
+            for handler in self.handlers:
+                handler.flush()
+
+
+def log_event(event: str, msg: str = '', *, level: int = logging.DEBUG, **fields: object) -> None:
+    """Log a structured event, doing nothing if the level is disabled.
+
+    Args:
+    ----
+        event (str): name of the event, e.g. "texture"
+        msg (str, optional): message shown in text logs, the event and its fields if empty
+        level (int, optional): level of the event
+        **fields (object): fields of the event, written as keys of the JSON object
+
+    """
+    logger = logging.getLogger('textureminer')
+    if not logger.isEnabledFor(level):
+        return
+    if not msg:
+        msg = ' '.join([event, *(f'{key}={value}' for key, value in fields.items())])
+    logger.log(level, msg, extra={'event': event, 'fields': fields})
+
+
+@contextmanager
+def log_stage(stage: str) -> Iterator[None]:
+    """Log the start and end of a stage of a pipeline as "stage" events with its duration.
+
+    Args:
+    ----
+        stage (str): name of the stage, e.g. "partials"
+
+    Yields:
+    ------
+        None: while the stage runs
+
+    """
+    log_event('stage', stage=stage, status='started')
+    start = time.perf_counter()
+    yield
+    log_event('stage', stage=stage, status='finished', seconds=time.perf_counter() - start)
+
+
+def get_logger(
+    name: str | None = None,
+    *,
+    level: int = logging.INFO,
+    log_format: LogFormat = 'text',
+) -> logging.Logger:
     """Get a logger with ColorFormatter.
 
+    Records are written to stderr by a background thread in batches, so logging never waits for
+    the terminal or a log pipeline on the critical path. Handlers added by earlier calls with the
+    same name are replaced.
+
     Args:
     ----
         name (str | None, optional): Name of the logger. Defaults to None.
         level (int, optional): Logging level. Defaults to logging.INFO.
+        log_format (LogFormat, optional): "text" for tabbed and colored messages, or "json" for a
+            JSON object per record. Defaults to "text".
 
     Returns:
     -------
@@ -104,9 +316,26 @@ def get_logger(name: str | None = None, *, level: int = logging.INFO) -> logging
     """
     logging.setLoggerClass(CustomLogger)
     logger: logging.Logger = logging.getLogger(name)
-    handler: logging.StreamHandler = logging.StreamHandler()
-    formatter = CustomFormatter(level=level)
-    handler.setFormatter(formatter)
-    logger.addHandler(handler)
+
+    for handler in list(logger.handlers):
+        listener = getattr(handler, 'listener', None)
+        if isinstance(listener, BatchQueueListener):
+            logger.removeHandler(handler)
+            listener.stop()
+            atexit.unregister(listener.stop)
+
+    stream_handler = BatchStreamHandler()
+    stream_handler.setFormatter(
+        JsonFormatter() if log_format == 'json' else CustomFormatter(level=level)
+    )
+    records: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+    queue_handler = RecordQueueHandler(records)
+    listener = BatchQueueListener(records, stream_handler)
+    queue_handler.listener = listener  # type: ignore[attr-defined]
+    listener.start()
+    # records still in the queue are written before the interpreter exits
+    atexit.register(listener.stop)
+
+    logger.addHandler(queue_handler)
     logger.setLevel(level)
     return logger
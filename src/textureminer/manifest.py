@@ -0,0 +1,432 @@
+"""Manifests of output directories, recording how every file was made, and their verification."""
+
+import hashlib
+import json
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from enum import Enum
+from io import BytesIO
+from pathlib import Path
+from typing import Any
+
+from PIL import Image as Pil_Image
+
+from textureminer import texts
+from textureminer.exceptions import FileFormatError
+from textureminer.options import TextureOptions
+from textureminer.parallel import thread_map
+from textureminer.textures import TextureSource
+
+MANIFEST_FILE = 'manifest.json'
+"""Name of the manifest in an output directory."""
+
+
+def options_fingerprint(options: Mapping[str, Any]) -> str:
+    """Get a fingerprint of texture options that is the same for equal options.
+
+    Args:
+    ----
+        options (Mapping[str, Any]): options for the textures
+
+    Returns:
+    -------
+        str: SHA-256 of the options as canonical JSON
+
+    """
+    return hashlib.sha256(json.dumps(options, sort_keys=True).encode()).hexdigest()
+
+
+@dataclass(frozen=True, slots=True)
+class ManifestEntry:
+    """How a file of an output directory was made.
+
+    Attributes
+    ----------
+        sha256 (str): SHA-256 of the file
+        size (tuple[int, int] | None): dimensions of the image, None if the file is not an image
+        source (str | None): path of the source texture, None if not made from a single source
+        source_sha256 (str | None): SHA-256 of the source texture
+
+    """
+
+    sha256: str
+    size: tuple[int, int] | None = None
+    source: str | None = None
+    source_sha256: str | None = None
+
+    def to_json(self) -> dict[str, Any]:
+        """Convert the entry to a JSON serializable dictionary.
+
+        Returns
+        -------
+            dict[str, Any]: the entry as a dictionary
+
+        """
+        return {
+            'sha256': self.sha256,
+            'size': self.size,
+            'source': self.source,
+            'source_sha256': self.source_sha256,
+        }
+
+
+@dataclass(frozen=True, slots=True)
+class Manifest:
+    """Record of the files of an output directory and what they were made from.
+
+    Attributes
+    ----------
+        edition (str): edition of the textures
+        version (str): version or resource pack the textures were made from
+        source (str | None): identity of the source, e.g. "jar:<sha1>" for a client .jar or
+            "git:<commit>" for the Bedrock samples
+        options (dict[str, Any]): options the textures were made with
+        fingerprint (str): fingerprint of the options, see `options_fingerprint`
+        files (dict[str, ManifestEntry]): paths of the files mapped to their entries
+
+    """
+
+    edition: str
+    version: str
+    source: str | None
+    options: dict[str, Any]
+    fingerprint: str
+    files: dict[str, ManifestEntry] = field(default_factory=dict)
+
+    def to_json(self) -> dict[str, Any]:
+        """Convert the manifest to a JSON serializable dictionary.
+
+        Returns
+        -------
+            dict[str, Any]: the manifest as a dictionary
+
+        """
+        return {
+            'edition': self.edition,
+            'version': self.version,
+            'source': self.source,
+            'options': self.options,
+            'fingerprint': self.fingerprint,
+            'files': {name: self.files[name].to_json() for name in sorted(self.files)},
+        }
+
+    @classmethod
+    def from_json(cls, data: Mapping[str, Any]) -> 'Manifest':
+        """Read a manifest from its dictionary.
+
+        Args:
+        ----
+            data (Mapping[str, Any]): the manifest as a dictionary
+
+        Returns:
+        -------
+            Manifest: the manifest
+
+        """
+        return cls(
+            edition=data['edition'],
+            version=data['version'],
+            source=data.get('source'),
+            options=dict(data['options']),
+            fingerprint=data['fingerprint'],
+            files={
+                name: ManifestEntry(
+                    sha256=entry['sha256'],
+                    size=tuple(entry['size']) if entry.get('size') else None,  # type: ignore[arg-type]
+                    source=entry.get('source'),
+                    source_sha256=entry.get('source_sha256'),
+                )
+                for name, entry in data['files'].items()
+            },
+        )
+
+
+def _image_size(data: bytes) -> tuple[int, int] | None:
+    """Decode an image fully and get its dimensions, None if it is not an image."""
+    try:
+        with Pil_Image.open(BytesIO(data)) as img:
+            img.load()
+            return img.size
+    except (OSError, SyntaxError, ValueError):
+        return None
+
+
+def build_manifest(  # noqa: PLR0913
+    files: Path | Mapping[str, bytes],
+    *,
+    edition: str,
+    version: str,
+    options: TextureOptions,
+    source: str | None = None,
+    sources: Mapping[str, str] | None = None,
+    source_digests: Mapping[str, str] | None = None,
+) -> Manifest:
+    """Hash and decode the files of an output, in parallel, and record them in a manifest.
+
+    Args:
+    ----
+        files (Path | Mapping[str, bytes]): directory of the files, or their paths mapped to their
+            contents
+        edition (str): edition of the textures
+        version (str): version or resource pack the textures were made from
+        options (TextureOptions): options the textures were made with
+        source (str | None, optional): identity of the source
+        sources (Mapping[str, str] | None, optional): paths of the files mapped to the paths of
+            their source textures
+        source_digests (Mapping[str, str] | None, optional): paths of source textures mapped to
+            their SHA-256
+
+    Returns:
+    -------
+        Manifest: manifest of the files, not including the manifest itself
+
+    """
+    if isinstance(files, Path):
+        root = files
+        names = sorted(
+            path.relative_to(root).as_posix() for path in root.rglob('*') if path.is_file()
+        )
+        contents: Mapping[str, bytes] | None = None
+    else:
+        names = sorted(files)
+        contents = files
+    names = [name for name in names if name != MANIFEST_FILE]
+    sources = sources or {}
+    source_digests = source_digests or {}
+
+    def entry(name: str) -> ManifestEntry:
+        data = contents[name] if contents is not None else (root / name).read_bytes()
+        source_name = sources.get(name)
+        return ManifestEntry(
+            sha256=hashlib.sha256(data).hexdigest(),
+            size=_image_size(data) if name.endswith('.png') else None,
+            source=source_name,
+            source_sha256=source_digests.get(source_name) if source_name else None,
+        )
+
+    return Manifest(
+        edition=edition,
+        version=version,
+        source=source,
+        options=dict(options),
+        fingerprint=options_fingerprint(options),
+        files=dict(zip(names, thread_map(entry, names), strict=True)),
+    )
+
+
+def write_manifest(directory: Path, manifest: Manifest) -> Path:
+    """Write a manifest to a directory.
+
+    Args:
+    ----
+        directory (Path): directory the manifest records
+        manifest (Manifest): the manifest
+
+    Returns:
+    -------
+        Path: path of the manifest
+
+    """
+    path = directory / MANIFEST_FILE
+    with path.open('w', encoding='utf-8') as f:
+        json.dump(manifest.to_json(), f, indent=2)
+    return path
+
+
+def read_manifest(directory: Path) -> Manifest:
+    """Read the manifest of a directory.
+
+    Args:
+    ----
+        directory (Path): directory with a manifest
+
+    Raises:
+    ------
+        FileFormatError: if the directory has no valid manifest
+
+    Returns:
+    -------
+        Manifest: the manifest
+
+    """
+    path = directory / MANIFEST_FILE
+    try:
+        with path.open(encoding='utf-8') as f:
+            return Manifest.from_json(json.load(f))
+    except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+        raise FileFormatError(texts.ERROR_MANIFEST_INVALID.format(path=path)) from e
+
+
+class ProblemKind(Enum):
+    """Enum class representing how a file does not match its manifest."""
+
+    MISSING = 'missing'
+    """in the manifest but not in the directory
+    """
+    UNEXPECTED = 'unexpected'
+    """in the directory but not in the manifest
+    """
+    HASH = 'hash'
+    """contents differ from the manifest
+    """
+    SIZE = 'size'
+    """dimensions differ from the manifest, or the image cannot be decoded
+    """
+    SOURCE = 'source'
+    """source texture differs from the manifest or is missing from the source
+    """
+    OPTIONS = 'options'
+    """options do not match the fingerprint
+    """
+
+
+@dataclass(frozen=True, slots=True)
+class ManifestProblem:
+    """File that does not match its manifest.
+
+    Attributes
+    ----------
+        name (str): path of the file, or of the manifest for option problems
+        kind (ProblemKind): how the file does not match
+        expected (str | None): value in the manifest
+        actual (str | None): value found
+
+    """
+
+    name: str
+    kind: ProblemKind
+    expected: str | None = None
+    actual: str | None = None
+
+    def __str__(self) -> str:
+        """Describe the problem on one line."""
+        if self.expected is None and self.actual is None:
+            return f'{self.kind.value} {self.name}'
+        return f'{self.kind.value} {self.name} expected {self.expected} actual {self.actual}'
+
+    def to_json(self) -> dict[str, Any]:
+        """Convert the problem to a JSON serializable dictionary.
+
+        Returns
+        -------
+            dict[str, Any]: the problem as a dictionary
+
+        """
+        return {
+            'name': self.name,
+            'kind': self.kind.value,
+            'expected': self.expected,
+            'actual': self.actual,
+        }
+
+
+def _format_size(size: tuple[int, int] | None) -> str | None:
+    return None if size is None else f'{size[0]}x{size[1]}'
+
+
+def _check_options(manifest: Manifest, fingerprint: str | None) -> list[ManifestProblem]:
+    """Check that the options of a manifest match its fingerprint and the expected one."""
+    problems: list[ManifestProblem] = []
+    actual = options_fingerprint(manifest.options)
+    if actual != manifest.fingerprint:
+        problems.append(
+            ManifestProblem(MANIFEST_FILE, ProblemKind.OPTIONS, manifest.fingerprint, actual)
+        )
+    if fingerprint is not None and fingerprint != manifest.fingerprint:
+        problems.append(
+            ManifestProblem(MANIFEST_FILE, ProblemKind.OPTIONS, fingerprint, manifest.fingerprint)
+        )
+    return problems
+
+
+def _check_file(path: Path, name: str, entry: ManifestEntry) -> list[ManifestProblem]:
+    """Check the contents and dimensions of a file against its entry."""
+    problems: list[ManifestProblem] = []
+    data = path.read_bytes()
+    digest = hashlib.sha256(data).hexdigest()
+    if digest != entry.sha256:
+        problems.append(ManifestProblem(name, ProblemKind.HASH, entry.sha256, digest))
+    if entry.size is not None:
+        size = _image_size(data)
+        if size != entry.size:
+            expected, actual = _format_size(entry.size), _format_size(size)
+            problems.append(ManifestProblem(name, ProblemKind.SIZE, expected, actual))
+    return problems
+
+
+def _check_source(source: TextureSource, name: str, entry: ManifestEntry) -> list[ManifestProblem]:
+    """Check the source texture of a file against its entry."""
+    if entry.source is None or entry.source_sha256 is None:
+        return []
+    try:
+        digest: str | None = hashlib.sha256(source.read(entry.source)).hexdigest()
+    except (KeyError, OSError):
+        digest = None
+    if digest == entry.source_sha256:
+        return []
+    return [ManifestProblem(name, ProblemKind.SOURCE, entry.source_sha256, digest)]
+
+
+def verify_manifest(
+    directory: Path,
+    *,
+    source: TextureSource | None = None,
+    fingerprint: str | None = None,
+) -> list[ManifestProblem]:
+    """Check an output directory against its manifest, hashing and decoding files in parallel.
+
+    Args:
+    ----
+        directory (Path): output directory with a manifest
+        source (TextureSource | None, optional): source to also check the source textures in,
+            e.g. the client .jar opened as a resource pack
+        fingerprint (str | None, optional): fingerprint of the options the textures should have
+            been made with
+
+    Raises:
+    ------
+        FileFormatError: if the directory has no valid manifest
+
+    Returns:
+    -------
+        list[ManifestProblem]: problems found, sorted by path, empty if the directory matches
+
+    """
+    manifest = read_manifest(directory)
+    on_disk = {
+        path.relative_to(directory).as_posix() for path in directory.rglob('*') if path.is_file()
+    }
+    on_disk.discard(MANIFEST_FILE)
+
+    def check(name: str) -> list[ManifestProblem]:
+        entry = manifest.files[name]
+        if name in on_disk:
+            problems = _check_file(directory / name, name, entry)
+        else:
+            problems = [ManifestProblem(name, ProblemKind.MISSING)]
+        if source is not None:
+            problems.extend(_check_source(source, name, entry))
+        return problems
+
+    problems = _check_options(manifest, fingerprint)
+    for found in thread_map(check, sorted(manifest.files)):
+        problems.extend(found)
+    problems.extend(
+        ManifestProblem(name, ProblemKind.UNEXPECTED)
+        for name in sorted(on_disk - manifest.files.keys())
+    )
+    return problems
+
+
+__all__ = [
+    'MANIFEST_FILE',
+    'Manifest',
+    'ManifestEntry',
+    'ManifestProblem',
+    'ProblemKind',
+    'build_manifest',
+    'options_fingerprint',
+    'read_manifest',
+    'verify_manifest',
+    'write_manifest',
+]
@@ -1,9 +1,10 @@
 """Options for the program."""
 
+import os
 import tempfile
 from enum import Enum
 from pathlib import Path
-from typing import TypedDict
+from typing import NotRequired, TypedDict
 
 
 class VersionType(Enum):
@@ -34,10 +35,19 @@ class EditionType(Enum):
 class TextureOptions(TypedDict):
     """TypedDict class representing the options for textures."""
 
+    ANIMATION_FORMAT: NotRequired[str | None]
+    """Format to also export animated textures in, "apng", "webp" or "sheet" for a deduplicated
+    frame sheet with its ".mcmeta" file, or None to only keep the first frame
+    """
+
     DO_CROP: bool
     """Whether to crop non-square textures to be square
     """
 
+    DO_DEDUPLICATE: NotRequired[bool]
+    """Whether to store pixel-identical textures once and map their names in `aliases.json`
+    """
+
     DO_MERGE: bool
     """Whether to merge block and item textures into a single directory
     """
@@ -51,6 +61,11 @@ class TextureOptions(TypedDict):
     For example "glass_pane_top" to "glass_pane".
     """
 
+    REPRODUCIBLE: NotRequired[bool]
+    """Whether to set the modification times of the output files to a fixed time, so rerunning
+    the same version and options gives identical output, also in archives
+    """
+
     SIMPLIFY_STRUCTURE: bool
     """Whether to simplify file structure
     for example on Bedrock flattens candles to be directly in block and items directories.
@@ -66,6 +81,7 @@ class Options(TypedDict):
 
     Attributes
     ----------
+        CACHE_DIR (Path): The directory for data that is reused between runs.
         EDITION (EditionType): The type of edition to use.
         OUTPUT_DIR (Path): The output directory for the textures.
         TEMP_PATH (Path): The temporary path for processing.
@@ -74,6 +90,7 @@ class Options(TypedDict):
 
     """
 
+    CACHE_DIR: Path
     EDITION: EditionType
     OUTPUT_DIR: Path
     TEMP_PATH: Path
@@ -84,15 +101,19 @@ class Options(TypedDict):
 HOME_DIR = Path().home()
 
 DEFAULTS: Options = {
+    'CACHE_DIR': Path(os.getenv('XDG_CACHE_HOME', HOME_DIR / '.cache')) / 'textureminer',
     'EDITION': EditionType.JAVA,
     'OUTPUT_DIR': (HOME_DIR / 'textureminer'),
     'TEMP_PATH': Path(tempfile.gettempdir()) / 'textureminer',
     'VERSION': VersionType.ALL,
     'TEXTURE_OPTIONS': {
+        'ANIMATION_FORMAT': None,
         'DO_CROP': True,
+        'DO_DEDUPLICATE': False,
         'DO_MERGE': False,
         'DO_PARTIALS': True,
         'DO_REPLICATE': True,
+        'REPRODUCIBLE': False,
         'SIMPLIFY_STRUCTURE': True,
         'SCALE_FACTOR': 1,
     },
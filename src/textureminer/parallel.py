@@ -0,0 +1,206 @@
+"""Parallel execution utilities."""
+
+import threading
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+
+_SHARED_THREAD_PREFIX = 'textureminer-shared'
+_shared_executor: ThreadPoolExecutor | None = None
+
+
+class MemoryBudget:
+    """Admit tasks only while their estimated memory use fits under a limit.
+
+    Tasks that are estimated to use more than the whole limit still run, but alone, so they can
+    never be starved and the peak memory stays close to the limit.
+
+    Attributes
+    ----------
+        limit (int): maximum number of bytes reserved at once
+        peak (int): highest number of bytes reserved at once so far
+
+    """
+
+    def __init__(self, limit: int) -> None:
+        """Initialize the budget.
+
+        Args:
+        ----
+            limit (int): maximum number of bytes reserved at once
+
+        """
+        self.limit = limit
+        self.peak = 0
+        self._used = 0
+        self._condition = threading.Condition()
+
+    @contextmanager
+    def reserve(self, cost: int) -> Iterator[None]:
+        """Wait until a task fits in the budget and reserve its memory while it runs.
+
+        Args:
+        ----
+            cost (int): estimated bytes used by the task
+
+        Yields:
+        ------
+            None: while the memory is reserved
+
+        """
+        cost = min(cost, self.limit)
+        with self._condition:
+            self._condition.wait_for(lambda: self._used + cost <= self.limit)
+            self._used += cost
+            self.peak = max(self.peak, self._used)
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._used -= cost
+                self._condition.notify_all()
+
+
+def _budgeted[T, R](
+    fn: Callable[[T], R],
+    budget: MemoryBudget | None,
+    cost: Callable[[T], int] | None,
+) -> Callable[[T], R]:
+    """Wrap a function to reserve the estimated memory of each item in a budget while it runs."""
+    if budget is None or cost is None:
+        return fn
+
+    def run(item: T) -> R:
+        with budget.reserve(cost(item)):
+            return fn(item)
+
+    return run
+
+
+@contextmanager
+def shared_pool(max_workers: int | None = None) -> Iterator[ThreadPoolExecutor]:
+    """Run the `thread_map` and `thread_imap` calls of every thread on one pool of threads.
+
+    Pipelines running at the same time, like those of the Java and Bedrock editions, then share
+    the threads for image work instead of each starting as many as there are CPUs. Calls made from
+    a thread of the shared pool still get a pool of their own, so a task never waits for tasks
+    queued behind it.
+
+    Args:
+    ----
+        max_workers (int | None, optional): maximum number of threads, uses Python default if None
+
+    Yields:
+    ------
+        ThreadPoolExecutor: the shared pool
+
+    """
+    global _shared_executor  # noqa: PLW0603
+    with ThreadPoolExecutor(
+        max_workers=max_workers, thread_name_prefix=_SHARED_THREAD_PREFIX
+    ) as executor:
+        previous, _shared_executor = _shared_executor, executor
+        try:
+            yield executor
+        finally:
+            _shared_executor = previous
+
+
+@contextmanager
+def _executor(max_workers: int | None) -> Iterator[ThreadPoolExecutor]:
+    """Get the shared pool if there is one and no size was asked for, otherwise a new pool."""
+    shared = _shared_executor
+    if (
+        shared is not None
+        and max_workers is None
+        and not threading.current_thread().name.startswith(_SHARED_THREAD_PREFIX)
+    ):
+        yield shared
+        return
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        yield executor
+
+
+def thread_map[T, R](
+    fn: Callable[[T], R],
+    items: Iterable[T],
+    *,
+    max_workers: int | None = None,
+    budget: MemoryBudget | None = None,
+    cost: Callable[[T], int] | None = None,
+) -> list[R]:
+    """Apply a function to every item using a pool of threads.
+
+    Image decoding, hashing and compression release the GIL, so threads scale well for the work
+    done on textures without the overhead of spawning processes.
+
+    Args:
+    ----
+        fn (Callable[[T], R]): function to apply to each item
+        items (Iterable[T]): items to process
+        max_workers (int | None, optional): maximum number of threads, uses the shared pool or
+            Python default if None
+        budget (MemoryBudget | None, optional): memory budget that items are admitted under
+        cost (Callable[[T], int] | None, optional): estimated bytes used to process an item,
+            required for the budget to apply
+
+    Returns:
+    -------
+        list[R]: results in the same order as the items
+
+    """
+    with _executor(max_workers) as executor:
+        return list(executor.map(_budgeted(fn, budget, cost), items))
+
+
+def thread_imap[T, R](  # noqa: PLR0913
+    fn: Callable[[T], R],
+    items: Iterable[T],
+    *,
+    max_workers: int | None = None,
+    max_pending: int | None = None,
+    budget: MemoryBudget | None = None,
+    cost: Callable[[T], int] | None = None,
+) -> Iterator[R]:
+    """Lazily apply a function to every item using a pool of threads.
+
+    Unlike `thread_map`, results are yielded as soon as they are ready in order and at most
+    `max_pending` items are submitted ahead of the consumer, so memory stays bounded no matter how
+    many items there are.
+
+    Args:
+    ----
+        fn (Callable[[T], R]): function to apply to each item
+        items (Iterable[T]): items to process
+        max_workers (int | None, optional): maximum number of threads, uses the shared pool or
+            Python default if None
+        max_pending (int | None, optional): maximum number of results computed ahead of the
+            consumer, twice the number of threads if None
+        budget (MemoryBudget | None, optional): memory budget that items are admitted under
+        cost (Callable[[T], int] | None, optional): estimated bytes used to process an item,
+            required for the budget to apply
+
+    Yields:
+    ------
+        R: results in the same order as the items
+
+    """
+    with _executor(max_workers) as executor:
+        if max_pending is None:
+            max_pending = 2 * executor._max_workers  # noqa: SLF001
+        fn = _budgeted(fn, budget, cost)
+        pending: deque[Future[R]] = deque()
+        try:
+            for item in items:
+                pending.append(executor.submit(fn, item))
+                if len(pending) >= max_pending:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+__all__ = ['MemoryBudget', 'shared_pool', 'thread_imap', 'thread_map']
@@ -0,0 +1,246 @@
+"""Progress of long running tasks, as a progress bar on a terminal or periodic log lines."""
+
+import logging
+import sys
+import threading
+import time
+from collections.abc import Iterable, Iterator
+from types import TracebackType
+from typing import Literal, Self
+
+from textureminer.logger import STATUS_LINE, log_event
+
+PROGRESS_MODES = ('auto', 'bar', 'lines', 'off')
+"""Ways progress can be reported."""
+
+ProgressMode = Literal['auto', 'bar', 'lines', 'off']
+
+BAR_INTERVAL = 0.2
+"""Seconds between redraws of the progress bar."""
+
+LINE_INTERVAL = 5.0
+"""Seconds between progress lines, also written while nothing advances so a hung run shows."""
+
+BAR_WIDTH = 24
+
+_mode: ProgressMode = 'off'
+_bar_lock = threading.Lock()
+
+
+def configure_progress(mode: ProgressMode, *, json_log: bool = False) -> None:
+    """Set how the progress of tasks is reported.
+
+    Progress is not reported until this is called, so using textureminer as a library stays
+    quiet.
+
+    Args:
+    ----
+        mode (ProgressMode): "bar" for a progress bar on stderr, "lines" for "progress" log events,
+            "off" to not report progress, or "auto" for a bar when stderr is a terminal and lines
+            otherwise
+        json_log (bool, optional): whether the log is written as JSON, which a bar would break
+
+    """
+    global _mode  # noqa: PLW0603
+    if mode == 'auto':
+        mode = 'bar' if sys.stderr.isatty() and not json_log else 'lines'
+    _mode = mode
+
+
+def _format_amount(amount: float, unit: str) -> str:
+    if unit == 'B':
+        return f'{amount / 2**20:.1f} MiB'
+    return f'{amount:.0f} {unit}'
+
+
+def _format_rate(rate: float, unit: str) -> str:
+    if unit == 'B':
+        return f'{rate / 2**20:.1f} MiB/s'
+    return f'{rate:.1f} {unit}/s'
+
+
+class Progress:
+    """Thread-safe counter of the progress of a task that reports it in the background.
+
+    Advancing only updates the counter, the report is written by a separate thread at a fixed
+    interval, so progress can be advanced from every worker of a task at no cost.
+
+    Attributes
+    ----------
+        task (str): name of the task, e.g. "download"
+        total (int | None): amount of work in the task, None if unknown
+        unit (str): unit of the work, "B" for bytes
+        done (int): amount of work done so far
+
+    """
+
+    def __init__(self, task: str, total: int | None = None, *, unit: str = 'files') -> None:
+        """Initialize the progress.
+
+        Args:
+        ----
+            task (str): name of the task, e.g. "download"
+            total (int | None, optional): amount of work in the task, None if unknown
+            unit (str, optional): unit of the work, "B" for bytes
+
+        """
+        self.task = task
+        self.total = total
+        self.unit = unit
+        self.done = 0
+        self._lock = threading.Lock()
+        self._start = time.monotonic()
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._mode: ProgressMode = _mode
+
+    def advance(self, amount: int = 1) -> None:
+        """Mark an amount of work as done.
+
+        Args:
+        ----
+            amount (int, optional): amount of work done
+
+        """
+        with self._lock:
+            self.done += amount
+
+    def set_total(self, total: int | None) -> None:
+        """Set the amount of work in the task once it is known, e.g. from a response header.
+
+        Args:
+        ----
+            total (int | None): amount of work in the task, None if unknown
+
+        """
+        self.total = total
+
+    def rate(self) -> float:
+        """Get the average amount of work done per second so far.
+
+        Returns
+        -------
+            float: work per second
+
+        """
+        elapsed = time.monotonic() - self._start
+        return self.done / elapsed if elapsed > 0 else 0.0
+
+    def eta(self) -> float | None:
+        """Get the estimated seconds until the task is done.
+
+        Returns
+        -------
+            float | None: seconds left, None if the total is unknown or nothing is done yet
+
+        """
+        rate = self.rate()
+        if self.total is None or rate == 0:
+            return None
+        return max(self.total - self.done, 0) / rate
+
+    def __enter__(self) -> Self:
+        """Start reporting the progress."""
+        if self._mode == 'bar' and not _bar_lock.acquire(blocking=False):
+            # a bar is already drawn by a task running at the same time
+            self._mode = 'lines'
+        if self._mode != 'off':
+            self._thread = threading.Thread(
+                target=self._report_periodically,
+                name=f'textureminer-progress-{self.task}',
+                daemon=True,
+            )
+            self._thread.start()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Stop reporting the progress and report it a last time."""
+        if self._thread is None:
+            return
+        self._stopped.set()
+        self._thread.join()
+        self._report(final=True)
+        if self._mode == 'bar':
+            _bar_lock.release()
+
+    def _report_periodically(self) -> None:
+        interval = BAR_INTERVAL if self._mode == 'bar' else LINE_INTERVAL
+        while not self._stopped.wait(interval):
+            self._report()
+
+    def _report(self, *, final: bool = False) -> None:
+        if self._mode == 'bar':
+            self._draw_bar(final=final)
+        elif self._mode == 'lines':
+            eta = self.eta()
+            log_event(
+                'progress',
+                level=logging.INFO,
+                task=self.task,
+                done=self.done,
+                total=self.total,
+                unit=self.unit,
+                rate=round(self.rate(), 1),
+                eta=None if eta is None else round(eta, 1),
+                finished=final,
+            )
+
+    def _draw_bar(self, *, final: bool) -> None:
+        parts = [f'{" " * 4}* {self.task}']
+        if self.total:
+            filled = min(BAR_WIDTH * self.done // self.total, BAR_WIDTH)
+            parts.append(f'[{"#" * filled}{"-" * (BAR_WIDTH - filled)}]')
+            parts.append(f'{min(100 * self.done // self.total, 100):3d}%')
+            parts.append(
+                f'{_format_amount(self.done, self.unit)}/{_format_amount(self.total, self.unit)}'
+            )
+        else:
+            parts.append(_format_amount(self.done, self.unit))
+        parts.append(_format_rate(self.rate(), self.unit))
+        eta = self.eta()
+        if eta is not None and not final:
+            parts.append(f'ETA {eta:.0f}s')
+        STATUS_LINE.draw(' '.join(parts), final=final)
+
+
+def track[T](
+    items: Iterable[T],
+    task: str,
+    total: int | None = None,
+    *,
+    unit: str = 'files',
+) -> Iterator[T]:
+    """Report the progress of iterating over items, one unit of work per item.
+
+    Args:
+    ----
+        items (Iterable[T]): items to iterate over
+        task (str): name of the task, e.g. "textures"
+        total (int | None, optional): number of items, taken from the items if they have a length
+        unit (str, optional): unit of the items
+
+    Yields:
+    ------
+        T: the items
+
+    """
+    if total is None and hasattr(items, '__len__'):
+        total = len(items)  # type: ignore[arg-type]
+    with Progress(task, total, unit=unit) as progress:
+        for item in items:
+            yield item
+            progress.advance()
+
+
+__all__ = [
+    'PROGRESS_MODES',
+    'Progress',
+    'ProgressMode',
+    'configure_progress',
+    'track',
+]
@@ -0,0 +1,154 @@
+"""Resource packs as input, read member by member from a zip file or a directory."""
+
+import re
+from pathlib import Path
+from types import TracebackType
+from typing import IO, Self
+from zipfile import ZipFile
+
+from textureminer import texts
+from textureminer.options import EditionType
+
+PATTERN_JAVA_PACK_TEXTURE = re.compile(
+    r'^(?:.*/)?assets/(?P<namespace>[^/]+)/textures/(?P<dir>block|item)/(?P<path>.+\.png)$'
+)
+"""Block and item textures of a Java Edition resource pack, in any namespace."""
+
+PATTERN_BEDROCK_PACK_TEXTURE = re.compile(
+    r'^(?:.*/)?textures/(?P<dir>blocks|items)/(?P<path>.+\.png)$'
+)
+"""Block and item textures of a Bedrock Edition resource pack."""
+
+
+class ResourcePack:
+    """A Java or Bedrock Edition resource pack.
+
+    Only the names of the members are read up front, the textures are read one at a time, so even
+    large high resolution packs are never unpacked or held in memory as a whole.
+
+    Attributes
+    ----------
+        path (Path | IO[bytes]): path of the zip file or directory, or contents of the zip file
+        name (str): name of the pack, from the file or directory name
+        edition (EditionType): edition the pack is for
+        textures (dict[str, str]): texture paths in the output directory, e.g.
+            "blocks/stone.png", mapped to their member names in the pack
+
+    """
+
+    def __init__(self, path: Path | IO[bytes], name: str = '') -> None:
+        """Open a resource pack and index its textures.
+
+        Args:
+        ----
+            path (Path | IO[bytes]): path of the zip file or directory, or contents of a zip file
+                like a client .jar file
+            name (str, optional): name of the pack, from the path if empty
+
+        Raises:
+        ------
+            ValueError: if the pack has no block or item textures
+
+        """
+        self.path = path
+        if isinstance(path, Path):
+            self.name = name or (path.stem if path.is_file() else path.name)
+            self._zip = ZipFile(path) if path.is_file() else None
+        else:
+            self.name = name
+            self._zip = ZipFile(path)
+
+        if self._zip is not None:
+            members = self._zip.namelist()
+        else:
+            members = [file.relative_to(self._dir).as_posix() for file in self._dir.rglob('*.png')]
+        members.sort()
+
+        is_java = any(
+            member.rsplit('/', 1)[-1] == 'pack.mcmeta' or PATTERN_JAVA_PACK_TEXTURE.match(member)
+            for member in members
+        )
+        self.edition = EditionType.JAVA if is_java else EditionType.BEDROCK
+
+        self.textures: dict[str, str] = {}
+        for member in members:
+            if is_java:
+                match = PATTERN_JAVA_PACK_TEXTURE.match(member)
+                if match is None:
+                    continue
+                namespace = match['namespace']
+                subdir = '' if namespace == 'minecraft' else f'{namespace}/'
+                name = f'{match["dir"]}s/{subdir}{match["path"]}'
+            else:
+                match = PATTERN_BEDROCK_PACK_TEXTURE.match(member)
+                if match is None:
+                    continue
+                name = f'{match["dir"]}/{match["path"]}'
+            self.textures.setdefault(name, member)
+
+        if not self.textures:
+            self.close()
+            raise ValueError(texts.ERROR_PACK_NO_TEXTURES.format(path=self.name))
+
+    def __enter__(self) -> Self:
+        """Enter the context manager."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Exit the context manager."""
+        self.close()
+
+    def close(self) -> None:
+        """Close the zip file of the pack."""
+        if self._zip is not None:
+            self._zip.close()
+
+    def read(self, member: str, size: int = -1) -> bytes:
+        """Read a member of the pack. Safe to call from multiple threads.
+
+        Args:
+        ----
+            member (str): name of the member, a value of `textures`
+            size (int, optional): number of bytes to read from the start, all if negative
+
+        Returns:
+        -------
+            bytes: contents of the member
+
+        """
+        if self._zip is not None:
+            with self._zip.open(member) as f:
+                return f.read(size)
+        with (self._dir / member).open('rb') as f:
+            return f.read(size)
+
+    def size(self, member: str) -> int:
+        """Get the size of a member of the pack without reading it.
+
+        Args:
+        ----
+            member (str): name of the member, a value of `textures`
+
+        Returns:
+        -------
+            int: size of the member in bytes
+
+        """
+        if self._zip is not None:
+            return self._zip.getinfo(member).file_size
+        return (self._dir / member).stat().st_size
+
+    @property
+    def _dir(self) -> Path:
+        """Directory of a pack that is not a zip file."""
+        if not isinstance(self.path, Path):
+            raise TypeError
+        return self.path
+
+
+__all__ = ['ResourcePack']
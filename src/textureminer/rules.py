@@ -0,0 +1,155 @@
+"""Declarative texture rules shared by the editions."""
+
+import hashlib
+import json
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from functools import cache
+from importlib import resources
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any
+
+from textureminer.exceptions import FileFormatError
+from textureminer.options import EditionType
+
+RULE_TABLES = ('replicate', 'overwrite', 'texture_exceptions')
+"""Names of the rule tables that can be defined in a rules file."""
+
+COMMON_SECTION = 'common'
+"""Section of a rules file that applies to every edition."""
+
+RULE_SECTIONS = (COMMON_SECTION, *(edition.value for edition in EditionType))
+"""Names of the sections that can be defined in a rules file."""
+
+
+@dataclass(frozen=True, slots=True)
+class RuleSet:
+    """Compiled texture rules of an edition.
+
+    Every table is a read-only hash map, so looking up the rule of a texture is constant-time.
+
+    Attributes
+    ----------
+        replicate (Mapping[str, str]): texture names that are copied to another name,
+            e.g. "glass_pane_top" to "glass_pane"
+        overwrite (Mapping[str, str]): textures that are copied to another name before a partial
+            texture overwrites them, e.g. "snow" to "snow_block"
+        texture_exceptions (Mapping[str, str]): base materials whose texture has a different
+            name, e.g. "smooth_quartz" to "quartz_block_bottom"
+        fingerprint (str): digest of the rules, changes whenever any rule changes
+
+    """
+
+    replicate: Mapping[str, str] = field(default_factory=dict)
+    overwrite: Mapping[str, str] = field(default_factory=dict)
+    texture_exceptions: Mapping[str, str] = field(default_factory=dict)
+    fingerprint: str = ''
+
+
+def _read_rules_file(path: Path) -> dict[str, Any]:
+    """Read and validate a rules file.
+
+    Args:
+    ----
+        path (Path): path of the rules file
+
+    Raises:
+    ------
+        FileFormatError: if the file cannot be read or is not a valid rules file
+
+    Returns:
+    -------
+        dict[str, Any]: parsed rules file
+
+    """
+    try:
+        with path.open(encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError) as err:
+        invalid_rules_msg = f'Invalid rules file {path}: {err}'
+        raise FileFormatError(invalid_rules_msg) from None
+
+    if not isinstance(data, dict):
+        invalid_rules_msg = f'Invalid rules file {path}: expected an object'
+        raise FileFormatError(invalid_rules_msg)
+
+    for section_name, section in data.items():
+        if (
+            section_name not in RULE_SECTIONS
+            or not isinstance(section, dict)
+            or any(table not in RULE_TABLES for table in section)
+        ):
+            invalid_section_msg = f'Invalid section "{section_name}" in rules file {path}'
+            raise FileFormatError(invalid_section_msg)
+
+        for table_name, table in section.items():
+            if not isinstance(table, dict) or any(
+                not isinstance(target, str | None) for target in table.values()
+            ):
+                invalid_table_msg = (
+                    f'Invalid table "{table_name}" in section "{section_name}" of rules file '
+                    f'{path}: expected an object of texture names'
+                )
+                raise FileFormatError(invalid_table_msg)
+
+    return data
+
+
+def _merge_layer(tables: dict[str, dict[str, str]], layer: Mapping[str, Any]) -> None:
+    """Merge a section of a rules file into the tables. A null value removes a rule.
+
+    Args:
+    ----
+        tables (dict[str, dict[str, str]]): tables to merge into
+        layer (Mapping[str, Any]): section of a rules file
+
+    """
+    for table_name, rules in layer.items():
+        table = tables[table_name]
+        for source, target in rules.items():
+            if target is None:
+                table.pop(source, None)
+            else:
+                table[source] = target
+
+
+@cache
+def load_rules(edition: EditionType, rules_path: Path | None = None) -> RuleSet:
+    """Load and compile the texture rules of an edition.
+
+    The bundled rules are applied first, then the rules from `rules_path`. In both files the
+    `common` section applies to every edition and is followed by the section of the edition.
+
+    Args:
+    ----
+        edition (EditionType): edition to load the rules for
+        rules_path (Path | None, optional): path of a rules file overriding the bundled rules
+
+    Returns:
+    -------
+        RuleSet: compiled rules
+
+    """
+    bundled = resources.files('textureminer') / 'data' / 'rules.json'
+    with resources.as_file(bundled) as bundled_path:
+        layers = [_read_rules_file(bundled_path)]
+    if rules_path is not None:
+        layers.append(_read_rules_file(rules_path))
+
+    tables: dict[str, dict[str, str]] = {table: {} for table in RULE_TABLES}
+    for layer in layers:
+        _merge_layer(tables, layer.get(COMMON_SECTION, {}))
+        _merge_layer(tables, layer.get(edition.value, {}))
+
+    fingerprint = hashlib.sha256(json.dumps(tables, sort_keys=True).encode()).hexdigest()
+
+    return RuleSet(
+        replicate=MappingProxyType(tables['replicate']),
+        overwrite=MappingProxyType(tables['overwrite']),
+        texture_exceptions=MappingProxyType(tables['texture_exceptions']),
+        fingerprint=fingerprint,
+    )
+
+
+__all__ = ['RuleSet', 'load_rules']
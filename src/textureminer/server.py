@@ -0,0 +1,484 @@
+"""HTTP server that extracts versions on demand and serves their textures from warm caches."""
+
+import hashlib
+import logging
+import shutil
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path, PurePosixPath
+from typing import ClassVar
+from urllib.parse import parse_qs, unquote, urlsplit
+from zipfile import ZIP_DEFLATED, ZipFile, ZipInfo
+
+from PIL import Image as Pil_Image
+
+from textureminer import texts
+from textureminer.cache import cached_file
+from textureminer.edition.Bedrock import Bedrock
+from textureminer.edition.Edition import BlockShape, Edition
+from textureminer.edition.Java import Java
+from textureminer.imaging import save_png
+from textureminer.options import DEFAULTS, EditionType, TextureOptions, VersionType
+from textureminer.rules import load_rules
+from textureminer.version_index import KIND_ALIASES
+
+VERSION_ALIASES: Mapping[str, VersionType] = {
+    'latest': VersionType.ALL,
+    VersionType.STABLE.value: VersionType.STABLE,
+    VersionType.EXPERIMENTAL.value: VersionType.EXPERIMENTAL,
+}
+"""Moving version names accepted in URLs, mapped to the type of version they resolve to."""
+
+ARCHIVES: Mapping[str, str] = {
+    'blocks.zip': 'blocks',
+    'items.zip': 'items',
+    'textures.zip': '',
+}
+"""Archive names accepted in URLs, mapped to the directory of the textures they contain."""
+
+SERVE_OPTIONS: TextureOptions = {
+    **DEFAULTS['TEXTURE_OPTIONS'],
+    'DO_DEDUPLICATE': False,
+    'DO_MERGE': False,
+    'SCALE_FACTOR': 1,
+}
+"""Options the served versions are extracted with, scaling and shapes are applied per request."""
+
+
+@dataclass(frozen=True, slots=True)
+class Resource:
+    """A file that can be served.
+
+    Attributes
+    ----------
+        path (Path): path of the file
+        etag (str): strong entity tag of the contents, including the quotes
+        content_type (str): media type of the file
+        immutable (bool): whether the URL always resolves to the same contents
+
+    """
+
+    path: Path
+    etag: str
+    content_type: str
+    immutable: bool = True
+
+
+class ImageCache:
+    """Decoded images kept in least recently used order, bounded by their size in memory."""
+
+    def __init__(self, max_bytes: int) -> None:
+        """Initialize the cache.
+
+        Args:
+        ----
+            max_bytes (int): maximum total size of the decoded images in bytes
+
+        """
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._images: OrderedDict[Path, Pil_Image.Image] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Get the number of images in the cache."""
+        return len(self._images)
+
+    def get(self, path: Path, load: Callable[[Path], Pil_Image.Image]) -> Pil_Image.Image:
+        """Get a decoded image, loading it if it is not cached.
+
+        Args:
+        ----
+            path (Path): path of the image
+            load (Callable[[Path], Pil_Image.Image]): function decoding the image
+
+        Returns:
+        -------
+            Pil_Image.Image: the image, which must not be modified
+
+        """
+        with self._lock:
+            img = self._images.get(path)
+            if img is not None:
+                self._images.move_to_end(path)
+                return img
+
+        img = load(path)
+        img_size = len(img.getbands()) * img.width * img.height
+
+        with self._lock:
+            if path not in self._images and img_size <= self.max_bytes:
+                self._images[path] = img
+                self.size += img_size
+                while self.size > self.max_bytes:
+                    _, evicted = self._images.popitem(last=False)
+                    self.size -= len(evicted.getbands()) * evicted.width * evicted.height
+
+        return img
+
+
+def _load_image(path: Path) -> Pil_Image.Image:
+    """Decode an image fully, so the file can be closed."""
+    with Pil_Image.open(path) as img:
+        img.load()
+        return img.copy()
+
+
+def _file_digest(path: Path) -> str:
+    """Get the SHA-256 hex digest of a file."""
+    with path.open('rb') as f:
+        return hashlib.file_digest(f, 'sha256').hexdigest()
+
+
+class TextureServer:
+    """Extracts versions on demand and renders their textures, caching every step.
+
+    Extracted versions, rendered textures and archives are cached on disk, so they are shared
+    between restarts and with other processes. Decoded source images are kept in memory.
+
+    Attributes
+    ----------
+        ALIAS_MAX_AGE (int): seconds a moving version name like "latest" resolves to a version for
+        MAX_SCALE (int): largest accepted scale factor
+
+    """
+
+    ALIAS_MAX_AGE: ClassVar[int] = 300
+    MAX_SCALE: ClassVar[int] = 32
+
+    def __init__(
+        self,
+        *,
+        rules_path: Path | None = None,
+        cache_size: int = 256 * 1024 * 1024,
+    ) -> None:
+        """Initialize the server.
+
+        Args:
+        ----
+            rules_path (Path | None, optional): rules file overriding the bundled texture rules
+            cache_size (int, optional): maximum size of the decoded images in memory in bytes
+
+        """
+        self.rules_path = rules_path
+        self.images = ImageCache(cache_size)
+        self._aliases: dict[tuple[EditionType, str], tuple[float, str]] = {}
+        self._digests: dict[Path, str] = {}
+
+    def resolve_version(self, edition: EditionType, version: str) -> tuple[str, bool]:
+        """Resolve a version from a URL.
+
+        Args:
+        ----
+            edition (EditionType): edition of the version
+            version (str): a version, or a moving name like "latest", "stable" or "experimental"
+
+        Raises:
+        ------
+            ValueError: if the version is invalid
+            FileNotFoundError: if a moving name does not resolve to any version
+
+        Returns:
+        -------
+            tuple[str, bool]: the version and whether it was given explicitly
+
+        """
+        if version not in VERSION_ALIASES:
+            if not Edition.validate_version(version, edition=edition):
+                raise ValueError(texts.ERROR_VERSION_INVALID.format(version=version))
+            if edition == EditionType.BEDROCK and not version.startswith('v'):
+                version = f'v{version}'
+            return version, True
+
+        resolved = self._aliases.get((edition, version))
+        if resolved is not None and time.monotonic() - resolved[0] < self.ALIAS_MAX_AGE:
+            return resolved[1], False
+
+        version_type = VERSION_ALIASES[version]
+        kinds = KIND_ALIASES[version_type.value] if version_type != VersionType.ALL else None
+        edition_class = Bedrock if edition == EditionType.BEDROCK else Java
+        with edition_class() as instance:
+            entries = instance.get_version_index().query(kinds=kinds, last=1)
+        if not entries:
+            raise FileNotFoundError(texts.ERROR_NO_LATEST_VERSION.format(version_type=version))
+
+        self._aliases[(edition, version)] = (time.monotonic(), entries[0].version.name)
+        return entries[0].version.name, False
+
+    def materialize(self, edition: EditionType, version: str) -> Path:
+        """Get the directory of the extracted textures of a version, extracting them if needed.
+
+        Args:
+        ----
+            edition (EditionType): edition of the version
+            version (str): exact version
+
+        Returns:
+        -------
+            Path: directory with "blocks" and "items" subdirectories
+
+        """
+        fingerprint = load_rules(edition, self.rules_path).fingerprint[:16]
+        return cached_file(
+            f'textures/{edition.value}/{version}-{fingerprint}',
+            lambda path: self._build_version(edition, version, path),
+        )
+
+    def _build_version(self, edition: EditionType, version: str, path: Path) -> None:
+        """Extract the textures of a version with the pipeline of its edition.
+
+        Args:
+        ----
+            edition (EditionType): edition of the version
+            version (str): exact version
+            path (Path): directory that the textures are moved to
+
+        """
+        logging.getLogger('textureminer').info(
+            texts.SERVER_EXTRACTING.format(edition=edition.value, version=version)
+        )
+        edition_class = Bedrock if edition == EditionType.BEDROCK else Java
+        with edition_class(
+            rules_path=self.rules_path,
+            in_memory=edition == EditionType.JAVA,
+        ) as instance:
+            output = instance.get_textures(version, instance.temp_dir, SERVE_OPTIONS)
+            if output is None:
+                raise FileNotFoundError(texts.ERROR_VERSION_NOT_FOUND.format(version=version))
+            shutil.move(output, path)  # type: ignore[arg-type]
+
+    def _digest(self, path: Path) -> str:
+        """Get the digest of a file in the cache, which never changes once published."""
+        digest = self._digests.get(path)
+        if digest is None:
+            digest = _file_digest(path)
+            self._digests[path] = digest
+        return digest
+
+    def texture(
+        self,
+        edition: EditionType,
+        version: str,
+        texture: str,
+        *,
+        scale: int = 1,
+        shape: BlockShape | None = None,
+    ) -> Resource:
+        """Get a texture, rendered at a scale and shape.
+
+        Args:
+        ----
+            edition (EditionType): edition of the version
+            version (str): version or moving version name
+            texture (str): path of the texture, e.g. "blocks/stone.png"
+            scale (int, optional): factor the texture is scaled by
+            shape (BlockShape | None, optional): shape the texture is cropped to before scaling
+
+        Raises:
+        ------
+            ValueError: if the version or scale is invalid
+            FileNotFoundError: if the texture does not exist
+
+        Returns:
+        -------
+            Resource: the rendered texture
+
+        """
+        if not 1 <= scale <= self.MAX_SCALE:
+            raise ValueError(texts.ERROR_SERVER_SCALE.format(max_scale=self.MAX_SCALE))
+
+        version, immutable = self.resolve_version(edition, version)
+        root = self.materialize(edition, version)
+
+        relative = PurePosixPath(texture)
+        if relative.is_absolute() or '..' in relative.parts or relative.suffix != '.png':
+            raise FileNotFoundError(texts.ERROR_SERVER_NOT_FOUND.format(path=texture))
+        source = root.joinpath(*relative.parts)
+        # also catches symlinks and drive or backslash paths pointing out of the textures
+        if not source.resolve().is_relative_to(root.resolve()) or not source.is_file():
+            raise FileNotFoundError(texts.ERROR_SERVER_NOT_FOUND.format(path=texture))
+
+        source_digest = self._digest(source)
+        if scale == 1 and shape is None:
+            return Resource(source, f'"{source_digest}"', 'image/png', immutable)
+
+        key = hashlib.sha256(
+            f'{source_digest}:{scale}:{shape.value if shape else ""}'.encode()
+        ).hexdigest()
+
+        def render(path: Path) -> None:
+            img = self.images.get(source, _load_image)
+            if shape is not None:
+                img = Edition.crop_image(img, shape)
+            if scale != 1:
+                img = img.resize(
+                    (img.width * scale, img.height * scale),
+                    resample=Pil_Image.Resampling.NEAREST,
+                )
+            save_png(img, path)
+
+        return Resource(
+            cached_file(f'rendered/{key}.png', render), f'"{key}"', 'image/png', immutable
+        )
+
+    def archive(self, edition: EditionType, version: str, name: str) -> Resource:
+        """Get a zip archive of the textures of a version.
+
+        Args:
+        ----
+            edition (EditionType): edition of the version
+            version (str): version or moving version name
+            name (str): name of the archive, one of `ARCHIVES`
+
+        Raises:
+        ------
+            ValueError: if the version is invalid
+            FileNotFoundError: if the archive name is unknown
+
+        Returns:
+        -------
+            Resource: the archive
+
+        """
+        if name not in ARCHIVES:
+            raise FileNotFoundError(texts.ERROR_SERVER_NOT_FOUND.format(path=name))
+
+        version, immutable = self.resolve_version(edition, version)
+        root = self.materialize(edition, version)
+        texture_dir = root / ARCHIVES[name] if ARCHIVES[name] else root
+
+        def create(path: Path) -> None:
+            with ZipFile(path, 'w', compression=ZIP_DEFLATED) as archive:
+                for file in sorted(texture_dir.rglob('*')):
+                    if file.is_file():
+                        # fixed timestamps keep the archive and its tag the same between builds
+                        info = ZipInfo(file.relative_to(texture_dir).as_posix())
+                        info.compress_type = ZIP_DEFLATED
+                        archive.writestr(info, file.read_bytes())
+
+        path = cached_file(f'archives/{root.parent.name}/{root.name}/{name}', create)
+        return Resource(path, f'"{self._digest(path)}"', 'application/zip', immutable)
+
+    def handle(self, url: str) -> Resource:
+        """Get the resource of a URL path like "/java/1.21/blocks/stone.png?scale=4&shape=slab".
+
+        Args:
+        ----
+            url (str): path and query of the request
+
+        Raises:
+        ------
+            ValueError: if the URL is invalid
+            FileNotFoundError: if the resource does not exist
+
+        Returns:
+        -------
+            Resource: the resource
+
+        """
+        parts = urlsplit(url)
+        path = [unquote(segment) for segment in parts.path.split('/') if segment]
+        query = parse_qs(parts.query)
+
+        # an escaped slash must not turn into a path separator
+        escaped = any('/' in segment or '\\' in segment for segment in path)
+        if escaped or len(path) < 3:  # noqa: PLR2004
+            raise FileNotFoundError(texts.ERROR_SERVER_NOT_FOUND.format(path=parts.path))
+        try:
+            edition = EditionType(path[0])
+        except ValueError:
+            raise FileNotFoundError(texts.ERROR_SERVER_NOT_FOUND.format(path=parts.path)) from None
+
+        if len(path) == 3 and path[2] in ARCHIVES:  # noqa: PLR2004
+            return self.archive(edition, path[1], path[2])
+
+        try:
+            scale = int(query.get('scale', ['1'])[0])
+        except ValueError:
+            raise ValueError(texts.ERROR_SERVER_SCALE.format(max_scale=self.MAX_SCALE)) from None
+        try:
+            shape = BlockShape(query['shape'][0]) if 'shape' in query else None
+        except ValueError:
+            raise ValueError(
+                texts.ERROR_SERVER_SHAPE.format(
+                    shapes=', '.join(shape.value for shape in BlockShape)
+                )
+            ) from None
+
+        return self.texture(edition, path[1], '/'.join(path[2:]), scale=scale, shape=shape)
+
+
+class TextureRequestHandler(BaseHTTPRequestHandler):
+    """Handles GET and HEAD requests for textures and archives."""
+
+    server: 'TextureHTTPServer'
+    server_version = 'textureminer'
+
+    def do_GET(self) -> None:
+        """Serve a resource."""
+        self._respond(send_body=True)
+
+    def do_HEAD(self) -> None:
+        """Serve the headers of a resource."""
+        self._respond(send_body=False)
+
+    def _respond(self, *, send_body: bool) -> None:
+        """Serve a resource, or only its headers."""
+        try:
+            resource = self.server.textures.handle(self.path)
+        except FileNotFoundError as err:
+            self.send_error(HTTPStatus.NOT_FOUND, str(err))
+            return
+        except ValueError as err:
+            self.send_error(HTTPStatus.BAD_REQUEST, str(err))
+            return
+
+        cache_control = 'public, max-age=31536000, immutable' if resource.immutable else 'no-cache'
+        if_none_match = {tag.strip() for tag in self.headers.get('If-None-Match', '').split(',')}
+        if resource.etag in if_none_match or '*' in if_none_match:
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self.send_header('ETag', resource.etag)
+            self.send_header('Cache-Control', cache_control)
+            self.end_headers()
+            return
+
+        self.send_response(HTTPStatus.OK)
+        self.send_header('Content-Type', resource.content_type)
+        self.send_header('Content-Length', str(resource.path.stat().st_size))
+        self.send_header('ETag', resource.etag)
+        self.send_header('Cache-Control', cache_control)
+        self.end_headers()
+
+        if send_body:
+            with resource.path.open('rb') as f:
+                shutil.copyfileobj(f, self.wfile)
+
+    def log_message(self, format: str, *args: object) -> None:  # noqa: A002
+        """Log requests to the textureminer logger instead of stderr."""
+        logging.getLogger('textureminer').debug(format, *args)
+
+
+class TextureHTTPServer(ThreadingHTTPServer):
+    """HTTP server serving the resources of a `TextureServer`."""
+
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], textures: TextureServer) -> None:
+        """Initialize the server and bind it to an address.
+
+        Args:
+        ----
+            address (tuple[str, int]): host and port to listen on, port 0 picks a free port
+            textures (TextureServer): server providing the resources
+
+        """
+        super().__init__(address, TextureRequestHandler)
+        self.textures = textures
+
+
+__all__ = ['ImageCache', 'Resource', 'TextureHTTPServer', 'TextureServer']
@@ -0,0 +1,436 @@
+"""Storage backends that the final textures are published to, selected by URL."""
+
+import copy
+import logging
+import threading
+from abc import ABC, abstractmethod
+from collections.abc import Iterator, Mapping
+from pathlib import Path, PurePosixPath
+from types import TracebackType
+from typing import Any, ClassVar, Self
+from urllib.parse import urlsplit
+from zipfile import ZIP_DEFLATED, ZipFile, ZipInfo
+
+from textureminer import texts
+from textureminer.file import rm_if_exists
+from textureminer.parallel import thread_map
+
+CONTENT_TYPES: Mapping[str, str] = {
+    '.json': 'application/json',
+    '.mcmeta': 'application/json',
+    '.png': 'image/png',
+}
+"""Content types of the files written by textureminer, by suffix."""
+
+
+class Storage(ABC):
+    """A flat namespace of files addressed by POSIX paths relative to a prefix.
+
+    Dividing a storage by a name, like a `Path`, gives a view of the same storage under a longer
+    prefix, so `storage / 'java' / '1.21'` works the same for every backend.
+
+    Attributes
+    ----------
+        BATCH_SIZE (int): number of files read into memory at once when uploading a directory
+        MAX_WORKERS (int | None): number of concurrent writes, uses Python default if None
+        prefix (str): prefix of the files of this view, without leading or trailing slashes
+
+    """
+
+    BATCH_SIZE: ClassVar[int] = 256
+    MAX_WORKERS: ClassVar[int | None] = None
+
+    def __init__(self, prefix: str = '') -> None:
+        """Initialize the storage.
+
+        Args:
+        ----
+            prefix (str, optional): prefix of the files, e.g. "textures/java"
+
+        """
+        self.prefix = prefix.strip('/')
+
+    def __truediv__(self, name: str) -> Self:
+        """Get a view of the storage under a longer prefix."""
+        view = copy.copy(self)
+        view.prefix = self._key(str(name).strip('/'))
+        return view
+
+    def __enter__(self) -> Self:
+        """Enter the context manager."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Exit the context manager."""
+        self.close()
+
+    def __str__(self) -> str:
+        """Get the URL of the storage."""
+        return self.url
+
+    @property
+    @abstractmethod
+    def url(self) -> str:
+        """URL of the storage, which can be passed to `open_storage`."""
+
+    def _key(self, name: str) -> str:
+        """Get the full key of a file from its name relative to the prefix."""
+        return f'{self.prefix}/{name}' if self.prefix else name
+
+    @abstractmethod
+    def _write(self, key: str, data: bytes) -> None:
+        """Write a file by its full key."""
+
+    @abstractmethod
+    def _read(self, key: str) -> bytes:
+        """Read a file by its full key."""
+
+    @abstractmethod
+    def _list(self, prefix: str) -> Iterator[str]:
+        """List the full keys of the files starting with a prefix."""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Remove every file under the prefix."""
+
+    def close(self) -> None:  # noqa: B027
+        """Release the resources of the storage."""
+
+    def write(self, name: str, data: bytes) -> None:
+        """Write a file.
+
+        Args:
+        ----
+            name (str): path of the file relative to the prefix
+            data (bytes): contents of the file
+
+        """
+        self._write(self._key(name), data)
+
+    def write_many(self, files: Mapping[str, bytes]) -> int:
+        """Write files concurrently.
+
+        Args:
+        ----
+            files (Mapping[str, bytes]): paths relative to the prefix mapped to file contents
+
+        Returns:
+        -------
+            int: number of files written
+
+        """
+        thread_map(
+            lambda item: self._write(self._key(item[0]), item[1]),
+            files.items(),
+            max_workers=self.MAX_WORKERS,
+        )
+        return len(files)
+
+    def read(self, name: str) -> bytes:
+        """Read a file.
+
+        Args:
+        ----
+            name (str): path of the file relative to the prefix
+
+        Returns:
+        -------
+            bytes: contents of the file
+
+        """
+        return self._read(self._key(name))
+
+    def list(self) -> list[str]:
+        """List the files under the prefix.
+
+        Returns
+        -------
+            list[str]: sorted paths of the files relative to the prefix
+
+        """
+        prefix = f'{self.prefix}/' if self.prefix else ''
+        return sorted(key.removeprefix(prefix) for key in self._list(prefix))
+
+    def put_tree(self, directory: Path) -> int:
+        """Upload the files of a local directory tree in concurrent batches.
+
+        Args:
+        ----
+            directory (Path): directory to upload
+
+        Returns:
+        -------
+            int: number of files uploaded
+
+        """
+        files = sorted(path for path in directory.rglob('*') if path.is_file())
+        logging.getLogger('textureminer').info(
+            texts.STORAGE_UPLOADING_N.format(file_amount=len(files), url=self.url)
+        )
+
+        for start in range(0, len(files), self.BATCH_SIZE):
+            batch = files[start : start + self.BATCH_SIZE]
+            self.write_many(
+                {path.relative_to(directory).as_posix(): path.read_bytes() for path in batch}
+            )
+
+        return len(files)
+
+
+class LocalStorage(Storage):
+    """Files in a directory on the local disk."""
+
+    def __init__(self, root: Path, prefix: str = '') -> None:
+        """Initialize the storage.
+
+        Args:
+        ----
+            root (Path): root directory
+            prefix (str, optional): prefix of the files
+
+        """
+        super().__init__(prefix)
+        self.root = root
+
+    @property
+    def path(self) -> Path:
+        """Directory of the files under the prefix."""
+        return self.root / self.prefix if self.prefix else self.root
+
+    @property
+    def url(self) -> str:  # noqa: D102
+        return self.path.as_posix()
+
+    def _write(self, key: str, data: bytes) -> None:
+        path = self.root / key
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+
+    def _read(self, key: str) -> bytes:
+        return (self.root / key).read_bytes()
+
+    def _list(self, prefix: str) -> Iterator[str]:
+        directory = self.root / prefix
+        if not directory.is_dir():
+            return
+        for path in directory.rglob('*'):
+            if path.is_file():
+                yield path.relative_to(self.root).as_posix()
+
+    def clear(self) -> None:  # noqa: D102
+        rm_if_exists(self.path)
+
+
+class MemoryStorage(Storage):
+    """Files kept in a dictionary, mostly useful for tests and library use."""
+
+    def __init__(self, files: dict[str, bytes] | None = None, prefix: str = '') -> None:
+        """Initialize the storage.
+
+        Args:
+        ----
+            files (dict[str, bytes] | None, optional): dictionary that the files are kept in
+            prefix (str, optional): prefix of the files
+
+        """
+        super().__init__(prefix)
+        self.files: dict[str, bytes] = files if files is not None else {}
+
+    @property
+    def url(self) -> str:  # noqa: D102
+        return f'memory:///{self.prefix}'
+
+    def _write(self, key: str, data: bytes) -> None:
+        self.files[key] = data
+
+    def _read(self, key: str) -> bytes:
+        return self.files[key]
+
+    def _list(self, prefix: str) -> Iterator[str]:
+        return (key for key in list(self.files) if key.startswith(prefix))
+
+    def clear(self) -> None:  # noqa: D102
+        prefix = f'{self.prefix}/' if self.prefix else ''
+        for key in list(self._list(prefix)):
+            del self.files[key]
+
+
+class ZipStorage(Storage):
+    """Files in a new zip archive. The archive is complete once the storage is closed."""
+
+    def __init__(self, path: Path, prefix: str = '') -> None:
+        """Initialize the storage. An existing archive at the path is replaced.
+
+        Args:
+        ----
+            path (Path): path of the archive
+            prefix (str, optional): prefix of the files in the archive
+
+        """
+        super().__init__(prefix)
+        self.path = path
+        self._lock = threading.Lock()
+        self._names: set[str] = set()
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._archive = ZipFile(path, 'w', compression=ZIP_DEFLATED)
+
+    @property
+    def url(self) -> str:  # noqa: D102
+        return f'zip://{self.path.as_posix()}' + (f'#{self.prefix}' if self.prefix else '')
+
+    def _write(self, key: str, data: bytes) -> None:
+        # a fixed timestamp keeps the archive the same between runs, like the served archives
+        info = ZipInfo(key)
+        info.compress_type = ZIP_DEFLATED
+        with self._lock:
+            self._archive.writestr(info, data)
+            self._names.add(key)
+
+    def _read(self, key: str) -> bytes:
+        with self._lock:
+            return self._archive.read(key)
+
+    def _list(self, prefix: str) -> Iterator[str]:
+        return (key for key in sorted(self._names) if key.startswith(prefix))
+
+    def write_many(self, files: Mapping[str, bytes]) -> int:  # noqa: D102
+        # compression holds the GIL and writes to an archive are serialized anyway, in sorted
+        # order so the archive does not depend on the order the files were made in
+        for name, data in sorted(files.items()):
+            self._write(self._key(name), data)
+        return len(files)
+
+    def clear(self) -> None:
+        """Do nothing, the archive is always written from scratch."""
+
+    def close(self) -> None:  # noqa: D102
+        with self._lock:
+            self._archive.close()
+
+
+class S3Storage(Storage):
+    """Objects in an S3 compatible bucket, like AWS S3 or MinIO.
+
+    Requires the `boto3` package, installed with `pip install textureminer[s3]`. Credentials and
+    the endpoint are read by boto3 from the environment, e.g. `AWS_ENDPOINT_URL` for MinIO.
+    """
+
+    MAX_WORKERS: ClassVar[int | None] = 16
+    DELETE_BATCH_SIZE: ClassVar[int] = 1000
+    """Maximum number of objects deleted with a single request."""
+
+    def __init__(self, bucket: str, prefix: str = '', *, client: Any = None) -> None:  # noqa: ANN401
+        """Initialize the storage.
+
+        Args:
+        ----
+            bucket (str): name of the bucket
+            prefix (str, optional): prefix of the object keys
+            client (Any, optional): boto3 S3 client, created from the environment if None
+
+        Raises:
+        ------
+            ImportError: if no client is given and boto3 is not installed
+
+        """
+        super().__init__(prefix)
+        self.bucket = bucket
+        if client is None:
+            try:
+                import boto3  # type: ignore[import]  # noqa: PLC0415
+            except ImportError as err:
+                raise ImportError(
+                    texts.ERROR_STORAGE_MISSING_DEPENDENCY.format(package='boto3', extra='s3')
+                ) from err
+            client = boto3.client('s3')
+        self.client = client
+
+    @property
+    def url(self) -> str:  # noqa: D102
+        return f's3://{self.bucket}/{self.prefix}'
+
+    def _write(self, key: str, data: bytes) -> None:
+        self.client.put_object(
+            Bucket=self.bucket,
+            Key=key,
+            Body=data,
+            ContentType=CONTENT_TYPES.get(PurePosixPath(key).suffix, 'application/octet-stream'),
+        )
+
+    def _read(self, key: str) -> bytes:
+        return self.client.get_object(Bucket=self.bucket, Key=key)['Body'].read()
+
+    def _list(self, prefix: str) -> Iterator[str]:
+        paginator = self.client.get_paginator('list_objects_v2')
+        for page in paginator.paginate(Bucket=self.bucket, Prefix=prefix):
+            for item in page.get('Contents', ()):
+                yield item['Key']
+
+    def clear(self) -> None:  # noqa: D102
+        prefix = f'{self.prefix}/' if self.prefix else ''
+        keys = list(self._list(prefix))
+        for start in range(0, len(keys), self.DELETE_BATCH_SIZE):
+            self.client.delete_objects(
+                Bucket=self.bucket,
+                Delete={
+                    'Objects': [
+                        {'Key': key} for key in keys[start : start + self.DELETE_BATCH_SIZE]
+                    ],
+                    'Quiet': True,
+                },
+            )
+
+
+def open_storage(url: str | Path) -> Storage:
+    """Open a storage by its URL.
+
+    Supported URLs are local paths and `file://` URLs, `s3://bucket/prefix`,
+    `zip:///path/to/archive.zip` or any path ending with `.zip`, and `memory://`.
+
+    Args:
+    ----
+        url (str | Path): URL or local path of the storage
+
+    Raises:
+    ------
+        ValueError: if the URL scheme is not supported
+
+    Returns:
+    -------
+        Storage: the storage
+
+    """
+    if isinstance(url, Path):
+        return ZipStorage(url) if url.suffix == '.zip' else LocalStorage(url)
+
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower()
+
+    # single letter schemes are Windows drive letters
+    if scheme in ('', 'file') or len(scheme) == 1:
+        path = Path(parts.netloc + parts.path if scheme == 'file' else url)
+        return open_storage(path)
+    if scheme == 'zip':
+        return ZipStorage(Path(parts.netloc + parts.path), parts.fragment)
+    if scheme == 's3':
+        return S3Storage(parts.netloc, parts.path)
+    if scheme == 'memory':
+        return MemoryStorage(prefix=parts.netloc + parts.path)
+
+    raise ValueError(texts.ERROR_STORAGE_UNKNOWN.format(url=url))
+
+
+__all__ = [
+    'LocalStorage',
+    'MemoryStorage',
+    'S3Storage',
+    'Storage',
+    'ZipStorage',
+    'open_storage',
+]
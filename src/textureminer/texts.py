@@ -12,33 +12,82 @@ TITLE = r"""
 """
 
 
+ANIMATIONS_EXPORTING_N = 'Exporting {count} animated textures...'
+CACHE_HIT = 'Using cached {path}'
+CACHE_WRITE = 'Writing cache {path}'
 CLEARING_TEMP = 'Clearing temporary files...'
 COMPLETED = 'Completed. You can find the textures on:'
 COPYING_TEXTURES = 'Copying textures from {input} to {output}'
 CREATING_PARTIALS = 'Creating partial textures...'
+DIFF_REPORT = 'Report written to {path}'
+DIFF_SUMMARY = (
+    'From {old} to {new}: {added} added, {removed} removed, {changed} changed and '
+    '{unchanged} unchanged textures.'
+)
 DISABLING_COLOR = 'Disabling color output'
 EDITION_ID = 'Edition identifier: {id}'
 EDITION_USING_X = 'Using {edition} Edition.'
+ERROR_ALL_EDITIONS_VERSION = 'All editions need a version type like "stable", not {version}!'
+ERROR_ANIMATION_FORMAT = 'Animation format must be one of {formats}!'
+ERROR_ANIMATION_INVALID = 'Invalid animation!'
+ERROR_CHECKSUM_MISMATCH = 'Checksum of {path} does not match, expected {expected} but got {actual}!'
 ERROR_COMMAND_FAILED = 'The command failed with return code {error_code}: {error_msg}!'
 ERROR_EDITION_INVALID = 'Invalid edition!'
+ERROR_IN_MEMORY_UNSUPPORTED = 'In-memory mode is not supported for {edition} Edition!'
 ERROR_INVALID_COMBINATION = 'Invalid combination of version and edition!'
+ERROR_ITER_DEDUPLICATE = 'Deduplication is not supported when iterating over textures!'
+ERROR_MANIFEST_INVALID = 'No valid manifest found at {path}!'
+ERROR_MEMORY_SIZE_INVALID = 'Invalid memory size ({size}), use e.g. "512M" or "2G"!'
 ERROR_NO_LATEST_VERSION = 'Could not find latest version for {version_type} releases channel!'
+ERROR_NO_RELEASE_TIMES = 'Release times are not known for these versions!'
+ERROR_PACK_EDITION = 'Resource pack {path} is for {edition} Edition!'
+ERROR_PACK_NO_TEXTURES = 'No block or item textures found in resource pack {path}!'
+ERROR_PLAN_UNSUPPORTED = 'Planning versions is not supported for {edition} Edition!'
+ERROR_SERVER_NOT_FOUND = 'Not found ({path})!'
+ERROR_SERVER_SCALE = 'Scale must be an integer from 1 to {max_scale}!'
+ERROR_SERVER_SHAPE = 'Shape must be one of {shapes}!'
+ERROR_STORAGE_MISSING_DEPENDENCY = (
+    'The {package} package is required, install it with `pip install textureminer[{extra}]`!'
+)
+ERROR_STORAGE_UNKNOWN = 'Unsupported storage URL ({url})!'
 ERROR_VERSION_INVALID = 'Invalid version ({version})!'
-FETCHING_BLOCKS_JSON = 'Fetching blocks.json from {url}'
-FETCHING_TERRAIN_TEXTURE_JSON = 'Fetching terrain_texture.json from {url}'
+ERROR_VERSION_NOT_FOUND = 'Version {version} not found!'
 FETCHING_VERSION_MANIFEST = 'Fetching version manifest from {url}'
 FILES_DOWNLOADING = 'Downloading assets...'
 FILES_EXTRACTING_N = 'Extracting {file_amount} files...'
-FILTERING_TEXTURES = 'Filtering out non png files'
-GIT_SWITCHING_BRANCH = 'Switching to {branch} branch'
-GIT_TAGS_FOUND = 'Found tags: {tags}'
+LOCK_WAITING = 'Waiting for another process to release {path}'
+PARSING_RECIPES_N = 'Parsing {recipe_amount} recipes...'
+PACK_USING_X = 'Using resource pack {pack} with {texture_amount} textures.'
+PLAN_BYTES = (
+    'Estimated {source:.1f} MB read, {output:.1f} MB written, {pixels:.1f} MB of pixels and '
+    '{peak:.1f} MB for the largest texture.'
+)
+PLAN_TEXTURES = 'Planned {textures} textures from {sources} sources, {partials} of them partial.'
 RUNNING_COMMAND_ON_DIR = 'Running `{command}` on {dir}'
+SERVER_EXTRACTING = 'Extracting textures of {edition} {version} to serve them...'
+SERVER_LISTENING = 'Serving textures on http://{host}:{port}/'
+STORAGE_UPLOADING_N = 'Uploading {file_amount} files to {url}...'
 TEMP_DIR = 'Temporary directory: {temp}'
 TEXTURE_OPTIONS = 'Texture options: {options}'
+TEXTURES_DEDUPLICATED_N = 'Removed {count} duplicate textures'
+TEXTURES_DEDUPLICATING = 'Deduplicating textures...'
 TEXTURES_FILTERING = 'Filtering textures...'
 TEXTURES_MERGING = 'Merging block and item textures to a single directory...'
+TEXTURES_READ_N = 'Read {texture_amount} textures into memory'
 TEXTURES_REPLICATING = 'Replicating textures...'
 TEXTURES_SIMPLIFYING = 'Simplifying file structure...'
+TEXTURES_SPILLING = (
+    'Scaled textures are estimated at {size} MB, over the memory budget, writing them to disk.'
+)
 USING_GIT_EXECUTABLE = 'Git executable: {git}'
+VERIFY_FAILED = 'Found {count} problems in {files} files.'
+VERIFY_OK = 'All {files} files match the manifest.'
 VERSION_LATEST_FINDING = 'Finding latest version from {version_type} releases channel...'
+VERSION_MANIFEST_NOT_MODIFIED = 'Version manifest has not changed.'
 VERSION_USING_X = 'Using {version} version.'
+WATCH_ALREADY_PROCESSED = 'Version {version} has already been processed.'
+WATCH_HOOK_FAILED = 'Hook {command} failed with return code {error_code}!'
+WATCH_NEW_VERSION = 'Found new version {version}.'
+WATCH_POLL_FAILED = 'Polling for new versions failed, retrying after the interval.'
+WATCH_POLLING = 'Polling for new versions every {interval} seconds...'
+WATCH_RUNNING_HOOK = 'Running hook {command}'
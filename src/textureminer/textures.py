@@ -0,0 +1,519 @@
+"""Plans of the operations that make each texture, executed as one fused task per texture."""
+
+import hashlib
+import logging
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from dataclasses import dataclass, field
+from io import BytesIO
+from pathlib import Path, PurePosixPath
+from typing import Protocol
+
+from PIL import Image as Pil_Image
+
+from textureminer import texts
+from textureminer.edition.Edition import BlockShape, Edition
+from textureminer.file import mk_dir
+from textureminer.imaging import PNG_HEADER_SIZE, alias_map, hash_pixels, png_size, save_png
+from textureminer.logger import log_event
+from textureminer.options import TextureOptions
+from textureminer.parallel import MemoryBudget, thread_imap, thread_map
+from textureminer.progress import track
+from textureminer.storage import Storage
+
+JAVA_TEXTURE_DIRS: Mapping[str, str] = {
+    'assets/minecraft/textures/block/': 'blocks',
+    'assets/minecraft/textures/item/': 'items',
+}
+"""Texture directories of the Java client .jar mapped to their output directories."""
+
+
+class TextureSource(Protocol):
+    """Something the source textures of a plan are read from, like a `ResourcePack`."""
+
+    def read(self, member: str, size: int = -1) -> bytes:
+        """Read a source texture, or only its first bytes if size is not negative."""
+        ...
+
+
+def _encode(img: Pil_Image.Image) -> bytes:
+    """Encode an image as PNG."""
+    buffer = BytesIO()
+    save_png(img, buffer)
+    return buffer.getvalue()
+
+
+def simplified_path(name: str) -> str:
+    """Get the path of a texture after `TexturePlan.simplify_structure`.
+
+    Args:
+    ----
+        name (str): path of the texture, e.g. "blocks/candles/candle.png"
+
+    Returns:
+    -------
+        str: the path with the first subdirectory of "blocks" or "items" removed
+
+    """
+    parts = name.split('/')
+    if len(parts) > 2 and parts[0] in ('blocks', 'items'):  # noqa: PLR2004
+        del parts[1]
+    return '/'.join(parts)
+
+
+def merged_path(name: str) -> str:
+    """Get the path of a texture after `TexturePlan.merge`.
+
+    Args:
+    ----
+        name (str): path of the texture, e.g. "blocks/stone.png"
+
+    Returns:
+    -------
+        str: the path without the "blocks" or "items" directory
+
+    """
+    for texture_dir in ('blocks', 'items'):
+        if name.startswith(f'{texture_dir}/'):
+            return name.removeprefix(f'{texture_dir}/')
+    return name
+
+
+def _merge_order(name: str) -> int:
+    """Order block textures before item textures, so items take priority when merged."""
+    return 1 if name.startswith('items/') else 0
+
+
+@dataclass(frozen=True)
+class TextureOp:
+    """Operations that make one output texture from a source texture.
+
+    Attributes
+    ----------
+        source (str): name of the source texture, e.g. a member of a client .jar file
+        shape (BlockShape | None): shape the texture is cut to, None to keep the whole texture
+
+    """
+
+    source: str
+    shape: BlockShape | None = None
+
+
+@dataclass(frozen=True)
+class PlanEstimate:
+    """Cost of executing a plan, estimated from the headers of the source textures.
+
+    Attributes
+    ----------
+        textures (int): number of textures written
+        sources (int): number of distinct source textures read
+        partials (int): number of textures cut to a shape
+        source_bytes (int): encoded size of the source textures
+        output_bytes (int): encoded size of the textures written, assuming it grows with the
+            pixel count, which overestimates nearest neighbor scaling
+        pixel_bytes (int): decoded RGBA size of the textures written
+        peak_bytes (int): memory used by the largest single texture while it is processed
+
+    """
+
+    textures: int
+    sources: int
+    partials: int
+    source_bytes: int
+    output_bytes: int
+    pixel_bytes: int
+    peak_bytes: int
+
+
+@dataclass
+class TexturePlan:
+    """Per-texture operation graph, from source through partial shape, crop and scale to sink.
+
+    Every step before execution only renames or adds entries, so a plan is built and estimated
+    without decoding a single texture. Executing it runs the whole chain of each texture as one
+    task, with no intermediate files.
+
+    Attributes
+    ----------
+        textures (dict[str, TextureOp]): paths in the output, e.g. "blocks/stone.png", mapped to
+            the operations that make them
+        scale_factor (int): factor that every texture is scaled by
+        do_crop (bool): whether non-square textures are cropped to be square
+        reencode (bool): whether textures copied unchanged are also decoded and encoded again, so
+            no texture keeps the metadata chunks of its source
+        source_digests (dict[str, str]): paths of the source textures read by the last execution
+            mapped to their SHA-256, for the manifest of the output
+
+    """
+
+    textures: dict[str, TextureOp] = field(default_factory=dict)
+    scale_factor: int = 1
+    do_crop: bool = True
+    reencode: bool = False
+    source_digests: dict[str, str] = field(default_factory=dict, compare=False, repr=False)
+
+    @classmethod
+    def from_sources(cls, sources: Mapping[str, str], options: TextureOptions) -> 'TexturePlan':
+        """Plan the textures of a source as set in the scaling options.
+
+        Args:
+        ----
+            sources (Mapping[str, str]): paths in the output mapped to the source textures
+            options (TextureOptions): options for the textures
+
+        Returns:
+        -------
+            TexturePlan: plan copying every source texture to its path
+
+        """
+        logging.getLogger('textureminer').debug(
+            texts.TEXTURES_READ_N.format(texture_amount=len(sources))
+        )
+        return cls(
+            {name: TextureOp(source) for name, source in sources.items()},
+            scale_factor=options['SCALE_FACTOR'],
+            do_crop=options['DO_CROP'],
+            reencode=options.get('REPRODUCIBLE', False),
+        )
+
+    def __len__(self) -> int:
+        """Get the number of textures in the plan."""
+        return len(self.textures)
+
+    def __contains__(self, name: object) -> bool:
+        """Check if the plan makes a texture path."""
+        return name in self.textures
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the texture paths of the plan."""
+        return iter(self.textures)
+
+    def replicate(self, replication_rules: Mapping[str, str]) -> int:
+        """Replicate textures, like `Edition.replicate_textures`.
+
+        Args:
+        ----
+            replication_rules (Mapping[str, str]): texture names mapped to their replicated names
+
+        Returns:
+        -------
+            int: number of textures replicated
+
+        """
+        logging.getLogger('textureminer').info(texts.TEXTURES_REPLICATING)
+
+        index: dict[str, list[str]] = {}
+        for name in self.textures:
+            index.setdefault(PurePosixPath(name).stem, []).append(name)
+
+        count = 0
+        for original, replicated in replication_rules.items():
+            for name in index.get(original, ()):
+                self.textures[str(PurePosixPath(name).with_stem(replicated))] = self.textures[name]
+                count += 1
+
+        return count
+
+    def add_partials(self, partials: Iterable[tuple[str, BlockShape | None, str]]) -> int:
+        """Add partial textures like stairs and slabs.
+
+        Every partial is made from its base texture as it was before any partial was added, so a
+        texture can be both the base of one partial and replaced by another.
+
+        Args:
+        ----
+            partials (Iterable[tuple[str, BlockShape | None, str]]): path of the base texture,
+                shape to cut it to or None to copy it, and path of the partial texture
+
+        Returns:
+        -------
+            int: number of partial textures added, bases missing from the plan are skipped
+
+        """
+        logging.getLogger('textureminer').info(texts.CREATING_PARTIALS)
+
+        bases = dict(self.textures)
+        count = 0
+        for base, shape, name in partials:
+            if base not in bases:
+                continue
+            self.textures[name] = TextureOp(bases[base].source, shape or bases[base].shape)
+            count += 1
+
+        return count
+
+    def simplify_structure(self) -> None:
+        """Move textures in subdirectories of "blocks" and "items" up one level."""
+        logging.getLogger('textureminer').info(texts.TEXTURES_SIMPLIFYING)
+
+        self.textures = {simplified_path(name): op for name, op in sorted(self.textures.items())}
+
+    def merge(self) -> None:
+        """Merge block and item textures to the root. Item textures are given priority."""
+        logging.getLogger('textureminer').info(texts.TEXTURES_MERGING)
+
+        self.textures = {
+            merged_path(name): op
+            for name, op in sorted(self.textures.items(), key=lambda item: _merge_order(item[0]))
+        }
+
+    def output_size(self, header: bytes) -> tuple[int, int] | None:
+        """Get the dimensions of a texture after cropping and scaling, from its PNG header.
+
+        Args:
+        ----
+            header (bytes): at least the first `PNG_HEADER_SIZE` bytes of the source texture
+
+        Returns:
+        -------
+            tuple[int, int] | None: width and height, None if the source is not a PNG image
+
+        """
+        size = png_size(header)
+        if size is None:
+            return None
+        width, height = size
+        if self.do_crop:
+            width = height = min(width, height)
+        return width * self.scale_factor, height * self.scale_factor
+
+    def footprint(self, header: bytes) -> int:
+        """Estimate the memory used to process a texture, from the PNG header of its source.
+
+        Args:
+        ----
+            header (bytes): at least the first `PNG_HEADER_SIZE` bytes of the source texture
+
+        Returns:
+        -------
+            int: bytes of the decoded source and the output held at the same time
+
+        """
+        source = png_size(header)
+        output = self.output_size(header)
+        if source is None or output is None:
+            return 0
+        return 4 * (source[0] * source[1] + output[0] * output[1])
+
+    def estimate(
+        self,
+        source: TextureSource,
+        source_size: Callable[[str], int] | None = None,
+    ) -> PlanEstimate:
+        """Estimate the cost of executing the plan, reading only the headers of the sources.
+
+        Args:
+        ----
+            source (TextureSource): source of the textures
+            source_size (Callable[[str], int] | None, optional): encoded size of a source
+                texture, read from the source if None
+
+        Returns:
+        -------
+            PlanEstimate: counts and estimated bytes
+
+        """
+        sources = {op.source for op in self.textures.values()}
+        headers = dict(
+            zip(
+                sources,
+                thread_map(lambda name: source.read(name, PNG_HEADER_SIZE), sources),
+                strict=True,
+            )
+        )
+        if source_size is None:
+
+            def source_size(name: str) -> int:
+                return len(source.read(name))
+
+        sizes = {name: source_size(name) for name in sources}
+
+        output_bytes = 0
+        pixel_bytes = 0
+        for op in self.textures.values():
+            output_bytes += sizes[op.source] * self.scale_factor**2
+            size = self.output_size(headers[op.source])
+            if size is not None:
+                pixel_bytes += 4 * size[0] * size[1]
+
+        return PlanEstimate(
+            textures=len(self.textures),
+            sources=len(sources),
+            partials=sum(1 for op in self.textures.values() if op.shape is not None),
+            source_bytes=sum(sizes.values()),
+            output_bytes=output_bytes,
+            pixel_bytes=pixel_bytes,
+            peak_bytes=max((self.footprint(header) for header in headers.values()), default=0),
+        )
+
+    def render(self, op: TextureOp, data: bytes) -> Pil_Image.Image:
+        """Run the operations of a texture on its decoded source.
+
+        Args:
+        ----
+            op (TextureOp): operations of the texture
+            data (bytes): encoded source texture
+
+        Returns:
+        -------
+            Pil_Image.Image: the output texture
+
+        """
+        with Pil_Image.open(BytesIO(data)) as img:
+            result = Edition.crop_image(img, op.shape) if op.shape is not None else img
+            if self.do_crop:
+                result = Edition.crop_image(result, BlockShape.SQUARE)
+            if self.scale_factor != 1:
+                result = result.resize(
+                    (result.width * self.scale_factor, result.height * self.scale_factor),
+                    resample=Pil_Image.Resampling.NEAREST,
+                )
+            result.load()
+            return result
+
+    def iter_execute(
+        self,
+        source: TextureSource,
+        *,
+        decode: bool = False,
+        budget: MemoryBudget | None = None,
+    ) -> Iterator[tuple[str, Pil_Image.Image | bytes]]:
+        """Execute the plan, yielding each texture as soon as it is ready.
+
+        Only a bounded number of textures is held in memory at a time.
+
+        Args:
+        ----
+            source (TextureSource): source of the textures
+            decode (bool, optional): yield decoded images instead of PNG data
+            budget (MemoryBudget | None, optional): memory budget that textures are processed
+                under
+
+        Yields:
+        ------
+            tuple[str, Pil_Image.Image | bytes]: path of the texture and the texture
+
+        """
+        logging.getLogger('textureminer').info(texts.TEXTURES_FILTERING)
+        # checked once, so the per-texture events cost nothing unless they are logged
+        log_files = logging.getLogger('textureminer').isEnabledFor(logging.DEBUG)
+
+        def process(item: tuple[str, TextureOp]) -> tuple[str, Pil_Image.Image | bytes]:
+            name, op = item
+            data = source.read(op.source)
+            self.source_digests[op.source] = hashlib.sha256(data).hexdigest()
+            result: Pil_Image.Image | bytes = data
+            changed = op.shape is not None or self.do_crop or self.scale_factor != 1
+            if changed or self.reencode or decode:
+                img = self.render(op, data)
+                result = img if decode else _encode(img)
+            if log_files:
+                log_event('texture', name=name, source=op.source)
+            return name, result
+
+        yield from thread_imap(
+            process,
+            list(self.textures.items()),
+            budget=budget,
+            cost=lambda item: self.footprint(source.read(item[1].source, PNG_HEADER_SIZE)),
+        )
+
+    def execute(
+        self,
+        source: TextureSource,
+        sink: Path | dict[str, bytes],
+        *,
+        budget: MemoryBudget | None = None,
+    ) -> int:
+        """Execute the plan, writing each texture as soon as it is ready.
+
+        Args:
+        ----
+            source (TextureSource): source of the textures
+            sink (Path | dict[str, bytes]): directory to write the textures to, or a dictionary
+                to store their PNG data in
+            budget (MemoryBudget | None, optional): memory budget that textures are processed
+                under
+
+        Returns:
+        -------
+            int: number of textures written
+
+        """
+        count = 0
+        textures = self.iter_execute(source, budget=budget)
+        for name, data in track(textures, 'textures', len(self.textures)):
+            if isinstance(sink, dict):
+                sink[name] = data  # type: ignore[assignment]
+            else:
+                path = sink / name
+                path.parent.mkdir(parents=True, exist_ok=True)
+                path.write_bytes(data)  # type: ignore[arg-type]
+            count += 1
+        return count
+
+
+def deduplicate_files(files: dict[str, bytes]) -> dict[str, str]:
+    """Keep pixel-identical textures only once, like `Edition.deduplicate_textures`.
+
+    Args:
+    ----
+        files (dict[str, bytes]): texture paths mapped to PNG data, duplicates are removed
+
+    Returns:
+    -------
+        dict[str, str]: every texture path mapped to the path of its canonical texture
+
+    """
+    logging.getLogger('textureminer').info(texts.TEXTURES_DEDUPLICATING)
+
+    names = sorted(name for name in files if name.endswith('.png'))
+    digests = thread_map(lambda name: hash_pixels(BytesIO(files[name])), names)
+    aliases = alias_map(dict(zip(names, digests, strict=True)))
+
+    count = 0
+    for name, canonical in aliases.items():
+        if name != canonical:
+            del files[name]
+            count += 1
+
+    logging.getLogger('textureminer').debug(texts.TEXTURES_DEDUPLICATED_N.format(count=count))
+    return aliases
+
+
+def write_files(files: Mapping[str, bytes], output_dir: Path | Storage) -> Path | Storage:
+    """Write textures to a directory or storage, replacing its previous contents.
+
+    Args:
+    ----
+        files (Mapping[str, bytes]): texture paths mapped to their data
+        output_dir (Path | Storage): directory or storage that the textures will be written to
+
+    Returns:
+    -------
+        Path | Storage: the output directory or storage
+
+    """
+    if isinstance(output_dir, Storage):
+        output_dir.clear()
+        output_dir.write_many(files)
+        return output_dir
+
+    mk_dir(output_dir, del_prev=True)
+    for name, data in files.items():
+        path = output_dir / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+
+    return output_dir
+
+
+__all__ = [
+    'PlanEstimate',
+    'TextureOp',
+    'TexturePlan',
+    'TextureSource',
+    'deduplicate_files',
+    'merged_path',
+    'simplified_path',
+    'write_files',
+]
@@ -0,0 +1,334 @@
+"""Version parsing and ordering for Minecraft versions."""
+
+import re
+import string
+from bisect import bisect_right
+from enum import Enum
+from functools import cache, total_ordering
+from typing import Any, ClassVar, Self
+
+from textureminer import texts
+from textureminer.options import EditionType, VersionType
+
+REGEX_BEDROCK_RELEASE = r'^v1\.[0-9]{2}\.[0-9]{1,3}\.[0-9]{1,2}$'
+REGEX_BEDROCK_PREVIEW = r'^v1\.[0-9]{2}\.[0-9]{1,3}\.[0-9]{1,2}-preview$'
+
+# regex format `(pre-26-format) | (post-26-format)`
+REGEX_JAVA_SNAPSHOT = r'^(([0-9]{2}w[0-9]{2}[a-z])|([0-9]+\.?[0-9]+-snapshot-[0-9]?))$'
+REGEX_JAVA_PRE = r'^(([0-9]\.[0-9]+\.?[0-9]+-pre[0-9]?)|([0-9]+\.?[0-9]+-pre-[0-9]?))$'
+REGEX_JAVA_RC = r'^(([0-9]\.[0-9]+\.?[0-9]+-rc[0-9]?)|([0-9]+\.?[0-9]+-rc-[0-9]?))$'
+REGEX_JAVA_RELEASE = r'^(([0-9]\.[0-9]+(\.[0-9]+)?)|([0-9]+\.[0-9]+(\.[0-9]+)?))$'
+
+PATTERN_BEDROCK_RELEASE = re.compile(REGEX_BEDROCK_RELEASE)
+PATTERN_BEDROCK_PREVIEW = re.compile(REGEX_BEDROCK_PREVIEW)
+PATTERN_JAVA_SNAPSHOT = re.compile(REGEX_JAVA_SNAPSHOT)
+PATTERN_JAVA_PRE = re.compile(REGEX_JAVA_PRE)
+PATTERN_JAVA_RC = re.compile(REGEX_JAVA_RC)
+PATTERN_JAVA_RELEASE = re.compile(REGEX_JAVA_RELEASE)
+
+_PATTERN_NUMBERS = re.compile(r'[0-9]+')
+
+# first weekly snapshot of each update, used to place weekly snapshots before their release
+_WEEKLY_SNAPSHOT_UPDATES: tuple[tuple[tuple[int, int], tuple[int, int, int]], ...] = (
+    ((11, 47), (1, 1, 0)),
+    ((12, 3), (1, 2, 0)),
+    ((12, 15), (1, 3, 0)),
+    ((12, 32), (1, 4, 0)),
+    ((12, 49), (1, 4, 6)),
+    ((13, 1), (1, 5, 0)),
+    ((13, 11), (1, 5, 1)),
+    ((13, 16), (1, 6, 0)),
+    ((13, 36), (1, 7, 0)),
+    ((13, 47), (1, 7, 4)),
+    ((14, 2), (1, 8, 0)),
+    ((15, 31), (1, 9, 0)),
+    ((16, 14), (1, 9, 3)),
+    ((16, 20), (1, 10, 0)),
+    ((16, 32), (1, 11, 0)),
+    ((16, 50), (1, 11, 1)),
+    ((17, 6), (1, 12, 0)),
+    ((17, 31), (1, 12, 1)),
+    ((17, 43), (1, 13, 0)),
+    ((18, 30), (1, 13, 1)),
+    ((18, 43), (1, 14, 0)),
+    ((19, 34), (1, 15, 0)),
+    ((20, 6), (1, 16, 0)),
+    ((20, 27), (1, 16, 2)),
+    ((20, 45), (1, 17, 0)),
+    ((21, 37), (1, 18, 0)),
+    ((22, 3), (1, 18, 2)),
+    ((22, 11), (1, 19, 0)),
+    ((22, 24), (1, 19, 1)),
+    ((22, 42), (1, 19, 3)),
+    ((23, 3), (1, 19, 4)),
+    ((23, 12), (1, 20, 0)),
+    ((23, 31), (1, 20, 2)),
+    ((23, 40), (1, 20, 3)),
+    ((23, 51), (1, 20, 5)),
+    ((24, 18), (1, 21, 0)),
+    ((24, 33), (1, 21, 2)),
+    ((24, 44), (1, 21, 4)),
+    ((25, 2), (1, 21, 5)),
+    ((25, 15), (1, 21, 6)),
+    ((25, 31), (1, 21, 9)),
+    ((25, 41), (1, 21, 11)),
+)
+_WEEKLY_SNAPSHOT_WEEKS = tuple(week for week, _ in _WEEKLY_SNAPSHOT_UPDATES)
+
+
+class VersionKind(Enum):
+    """Enum class representing the different kinds of Minecraft versions."""
+
+    SNAPSHOT = 'snapshot'
+    """Java snapshot, e.g. 24w21a or 26.1-snapshot-1
+    """
+    PRE = 'pre'
+    """Java pre-release, e.g. 1.21-pre1 or 26.1-pre-1
+    """
+    RC = 'rc'
+    """Java release candidate, e.g. 1.21-rc1 or 26.1-rc-1
+    """
+    PREVIEW = 'preview'
+    """Bedrock preview, e.g. v1.21.0.20-preview
+    """
+    RELEASE = 'release'
+    """stable release, e.g. 1.21 or v1.21.0.3
+    """
+
+
+# order of the kinds within the development cycle of an update
+_STAGES: dict[VersionKind, int] = {
+    VersionKind.SNAPSHOT: 0,
+    VersionKind.PREVIEW: 0,
+    VersionKind.PRE: 1,
+    VersionKind.RC: 2,
+    VersionKind.RELEASE: 3,
+}
+_EDITIONS: dict[EditionType, int] = {EditionType.JAVA: 0, EditionType.BEDROCK: 1}
+_LETTER_TO_NUMBER: dict[str, int] = {
+    letter: index for index, letter in enumerate(string.ascii_lowercase)
+}
+
+type VersionKey = tuple[int, tuple[int, ...], int, tuple[int, ...]]
+
+
+def _classify(name: str, edition: EditionType | None) -> tuple[str, EditionType, VersionKind]:
+    """Find the edition and kind of a version string.
+
+    Args:
+    ----
+        name (str): version string
+        edition (EditionType | None): edition of the version, guessed from the string if None
+
+    Raises:
+    ------
+        ValueError: if the version string is not a valid version
+
+    Returns:
+    -------
+        tuple[str, EditionType, VersionKind]: normalized version string, edition and kind
+
+    """
+    if edition in (None, EditionType.JAVA):
+        for pattern, kind in (
+            (PATTERN_JAVA_RELEASE, VersionKind.RELEASE),
+            (PATTERN_JAVA_SNAPSHOT, VersionKind.SNAPSHOT),
+            (PATTERN_JAVA_PRE, VersionKind.PRE),
+            (PATTERN_JAVA_RC, VersionKind.RC),
+        ):
+            if pattern.match(name):
+                return name, EditionType.JAVA, kind
+
+    if edition in (None, EditionType.BEDROCK):
+        bedrock_name = name if name.startswith('v') else f'v{name}'
+        if PATTERN_BEDROCK_RELEASE.match(bedrock_name):
+            return bedrock_name, EditionType.BEDROCK, VersionKind.RELEASE
+        if PATTERN_BEDROCK_PREVIEW.match(bedrock_name):
+            return bedrock_name, EditionType.BEDROCK, VersionKind.PREVIEW
+
+    raise ValueError(texts.ERROR_VERSION_INVALID.format(version=name))
+
+
+def _java_update(numbers: list[int]) -> tuple[int, ...]:
+    """Get the update of a Java version from the numbers before its suffix.
+
+    Args:
+    ----
+        numbers (list[int]): numbers of the version, e.g. [1, 21, 1] or [26, 1]
+
+    Returns:
+    -------
+        tuple[int, ...]: major, minor, and patch number, e.g. (1, 21, 1) or (26, 1, 0)
+
+    """
+    return (*numbers, 0, 0)[:3]
+
+
+def _sort_key(name: str, edition: EditionType, kind: VersionKind) -> VersionKey:
+    """Compute the sort key of a classified version.
+
+    The key is `(edition, update, stage, build)` where update is the release the version belongs
+    to and stage orders snapshots and previews before pre-releases, release candidates and
+    releases of the same update.
+
+    Args:
+    ----
+        name (str): normalized version string
+        edition (EditionType): edition of the version
+        kind (VersionKind): kind of the version
+
+    Raises:
+    ------
+        ValueError: if the version is a weekly snapshot from before the first one
+
+    Returns:
+    -------
+        VersionKey: sort key
+
+    """
+    if edition == EditionType.BEDROCK:
+        numbers = [int(number) for number in _PATTERN_NUMBERS.findall(name)]
+        return _EDITIONS[edition], tuple(numbers[:3]), _STAGES[kind], tuple(numbers[3:])
+
+    if kind == VersionKind.SNAPSHOT and 'w' in name:
+        year, week_part = name.split('w')
+        week = (int(year), int(week_part[:-1]))
+        index = bisect_right(_WEEKLY_SNAPSHOT_WEEKS, week) - 1
+        if index < 0:
+            # there were no weekly snapshots before 11w47a
+            raise ValueError(texts.ERROR_VERSION_INVALID.format(version=name))
+        update = _WEEKLY_SNAPSHOT_UPDATES[index][1]
+        build: tuple[int, ...] = (*week, _LETTER_TO_NUMBER[week_part[-1]])
+        return _EDITIONS[edition], update, _STAGES[kind], build
+
+    if kind == VersionKind.RELEASE:
+        numbers = [int(number) for number in name.split('.')]
+        return _EDITIONS[edition], _java_update(numbers), _STAGES[kind], ()
+
+    update_part, _, build_part = name.partition(f'-{kind.value}')
+    numbers = [int(number) for number in update_part.split('.')]
+    build = tuple(int(number) for number in _PATTERN_NUMBERS.findall(build_part))
+    return _EDITIONS[edition], _java_update(numbers), _STAGES[kind], build
+
+
+@total_ordering
+class Version:
+    """An immutable, interned Minecraft version.
+
+    Parsing the same version string twice returns the same object, so versions are cheap to
+    create, hash and compare. Versions have a total order: within an edition they are ordered by
+    update and then by kind, so a snapshot of an update comes before its pre-releases, release
+    candidates and the release itself. Java versions come before Bedrock versions.
+
+    Attributes
+    ----------
+        name (str): version string, Bedrock versions always start with "v"
+        edition (EditionType): edition of the version
+        kind (VersionKind): kind of the version
+        key (VersionKey): sort key of the version
+
+    """
+
+    __slots__ = ('edition', 'key', 'kind', 'name')
+
+    name: str
+    edition: EditionType
+    kind: VersionKind
+    key: VersionKey
+
+    _interned: ClassVar[dict[tuple[str, EditionType | None], 'Version']] = {}
+
+    def __new__(cls, name: str, edition: EditionType | None = None) -> Self:
+        """Parse a version string, returning the interned instance if it was parsed before.
+
+        Args:
+        ----
+            name (str): version string
+            edition (EditionType | None, optional): edition of the version, guessed if None
+
+        Raises:
+        ------
+            ValueError: if the version string is not a valid version
+
+        Returns:
+        -------
+            Version: parsed version
+
+        """
+        interned = cls._interned.get((name, edition))
+        if interned is not None:
+            return interned  # type: ignore[return-value]
+
+        normalized, parsed_edition, kind = _classify(name, edition)
+        self = cls._interned.get((normalized, parsed_edition))
+        if self is None:
+            self = super().__new__(cls)
+            object.__setattr__(self, 'name', normalized)
+            object.__setattr__(self, 'edition', parsed_edition)
+            object.__setattr__(self, 'kind', kind)
+            object.__setattr__(self, 'key', _sort_key(normalized, parsed_edition, kind))
+            cls._interned[(normalized, parsed_edition)] = self
+
+        cls._interned[(name, edition)] = self
+        return self  # type: ignore[return-value]
+
+    @staticmethod
+    @cache
+    def try_parse(name: str, edition: EditionType | None = None) -> 'Version | None':
+        """Parse a version string without raising on invalid versions.
+
+        Args:
+        ----
+            name (str): version string
+            edition (EditionType | None, optional): edition of the version, guessed if None
+
+        Returns:
+        -------
+            Version | None: parsed version or None if the string is not a valid version
+
+        """
+        try:
+            return Version(name, edition)
+        except ValueError:
+            return None
+
+    @property
+    def version_type(self) -> VersionType:
+        """Type of the version, stable for releases and experimental for everything else."""
+        return VersionType.STABLE if self.kind == VersionKind.RELEASE else VersionType.EXPERIMENTAL
+
+    def __setattr__(self, name: str, value: object) -> None:
+        """Prevent modifying the version."""
+        immutable_msg = f'{type(self).__name__} is immutable'
+        raise AttributeError(immutable_msg)
+
+    def __reduce__(self) -> tuple[type['Version'], tuple[str, EditionType]]:
+        """Pickle the version by its string and edition."""
+        return Version, (self.name, self.edition)
+
+    def __eq__(self, other: object) -> bool:
+        """Check if two versions are the same."""
+        if not isinstance(other, Version):
+            return NotImplemented
+        return self.key == other.key
+
+    def __lt__(self, other: Any) -> bool:  # noqa: ANN401
+        """Check if the version comes before another version."""
+        if not isinstance(other, Version):
+            return NotImplemented
+        return self.key < other.key
+
+    def __hash__(self) -> int:
+        """Hash the version by its sort key."""
+        return hash(self.key)
+
+    def __str__(self) -> str:
+        """Get the version string."""
+        return self.name
+
+    def __repr__(self) -> str:
+        """Get a representation of the version."""
+        return f'Version({self.name!r}, {self.edition})'
+
+
+__all__ = ['Version', 'VersionKind']
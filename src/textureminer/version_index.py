@@ -0,0 +1,257 @@
+"""Sorted index of Minecraft versions supporting range and time-window queries."""
+
+import re
+from bisect import bisect_left, bisect_right
+from collections.abc import Collection, Iterable, Mapping, Sequence
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from textureminer import texts
+from textureminer.options import EditionType, VersionType
+from textureminer.version import Version, VersionKind
+
+_PATTERN_YEAR = re.compile(r'^[0-9]{4}$')
+_PATTERN_MONTH = re.compile(r'^[0-9]{4}-[0-9]{2}$')
+
+KIND_ALIASES: Mapping[str, frozenset[VersionKind]] = {
+    VersionType.STABLE.value: frozenset({VersionKind.RELEASE}),
+    VersionType.EXPERIMENTAL.value: frozenset(
+        {VersionKind.SNAPSHOT, VersionKind.PRE, VersionKind.RC, VersionKind.PREVIEW}
+    ),
+    **{kind.value: frozenset({kind}) for kind in VersionKind},
+}
+"""Names accepted as version types in queries, mapped to the kinds they select."""
+
+
+@dataclass(frozen=True, slots=True)
+class VersionEntry:
+    """A version in a version index.
+
+    Attributes
+    ----------
+        version (Version): the version
+        release_time (datetime | None): release time of the version if known
+
+    """
+
+    version: Version
+    release_time: datetime | None = None
+
+    def to_json(self) -> dict[str, Any]:
+        """Convert the entry to a JSON serializable dictionary.
+
+        Returns
+        -------
+            dict[str, Any]: the entry as a dictionary
+
+        """
+        return {
+            'id': self.version.name,
+            'edition': self.version.edition.value,
+            'kind': self.version.kind.value,
+            'type': self.version.version_type.value,
+            'release_time': self.release_time.isoformat() if self.release_time else None,
+        }
+
+
+def parse_time_bound(value: str, *, end: bool = False) -> datetime | None:
+    """Parse a year, a month, a date or a date and time into a time bound.
+
+    Args:
+    ----
+        value (str): e.g. "2024", "2024-06", "2024-06-13" or "2024-06-13T12:00:00+00:00"
+        end (bool, optional): whether the bound is exclusive end of the given period
+
+    Returns:
+    -------
+        datetime | None: the bound or None if the value is not a time
+
+    """
+    if _PATTERN_YEAR.match(value):
+        start = datetime(int(value), 1, 1, tzinfo=UTC)
+        return start.replace(year=start.year + 1) if end else start
+    if _PATTERN_MONTH.match(value):
+        year, month = (int(part) for part in value.split('-'))
+        if end:
+            year, month = (year + 1, 1) if month == 12 else (year, month + 1)  # noqa: PLR2004
+        return datetime(year, month, 1, tzinfo=UTC)
+
+    try:
+        time = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    if time.tzinfo is None:
+        time = time.replace(tzinfo=UTC)
+    if end and 'T' not in value:
+        return time + timedelta(days=1)
+    return time
+
+
+class VersionIndex:
+    """Versions of an edition sorted by release time, or by version if release times are unknown.
+
+    Queries locate their bounds with binary search, so selecting a range is logarithmic in the
+    number of versions plus the size of the result.
+    """
+
+    def __init__(self, entries: Iterable[VersionEntry]) -> None:
+        """Sort the entries and build the index.
+
+        Args:
+        ----
+            entries (Iterable[VersionEntry]): versions to index
+
+        """
+        entry_list = list(entries)
+        self.has_times = bool(entry_list) and all(entry.release_time for entry in entry_list)
+        if self.has_times:
+            entry_list.sort(key=lambda entry: (entry.release_time, entry.version))
+        else:
+            entry_list.sort(key=lambda entry: entry.version)
+
+        self.entries: Sequence[VersionEntry] = tuple(entry_list)
+        self._times = tuple(
+            entry.release_time for entry in self.entries if entry.release_time is not None
+        )
+        self._positions = {entry.version.name: i for i, entry in enumerate(self.entries)}
+        self.edition = self.entries[0].version.edition if self.entries else None
+
+    @classmethod
+    def from_java_manifest(cls, manifest: Mapping[str, Any]) -> 'VersionIndex':
+        """Build an index from the Java version manifest.
+
+        Versions that do not follow a known version format, like April Fools' snapshots, alphas
+        and betas, are skipped.
+
+        Args:
+        ----
+            manifest (Mapping[str, Any]): version manifest from Mojang
+
+        Returns:
+        -------
+            VersionIndex: index of the versions
+
+        """
+        entries = []
+        for version_data in manifest['versions']:
+            version = Version.try_parse(version_data['id'], EditionType.JAVA)
+            if version is None:
+                continue
+            entries.append(
+                VersionEntry(version, datetime.fromisoformat(version_data['releaseTime']))
+            )
+        return cls(entries)
+
+    @classmethod
+    def from_bedrock_tags(cls, tags: Iterable[str]) -> 'VersionIndex':
+        """Build an index from the tags of the Bedrock samples repository.
+
+        Args:
+        ----
+            tags (Iterable[str]): tag names
+
+        Returns:
+        -------
+            VersionIndex: index of the versions
+
+        """
+        versions = {Version.try_parse(tag, EditionType.BEDROCK) for tag in tags}
+        return cls(VersionEntry(version) for version in versions if version is not None)
+
+    def __len__(self) -> int:
+        """Get the number of versions in the index."""
+        return len(self.entries)
+
+    def _lower_bound(self, since: str) -> int:
+        """Find the position of the first entry at or after a version or time."""
+        time = parse_time_bound(since)
+        if time is None:
+            return self._version_bound(since, upper=False)
+        self._require_times()
+        return bisect_left(self._times, time)
+
+    def _upper_bound(self, until: str) -> int:
+        """Find the position after the last entry at or before a version or time."""
+        time = parse_time_bound(until, end=True)
+        if time is None:
+            return self._version_bound(until, upper=True)
+        self._require_times()
+        return bisect_left(self._times, time)
+
+    def _version_bound(self, version: str, *, upper: bool) -> int:
+        """Find the position of a version in the index.
+
+        Args:
+        ----
+            version (str): version to find
+            upper (bool): whether to return the position after the version
+
+        Raises:
+        ------
+            ValueError: if the version is invalid, or not in an index sorted by release time
+
+        Returns:
+        -------
+            int: position of the version
+
+        """
+        parsed = None
+        position = self._positions.get(version)
+        if position is None:
+            parsed = Version.try_parse(version, self.edition)
+            if parsed is None:
+                raise ValueError(texts.ERROR_VERSION_INVALID.format(version=version))
+            position = self._positions.get(parsed.name)
+
+        if position is not None:
+            return position + 1 if upper else position
+        if self.has_times or parsed is None:
+            raise ValueError(texts.ERROR_VERSION_NOT_FOUND.format(version=version))
+
+        bisect = bisect_right if upper else bisect_left
+        return bisect(self.entries, parsed, key=lambda entry: entry.version)
+
+    def _require_times(self) -> None:
+        """Raise an error if the index does not know release times."""
+        if not self.has_times:
+            raise ValueError(texts.ERROR_NO_RELEASE_TIMES)
+
+    def query(
+        self,
+        *,
+        since: str | None = None,
+        until: str | None = None,
+        kinds: Collection[VersionKind] | None = None,
+        last: int | None = None,
+    ) -> list[VersionEntry]:
+        """Select versions from the index, oldest first.
+
+        Args:
+        ----
+            since (str | None, optional): first version, or start of a time window
+                like "2024" or "2024-06-13", inclusive
+            until (str | None, optional): last version, or end of a time window, inclusive
+            kinds (Collection[VersionKind] | None, optional): kinds of versions to select
+            last (int | None, optional): only select this many of the newest matching versions
+
+        Raises:
+        ------
+            ValueError: if a bound is invalid or a time is used without known release times
+
+        Returns:
+        -------
+            list[VersionEntry]: selected versions
+
+        """
+        start = self._lower_bound(since) if since is not None else 0
+        stop = self._upper_bound(until) if until is not None else len(self.entries)
+
+        selected = [
+            entry
+            for entry in self.entries[start:stop]
+            if kinds is None or entry.version.kind in kinds
+        ]
+        if last is not None:
+            return selected[-last:] if last > 0 else []
+        return selected
@@ -0,0 +1,255 @@
+"""Watching for new Minecraft versions and extracting the textures of each one once."""
+
+import json
+import logging
+import os
+import shlex
+import subprocess
+import time
+from collections.abc import Sequence
+from pathlib import Path
+
+from textureminer import texts
+from textureminer.edition.Bedrock import Bedrock
+from textureminer.edition.Java import Java
+from textureminer.file import atomic_write, file_lock
+from textureminer.options import DEFAULTS, EditionType, TextureOptions, VersionType
+from textureminer.storage import Storage
+from textureminer.version_index import KIND_ALIASES
+
+
+class WatchState:
+    """Versions already processed by the watcher and validators of the polled version lists.
+
+    Attributes
+    ----------
+        path (Path): JSON file the state is kept in
+        data (dict): the state, keyed by edition
+
+    """
+
+    def __init__(self, path: Path) -> None:
+        """Load the state from a file, starting empty if it does not exist.
+
+        Args:
+        ----
+            path (Path): JSON file the state is kept in
+
+        """
+        self.path = path
+        try:
+            with path.open(encoding='utf-8') as f:
+                self.data: dict = json.load(f)
+        except FileNotFoundError:
+            self.data = {}
+
+    def _edition(self, edition: EditionType) -> dict:
+        return self.data.setdefault(edition.value, {'processed': [], 'validators': {}})
+
+    def is_processed(self, edition: EditionType, version: str) -> bool:
+        """Check if the textures of a version have already been extracted."""
+        return version in self._edition(edition)['processed']
+
+    def mark_processed(self, edition: EditionType, version: str) -> None:
+        """Record that the textures of a version have been extracted."""
+        self._edition(edition)['processed'].append(version)
+
+    def validators(self, edition: EditionType) -> dict[str, str]:
+        """Get the validators of the last fetched version list, for conditional requests."""
+        return self._edition(edition)['validators']
+
+    def set_validators(self, edition: EditionType, validators: dict[str, str]) -> None:
+        """Set the validators of the last fetched version list."""
+        self._edition(edition)['validators'] = validators
+
+    def save(self) -> None:
+        """Write the state to its file atomically."""
+        atomic_write(self.path, json.dumps(self.data, indent=2).encode())
+
+
+class Watcher:
+    """Polls for new versions and extracts the textures of versions not processed before.
+
+    The Java version manifest is fetched with conditional requests and the Bedrock tags are listed
+    without cloning the repository, so a poll without new versions is cheap.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        editions: Sequence[EditionType],
+        version_types: Sequence[VersionType],
+        output: Path | Storage,
+        *,
+        options: TextureOptions | None = None,
+        state_path: Path | None = None,
+        hook: str | None = None,
+        rules_path: Path | None = None,
+    ) -> None:
+        """Initialize the watcher.
+
+        Args:
+        ----
+            editions (Sequence[EditionType]): editions to watch
+            version_types (Sequence[VersionType]): types of versions to watch, the latest version
+                of each type is extracted
+            output (Path | Storage): directory or storage that the textures will go
+            options (TextureOptions | None, optional): options for the textures
+            state_path (Path | None, optional): file to keep the state in, "watch.json" in the
+                cache directory if None
+            hook (str | None, optional): command to run after each extraction, the location of
+                the textures is appended as its last argument
+            rules_path (Path | None, optional): rules file overriding the bundled texture rules
+
+        """
+        self.editions = editions
+        self.version_types = version_types
+        self.output = output
+        self.options = options
+        self.state_path = state_path or DEFAULTS['CACHE_DIR'] / 'watch.json'
+        self.hook = hook
+        self.rules_path = rules_path
+
+    def latest_versions(self, edition: EditionType, state: WatchState) -> list[str]:
+        """Poll for the latest version of each watched type.
+
+        Args:
+        ----
+            edition (EditionType): edition to poll
+            state (WatchState): state holding the validators of the previous poll
+
+        Returns:
+        -------
+            list[str]: latest versions, without duplicates
+
+        """
+        if edition == EditionType.JAVA:
+            with Java(in_memory=True) as java:
+                state.set_validators(edition, java.poll_version_manifest(state.validators(edition)))
+                index = java.get_version_index()
+        else:
+            with Bedrock() as bedrock:
+                index = bedrock.get_version_index(refresh=True)
+
+        versions: list[str] = []
+        for version_type in self.version_types:
+            entries = index.query(kinds=KIND_ALIASES[version_type.value], last=1)
+            if entries and entries[0].version.name not in versions:
+                versions.append(entries[0].version.name)
+        return versions
+
+    def poll(self) -> list[tuple[EditionType, str, Path | Storage]]:
+        """Extract the textures of new versions once.
+
+        The state file is locked for the whole poll, so watchers sharing it never extract the
+        same version twice.
+
+        Returns
+        -------
+            list[tuple[EditionType, str, Path | Storage]]: edition, version and location of the
+                textures of each extracted version
+
+        """
+        logger = logging.getLogger('textureminer')
+        extracted: list[tuple[EditionType, str, Path | Storage]] = []
+
+        with file_lock(self.state_path):
+            state = WatchState(self.state_path)
+            for edition in self.editions:
+                for version in self.latest_versions(edition, state):
+                    if state.is_processed(edition, version):
+                        logger.debug(texts.WATCH_ALREADY_PROCESSED.format(version=version))
+                        continue
+
+                    logger.info(texts.WATCH_NEW_VERSION.format(version=version))
+                    output = self.extract(edition, version)
+                    if output is None:
+                        continue
+                    state.mark_processed(edition, version)
+                    state.save()
+                    extracted.append((edition, version, output))
+                    self.run_hook(edition, version, output)
+            state.save()
+
+        return extracted
+
+    def extract(self, edition: EditionType, version: str) -> Path | Storage | None:
+        """Extract the textures of a version.
+
+        Args:
+        ----
+            edition (EditionType): edition of the version
+            version (str): version to extract
+
+        Returns:
+        -------
+            Path | Storage | None: location of the textures or None if invalid input
+
+        """
+        if edition == EditionType.JAVA:
+            with Java(
+                rules_path=self.rules_path, in_memory=isinstance(self.output, Storage)
+            ) as java:
+                return java.get_textures(version, self.output, self.options)
+
+        with Bedrock(rules_path=self.rules_path) as bedrock:
+            return bedrock.get_textures(version, self.output, self.options)
+
+    def run_hook(self, edition: EditionType, version: str, output: Path | Storage) -> None:
+        """Run the hook command for an extracted version, if one is set.
+
+        The location of the textures is appended to the command, and the edition, version and
+        location are also set in the TEXTUREMINER_EDITION, TEXTUREMINER_VERSION and
+        TEXTUREMINER_OUTPUT environment variables.
+
+        Args:
+        ----
+            edition (EditionType): edition of the version
+            version (str): extracted version
+            output (Path | Storage): location of the textures
+
+        """
+        if self.hook is None:
+            return
+
+        location = output.as_posix() if isinstance(output, Path) else output.url
+        command = [*shlex.split(self.hook), location]
+        logging.getLogger('textureminer').debug(texts.WATCH_RUNNING_HOOK.format(command=command))
+        result = subprocess.run(  # noqa: S603
+            command,
+            check=False,
+            env={
+                **os.environ,
+                'TEXTUREMINER_EDITION': edition.value,
+                'TEXTUREMINER_VERSION': version,
+                'TEXTUREMINER_OUTPUT': location,
+            },
+        )
+        if result.returncode != 0:
+            logging.getLogger('textureminer').error(
+                texts.WATCH_HOOK_FAILED.format(command=command, error_code=result.returncode)
+            )
+
+    def run(self, interval: float | None = None) -> None:
+        """Poll for new versions repeatedly.
+
+        A failed poll is logged and retried after the interval.
+
+        Args:
+        ----
+            interval (float | None, optional): seconds between polls, poll only once if None
+
+        """
+        while True:
+            try:
+                self.poll()
+            except Exception:
+                if interval is None:
+                    raise
+                logging.getLogger('textureminer').exception(texts.WATCH_POLL_FAILED)
+
+            if interval is None:
+                return
+            time.sleep(interval)
+
+
+__all__ = ['WatchState', 'Watcher']
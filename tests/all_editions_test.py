@@ -0,0 +1,56 @@
+import threading
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from textureminer import DEFAULTS, Bedrock, Java, cli
+from textureminer.edition.Edition import Edition
+from textureminer.parallel import shared_pool, thread_map
+
+
+def test_shared_pool_runs_nested_calls() -> None:
+    def outer(item: int) -> list[int]:
+        # a nested call from a shared thread gets its own pool instead of waiting on the shared one
+        return thread_map(lambda value: value * item, [1, 2, 3])
+
+    with shared_pool(max_workers=2):
+        names = thread_map(lambda _item: threading.current_thread().name, range(4))
+        assert thread_map(outer, [1, 2, 3, 4]) == [[i, 2 * i, 3 * i] for i in range(1, 5)]
+
+    assert all(name.startswith('textureminer-shared') for name in names)
+    assert not thread_map(lambda _item: threading.current_thread().name, [0])[0].startswith(
+        'textureminer-shared'
+    )
+
+
+def test_all_editions_run_concurrently(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    both_running = threading.Barrier(2, timeout=5)
+    calls: list[tuple[Any, ...]] = []
+
+    def get_textures(self: Edition, version_or_type: Any, output_dir: Path, options: Any) -> Path:
+        both_running.wait()
+        workers = thread_map(lambda _item: threading.current_thread().name, [0])
+        calls.append((self.EDITION_TYPE, version_or_type, self.memory_budget, workers[0]))
+        return output_dir / self.EDITION_TYPE.value
+
+    monkeypatch.setitem(DEFAULTS, 'TEMP_PATH', tmp_path / 'temp')
+    monkeypatch.setattr(Java, 'get_textures', get_textures)
+    monkeypatch.setattr(Bedrock, 'get_textures', get_textures)
+
+    with pytest.raises(SystemExit) as exit_info:
+        cli(['stable', '--all-editions', '--max-memory', '64M', '-o', str(tmp_path / 'out')])
+
+    assert exit_info.value.code == 0
+    assert sorted(call[0].value for call in calls) == ['bedrock', 'java']
+    assert calls[0][2] is calls[1][2]
+    assert calls[0][2].limit == 64 * 2**20
+    assert all(call[3].startswith('textureminer-shared') for call in calls)
+
+
+def test_all_editions_need_version_type(tmp_path: Path) -> None:
+    with pytest.raises(SystemExit) as exit_info:
+        cli(['1.21', '--all-editions', '-o', str(tmp_path / 'out')])
+
+    assert exit_info.value.code != 0
+    assert 'version type' in str(exit_info.value)
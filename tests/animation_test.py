@@ -0,0 +1,79 @@
+import json
+from io import BytesIO
+
+from PIL import Image
+
+from textureminer.animation import Animation
+
+COLORS = [(255, 0, 0, 255), (0, 255, 0, 255), (255, 0, 0, 255), (0, 0, 255, 255)]
+
+
+def _strip(size: int = 16) -> Image.Image:
+    strip = Image.new('RGBA', (size, size * len(COLORS)))
+    for position, color in enumerate(COLORS):
+        strip.paste(color, (0, position * size, size, (position + 1) * size))
+    return strip
+
+
+def test_from_strip_stores_identical_frames_once() -> None:
+    mcmeta = {'animation': {'frametime': 2, 'frames': [0, 1, 2, 3, {'index': 1, 'time': 5}]}}
+
+    animation = Animation.from_strip(_strip(), mcmeta)
+
+    assert len(animation.frames) == 3
+    assert animation.sequence == [(0, 2), (1, 2), (0, 2), (2, 2), (1, 5)]
+    assert [frame.getpixel((0, 0)) for frame in animation.frames] == [
+        COLORS[0],
+        COLORS[1],
+        COLORS[3],
+    ]
+
+
+def test_frames_are_scaled_once() -> None:
+    animation = Animation.from_strip(_strip(), {'animation': {}})
+
+    assert animation.frames_at(4) is animation.frames_at(4)
+    assert animation.frames_at(4)[0].size == (64, 64)
+    assert animation.frames_at(1) is animation.frames
+
+
+def test_interpolated_timeline() -> None:
+    animation = Animation.from_strip(_strip(), {'animation': {'frametime': 4, 'interpolate': True}})
+
+    timeline = animation.timeline()
+
+    assert len(timeline) == 16
+    assert all(duration == 50 for _, duration in timeline)
+    assert timeline[2][0].getpixel((0, 0)) == (127, 127, 0, 255)
+
+
+def test_encode_animated_images() -> None:
+    animation = Animation.from_strip(_strip(32), {'animation': {'frametime': 2}})
+
+    for animation_format, suffix in (('apng', '.apng'), ('webp', '.webp')):
+        files = animation.encode(animation_format, 2)
+        with Image.open(BytesIO(files[suffix])) as img:
+            assert img.n_frames == 4
+            assert img.size == (64, 64)
+            img.load()
+            assert img.info['duration'] == 100
+
+
+def test_encode_frame_sheet() -> None:
+    animation = Animation.from_strip(_strip(), {'animation': {'frametime': 3}})
+
+    files = animation.encode('sheet')
+
+    with Image.open(BytesIO(files['.sheet.png'])) as sheet:
+        assert sheet.size == (16, 48)
+    assert json.loads(files['.sheet.png.mcmeta']) == {
+        'animation': {
+            'interpolate': False,
+            'frames': [
+                {'index': 0, 'time': 3},
+                {'index': 1, 'time': 3},
+                {'index': 0, 'time': 3},
+                {'index': 2, 'time': 3},
+            ],
+        }
+    }
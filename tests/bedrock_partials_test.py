@@ -0,0 +1,94 @@
+import json
+import subprocess
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+from PIL import Image
+
+from textureminer import Bedrock, BlockShape
+
+STONE = (120, 120, 120, 255)
+SNOW = (250, 250, 250, 255)
+TRANSPARENT = (255, 255, 255, 0)
+
+BLOCKS = {
+    'format_version': '1.1.0',
+    'snow': {'textures': 'snow'},
+    'stone_slab': {'textures': 'stone'},
+    'stone_double_slab': {'textures': 'stone'},
+    'candle_stairs': {'textures': {'up': 'candle', 'side': 'candle'}},
+    'light_gray_carpet': {'textures': 'carpet_silver'},
+    'moss_carpet': {'textures': 'moss_carpet'},
+    'carpet': {'textures': 'carpet'},
+    'waxed_copper': {'textures': 'copper_block'},
+    'waxed_copper_door': {'textures': {'up': 'copper_door_top', 'down': 'copper_door_bottom'}},
+}
+
+TERRAIN = """// comments are allowed in this file
+{
+  "texture_data": {
+    "stone": {"textures": "textures/blocks/stone"},
+    "candle": {"textures": ["textures/blocks/candles/candle", "textures/blocks/candles/lit"]}
+  }
+}
+"""
+
+
+@pytest.fixture
+def bedrock(tmp_path: Path) -> Iterator[Bedrock]:
+    repo = tmp_path / 'repo'
+    (repo / 'resource_pack' / 'textures').mkdir(parents=True)
+    (repo / 'resource_pack' / 'blocks.json').write_text(json.dumps(BLOCKS))
+    (repo / 'resource_pack' / 'textures' / 'terrain_texture.json').write_text(TERRAIN)
+    for command in (
+        ('git', 'init', '-q'),
+        ('git', 'add', '.'),
+        ('git', '-c', 'user.name=test', '-c', 'user.email=test@test', 'commit', '-qm', 'v1'),
+    ):
+        subprocess.run(command, cwd=repo, check=True)  # noqa: S603
+
+    with Bedrock() as edition:
+        edition.repo_dir = repo
+        yield edition
+
+
+def test_partial_index(cache_dir: Path, bedrock: Bedrock) -> None:
+    plan = bedrock._partial_plan()  # noqa: SLF001
+
+    assert sorted(plan, key=lambda partial: partial[2]) == [
+        ('blocks/candles/candle.png', BlockShape.STAIR, 'blocks/candles/candle_stairs.png'),
+        ('blocks/wool_colored_silver.png', BlockShape.CARPET, 'blocks/light_gray_carpet.png'),
+        ('blocks/moss_block.png', BlockShape.CARPET, 'blocks/moss_carpet.png'),
+        ('blocks/snow.png', BlockShape.SNOW, 'blocks/snow.png'),
+        ('blocks/snow.png', None, 'blocks/snow_block.png'),
+        ('blocks/stone.png', BlockShape.SLAB, 'blocks/stone_slab.png'),
+        ('blocks/copper_block.png', None, 'blocks/waxed_copper.png'),
+        ('blocks/copper_door_bottom.png', None, 'blocks/waxed_copper_door_bottom.png'),
+        ('blocks/copper_door_top.png', None, 'blocks/waxed_copper_door_top.png'),
+    ]
+    assert len(list((cache_dir / 'bedrock-partials').glob('*.json'))) == 1
+
+
+def test_partial_textures(tmp_path: Path, cache_dir: Path, bedrock: Bedrock) -> None:
+    blocks = tmp_path / 'textures' / 'blocks'
+    (blocks / 'candles').mkdir(parents=True)
+    for name in ('stone', 'candles/candle', 'wool_colored_silver', 'moss_block', 'copper_block'):
+        Image.new('RGBA', (16, 16), STONE).save(blocks / f'{name}.png')
+    for name in ('copper_door_top', 'copper_door_bottom'):
+        Image.new('RGBA', (16, 16), STONE).save(blocks / f'{name}.png')
+    Image.new('RGBA', (16, 16), SNOW).save(blocks / 'snow.png')
+
+    bedrock._create_partial_textures(blocks.parent, bedrock._partial_plan())  # noqa: SLF001
+
+    # the full snow texture is copied before it is cropped to a snow layer
+    with Image.open(blocks / 'snow_block.png') as snow_block:
+        assert snow_block.getpixel((0, 0)) == SNOW
+    with Image.open(blocks / 'snow.png') as snow:
+        assert snow.getpixel((0, 0)) == TRANSPARENT
+        assert snow.getpixel((0, 15)) == SNOW
+    with Image.open(blocks / 'stone_slab.png') as slab:
+        assert slab.getpixel((0, 7)) == TRANSPARENT
+        assert slab.getpixel((0, 8)) == STONE
+    assert (blocks / 'candles' / 'candle_stairs.png').is_file()
+    assert (blocks / 'waxed_copper_door_top.png').is_file()
@@ -0,0 +1,72 @@
+import subprocess
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from textureminer import Bedrock, VersionType
+
+TAGS = ['v1.20.80.5', 'v1.21.130.3', 'v1.21.2.2', 'v1.21.140.20-preview', 'not-a-version']
+
+
+def _git(*args: str, cwd: Path) -> str:
+    return subprocess.run(  # noqa: S603
+        ('git', '-c', 'user.name=test', '-c', 'user.email=test@test', *args),
+        cwd=cwd,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout.strip()
+
+
+@pytest.fixture
+def bedrock(cache_dir: Path) -> Iterator[Bedrock]:  # noqa: ARG001
+    with Bedrock() as edition:
+        yield edition
+
+
+def test_latest_version_without_clone(bedrock: Bedrock, monkeypatch: pytest.MonkeyPatch) -> None:
+    calls: list[int] = []
+
+    def fetch_tags(_self: Bedrock) -> list[str]:
+        calls.append(1)
+        return TAGS
+
+    def clone(_self: Bedrock, _clone_dir: Path) -> None:
+        pytest.fail('the repository was cloned')
+
+    monkeypatch.setattr(Bedrock, '_fetch_remote_tags', fetch_tags)
+    monkeypatch.setattr(Bedrock, '_clone_repo', clone)
+
+    assert bedrock.get_latest_version(VersionType.STABLE) == 'v1.21.130.3'
+    assert bedrock.get_latest_version(VersionType.EXPERIMENTAL) == 'v1.21.140.20-preview'
+    assert bedrock.get_latest_version(VersionType.ALL) == 'v1.21.140.20-preview'
+    # the tag list is cached between lookups
+    assert len(calls) == 1
+
+    monkeypatch.setattr(Bedrock, '_fetch_remote_tags', lambda _self: ['v1.21.140.20-preview'])
+    bedrock.get_version_index(refresh=True)
+    with pytest.raises(ValueError, match='stable'):
+        bedrock.get_textures(VersionType.STABLE)
+
+
+def test_checks_out_fetched_tag(tmp_path: Path, bedrock: Bedrock) -> None:
+    origin = tmp_path / 'origin'
+    (origin / 'resource_pack').mkdir(parents=True)
+    _git('init', '-q', cwd=origin)
+    (origin / 'resource_pack' / 'blocks.json').write_text('{}')
+    _git('add', '.', cwd=origin)
+    _git('commit', '-qm', 'release', cwd=origin)
+    _git('tag', 'v1.21.0.3', cwd=origin)
+    release = _git('rev-parse', 'HEAD', cwd=origin)
+    (origin / 'resource_pack' / 'blocks.json').write_text('{"stone": {}}')
+    _git('commit', '-qam', 'next', cwd=origin)
+
+    clone = tmp_path / 'clone'
+    _git('clone', '-q', '--no-tags', origin.as_posix(), clone.as_posix(), cwd=tmp_path)
+    bedrock.repo_dir = clone
+
+    bedrock._change_repo_version('v1.21.0.3')  # noqa: SLF001
+
+    assert _git('rev-parse', 'HEAD', cwd=clone) == release
+    assert (clone / 'resource_pack' / 'blocks.json').read_text() == '{}'
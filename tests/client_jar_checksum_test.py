@@ -0,0 +1,57 @@
+import hashlib
+from collections.abc import Iterator
+from typing import Any
+
+import pytest
+import requests  # type: ignore[import]
+
+from textureminer import Java
+
+CONTENTS = b'client jar contents'
+
+
+class _Response:
+    headers: dict[str, str] = {}  # noqa: RUF012
+
+    def __enter__(self) -> '_Response':
+        return self
+
+    def __exit__(self, *_args: object) -> None:
+        pass
+
+    def raise_for_status(self) -> None:
+        pass
+
+    def iter_content(self, chunk_size: int) -> Iterator[bytes]:
+        yield from (CONTENTS[i : i + chunk_size] for i in range(0, len(CONTENTS), chunk_size))
+
+
+@pytest.fixture
+def java(monkeypatch: pytest.MonkeyPatch) -> Java:
+    def get(_url: str, **_kwargs: Any) -> _Response:  # noqa: ANN401
+        return _Response()
+
+    monkeypatch.setattr(requests, 'get', get)
+    return Java()
+
+
+def _publish_sha1(monkeypatch: pytest.MonkeyPatch, sha1: str | None) -> None:
+    def get_url(self: Java, _version: str) -> str:
+        self.jar_sha1 = sha1
+        return 'https://example.com/client.jar'
+
+    monkeypatch.setattr(Java, '_get_client_jar_url', get_url)
+
+
+@pytest.mark.parametrize('sha1', [hashlib.sha1(CONTENTS).hexdigest(), None])  # noqa: S324
+def test_fetch_verifies_checksum(
+    java: Java, monkeypatch: pytest.MonkeyPatch, sha1: str | None
+) -> None:
+    _publish_sha1(monkeypatch, sha1)
+    assert java._fetch_client_jar('1.21').read() == CONTENTS
+
+
+def test_fetch_rejects_checksum_mismatch(java: Java, monkeypatch: pytest.MonkeyPatch) -> None:
+    _publish_sha1(monkeypatch, hashlib.sha1(b'other').hexdigest())  # noqa: S324
+    with pytest.raises(ValueError, match='Checksum of https://example.com/client.jar'):
+        java._fetch_client_jar('1.21')
@@ -0,0 +1,54 @@
+import logging
+from collections.abc import Callable
+from io import BytesIO
+from pathlib import Path
+from shutil import copyfile
+
+import pytest
+
+from textureminer import DEFAULTS, Java
+from textureminer.logger import BatchQueueListener
+
+
+@pytest.fixture
+def cache_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Use an empty cache directory in the temporary directory of the test."""
+    cache = tmp_path / 'cache'
+    cache.mkdir()
+    monkeypatch.setitem(DEFAULTS, 'CACHE_DIR', cache)
+    return cache
+
+
+@pytest.fixture
+def stop_listener() -> Callable[[logging.Logger], None]:
+    """Stop the queue listeners of a logger, so every record it queued has been written."""
+
+    def stop(logger: logging.Logger) -> None:
+        for handler in logger.handlers:
+            listener = getattr(handler, 'listener', None)
+            if isinstance(listener, BatchQueueListener):
+                listener.stop()
+
+    return stop
+
+
+@pytest.fixture
+def client_jar(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Callable[[Path], Path]:
+    """Use a local .jar as the client .jar of every Java version instead of downloading it.
+
+    The latest version is 1.21 and the temporary files go to the temporary directory of the
+    test. The .jar is read on every use, so a test can change it between runs.
+    """
+    monkeypatch.setitem(DEFAULTS, 'TEMP_PATH', tmp_path / 'temp')
+    monkeypatch.setattr(Java, 'get_latest_version', lambda _self, _version_type: '1.21')
+
+    def use(jar: Path) -> Path:
+        def download(_self: Java, version: str, download_dir: Path) -> Path:
+            download_dir.mkdir(parents=True, exist_ok=True)
+            return Path(copyfile(jar, download_dir / f'{version}.jar'))
+
+        monkeypatch.setattr(Java, '_download_client_jar', download)
+        monkeypatch.setattr(Java, '_fetch_client_jar', lambda _self, _v: BytesIO(jar.read_bytes()))
+        return jar
+
+    return use
@@ -0,0 +1,42 @@
+import json
+from pathlib import Path
+
+from PIL import Image
+
+from textureminer import Edition
+
+
+def _save(path: Path, color: tuple[int, int, int, int], *, mode: str = 'RGBA') -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    Image.new('RGBA', (16, 16), color).convert(mode).save(path)
+
+
+def test_deduplicate_textures(tmp_path: Path) -> None:
+    _save(tmp_path / 'blocks' / 'copper_block.png', (200, 100, 50, 255))
+    _save(tmp_path / 'blocks' / 'waxed_copper_block.png', (200, 100, 50, 255), mode='RGB')
+    _save(tmp_path / 'items' / 'copper_block.png', (200, 100, 50, 255))
+    _save(tmp_path / 'blocks' / 'stone.png', (120, 120, 120, 255))
+
+    removed = Edition.deduplicate_textures(tmp_path)
+
+    assert removed == 2
+    assert (tmp_path / 'blocks' / 'copper_block.png').is_file()
+    assert not (tmp_path / 'blocks' / 'waxed_copper_block.png').exists()
+    assert not (tmp_path / 'items' / 'copper_block.png').exists()
+    assert (tmp_path / 'blocks' / 'stone.png').is_file()
+
+    aliases = json.loads((tmp_path / 'aliases.json').read_text(encoding='utf-8'))
+    assert aliases == {
+        'blocks/copper_block.png': 'blocks/copper_block.png',
+        'blocks/stone.png': 'blocks/stone.png',
+        'blocks/waxed_copper_block.png': 'blocks/copper_block.png',
+        'items/copper_block.png': 'blocks/copper_block.png',
+    }
+
+
+def test_deduplicate_textures_no_duplicates(tmp_path: Path) -> None:
+    _save(tmp_path / 'blocks' / 'dirt.png', (90, 60, 30, 255))
+    _save(tmp_path / 'blocks' / 'stone.png', (120, 120, 120, 255))
+
+    assert Edition.deduplicate_textures(tmp_path) == 0
+    assert len(list(tmp_path.rglob('*.png'))) == 2
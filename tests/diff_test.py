@@ -0,0 +1,93 @@
+import json
+from pathlib import Path
+
+import pytest
+from PIL import Image
+
+from textureminer import cli
+from textureminer.diff import HIGHLIGHT_COLOR, DiffStatus, diff_textures, write_report
+from textureminer.options import EditionType
+from textureminer.server import TextureServer
+
+STONE = (120, 120, 120, 255)
+DIRT = (130, 90, 60, 255)
+
+
+def _texture(path: Path, color: tuple[int, int, int, int], size: int = 16) -> Image.Image:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    img = Image.new('RGBA', (size, size), color)
+    img.save(path)
+    return img
+
+
+def _versions(tmp_path: Path) -> tuple[Path, Path]:
+    old, new = tmp_path / '1.21', tmp_path / '24w33a'
+    for root in (old, new):
+        _texture(root / 'blocks' / 'stone.png', STONE)
+    _texture(old / 'blocks' / 'dirt.png', DIRT)
+    _texture(old / 'items' / 'stick.png', DIRT)
+    _texture(old / 'items' / 'clock.png', DIRT)
+
+    dirt = _texture(new / 'blocks' / 'dirt.png', DIRT)
+    dirt.paste(STONE, (0, 0, 4, 2))
+    dirt.save(new / 'blocks' / 'dirt.png')
+    _texture(new / 'items' / 'clock.png', DIRT, size=32)
+    _texture(new / 'items' / 'wind_charge.png', STONE)
+    return old, new
+
+
+def test_diff_textures(tmp_path: Path) -> None:
+    old, new = _versions(tmp_path)
+
+    report = diff_textures(old, new, old='1.21', new='24w33a', image_dir=tmp_path / 'diff')
+
+    assert [(texture.name, texture.status) for texture in report.textures] == [
+        ('blocks/dirt.png', DiffStatus.CHANGED),
+        ('items/clock.png', DiffStatus.RESIZED),
+        ('items/stick.png', DiffStatus.REMOVED),
+        ('items/wind_charge.png', DiffStatus.ADDED),
+    ]
+    assert report.unchanged == 1
+
+    dirt = report.textures[0]
+    assert dirt.changed_pixels == 8
+    assert dirt.changed_ratio == 8 / 256
+    assert dirt.bbox == (0, 0, 4, 2)
+    assert dirt.max_difference == 60 / 255
+    with Image.open(tmp_path / 'diff' / 'blocks' / 'dirt.png') as highlighted:
+        assert highlighted.getpixel((0, 0)) == HIGHLIGHT_COLOR
+        assert highlighted.getpixel((8, 8)) != HIGHLIGHT_COLOR
+    assert not (tmp_path / 'diff' / 'blocks' / 'stone.png').exists()
+
+
+def test_diff_cli(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+) -> None:
+    versions = dict(zip(('1.21', '24w33a'), _versions(tmp_path), strict=True))
+    materialized: list[tuple[EditionType, str]] = []
+
+    def materialize(_self: TextureServer, edition: EditionType, version: str) -> Path:
+        materialized.append((edition, version))
+        return versions[version]
+
+    monkeypatch.setattr(TextureServer, 'materialize', materialize)
+
+    output = tmp_path / 'report'
+    with pytest.raises(SystemExit) as exit_info:
+        cli(['diff', '1.21', '24w33a', '-o', str(output), '--json'])
+
+    assert exit_info.value.code == 0
+    assert sorted(materialized) == [(EditionType.JAVA, '1.21'), (EditionType.JAVA, '24w33a')]
+    report = json.loads((output / 'report.json').read_text())
+    assert report['summary'] == {
+        'unchanged': 1,
+        'added': 1,
+        'removed': 1,
+        'changed': 1,
+        'resized': 1,
+    }
+    assert json.loads(capsys.readouterr().out) == report
+    page = (output / 'report.html').read_text()
+    assert 'src="diff/blocks/dirt.png"' in page
+    assert 'src="old/items/stick.png"' in page
+    assert (output / 'new' / 'items' / 'wind_charge.png').is_file()
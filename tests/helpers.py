@@ -0,0 +1,33 @@
+import json
+from collections.abc import Mapping
+from io import BytesIO
+from pathlib import Path
+from typing import Any
+from zipfile import ZipFile
+
+from PIL import Image
+
+
+def png(
+    color: tuple[int, int, int, int] = (120, 120, 120, 255),
+    size: tuple[int, int] = (16, 16),
+    **params: Any,  # noqa: ANN401
+) -> bytes:
+    """Encode a single colored image as PNG, with extra parameters for `Image.save`."""
+    buffer = BytesIO()
+    Image.new('RGBA', size, color).save(buffer, format='PNG', **params)
+    return buffer.getvalue()
+
+
+def make_jar(
+    path: Path,
+    textures: Mapping[str, bytes],
+    recipes: Mapping[str, Any] | None = None,
+) -> Path:
+    """Write a client .jar with textures under "assets/minecraft/textures" and recipes."""
+    with ZipFile(path, 'w') as jar:
+        for name, data in textures.items():
+            jar.writestr(f'assets/minecraft/textures/{name}', data)
+        for name, recipe in (recipes or {}).items():
+            jar.writestr(f'data/minecraft/recipe/{name}.json', json.dumps(recipe))
+    return path
@@ -0,0 +1,214 @@
+import hashlib
+from collections.abc import Callable
+from io import BytesIO
+from pathlib import Path
+
+import pytest
+from PIL import Image
+
+from tests.helpers import make_jar, png
+from textureminer import DEFAULTS, Bedrock, Java
+from textureminer.imaging import hash_pixels
+from textureminer.manifest import MANIFEST_FILE
+from textureminer.options import TextureOptions
+from textureminer.storage import MemoryStorage, Storage
+
+TEXTURES = {
+    'block/stone.png': png((120, 120, 120, 255)),
+    'block/oak_planks.png': png((160, 130, 80, 255)),
+    'block/snow.png': png((250, 250, 250, 255)),
+    'block/glass_pane_top.png': png((200, 220, 255, 100)),
+    'block/copper_block.png': png((190, 100, 70, 255)),
+    'block/waxed_copper_block.png': png((190, 100, 70, 255)),
+    'block/magma.png': png((200, 60, 20, 255), (16, 48)),
+    'block/candles/candle.png': png((230, 220, 180, 255)),
+    'block/stone.png.mcmeta': b'{}',
+    'block/magma.png.mcmeta': b'{"animation": {"frametime": 8}}',
+    'item/stick.png': png((100, 80, 40, 255)),
+    'item/stone.png': png((0, 0, 0, 255)),
+}
+RECIPES = {
+    'stone_slab': {'key': {'#': 'minecraft:stone'}},
+    'oak_stairs': {'key': {'#': 'minecraft:oak_planks'}},
+    'snow': {'key': {'#': 'minecraft:snow_block'}},
+}
+
+
+@pytest.fixture(autouse=True)
+def jar(tmp_path: Path, client_jar: Callable[[Path], Path]) -> Path:
+    return client_jar(make_jar(tmp_path / 'client.jar', TEXTURES, RECIPES))
+
+
+def _run(
+    tmp_path: Path,
+    options: TextureOptions,
+    *,
+    in_memory: bool,
+    output: Path | Storage | None = None,
+    max_memory: int | None = None,
+) -> Path | Storage:
+    with Java(in_memory=in_memory, max_memory=max_memory) as edition:
+        if output is None:
+            output = tmp_path / ('memory' if in_memory else 'disk')
+        result = edition.get_textures('1.21', output, options)
+        if in_memory:
+            assert not edition.temp_dir.exists()
+
+    assert result is not None
+    return result
+
+
+def _snapshot(root: Path) -> dict[str, str]:
+    return {
+        path.relative_to(root).as_posix(): hash_pixels(path)
+        if path.suffix == '.png'
+        else hashlib.sha256(path.read_bytes()).hexdigest()
+        for path in sorted(root.rglob('*'))
+        if path.is_file()
+    }
+
+
+@pytest.mark.parametrize(
+    'overrides',
+    [
+        {},
+        {'DO_MERGE': True, 'SCALE_FACTOR': 2},
+        {'SIMPLIFY_STRUCTURE': False, 'DO_CROP': False, 'DO_DEDUPLICATE': True},
+        {'ANIMATION_FORMAT': 'sheet', 'DO_MERGE': True},
+        {'ANIMATION_FORMAT': 'webp', 'SCALE_FACTOR': 2},
+    ],
+)
+def test_in_memory_matches_disk(tmp_path: Path, overrides: dict) -> None:
+    options: TextureOptions = {**DEFAULTS['TEXTURE_OPTIONS'], **overrides}  # type: ignore[typeddict-item]
+
+    disk = _run(tmp_path, options, in_memory=False)
+    memory = _run(tmp_path, options, in_memory=True)
+    assert isinstance(disk, Path)
+    assert isinstance(memory, Path)
+
+    expected = _snapshot(disk)
+    assert _snapshot(memory) == expected
+    assert expected  # the run produced textures
+    assert not list(tmp_path.glob('disk/.staging-*'))
+    if overrides.get('ANIMATION_FORMAT') == 'webp':
+        assert 'blocks/magma.webp' in expected
+    if overrides.get('ANIMATION_FORMAT') == 'sheet':
+        assert {'magma.sheet.png', 'magma.sheet.png.mcmeta'} <= expected.keys()
+
+
+@pytest.mark.parametrize(
+    'overrides',
+    [
+        {'SCALE_FACTOR': 4},
+        {'DO_DEDUPLICATE': True, 'ANIMATION_FORMAT': 'sheet'},
+    ],
+)
+def test_spilling_matches_disk(tmp_path: Path, overrides: dict) -> None:
+    options: TextureOptions = {**DEFAULTS['TEXTURE_OPTIONS'], **overrides}  # type: ignore[typeddict-item]
+
+    disk = _run(tmp_path, options, in_memory=False)
+    spilled = _run(tmp_path, options, in_memory=True, max_memory=64)
+    assert isinstance(disk, Path)
+    assert isinstance(spilled, Path)
+
+    assert _snapshot(spilled) == _snapshot(disk)
+
+
+@pytest.mark.parametrize('in_memory', [True, False])
+def test_publish_to_storage(tmp_path: Path, *, in_memory: bool) -> None:
+    options: TextureOptions = {**DEFAULTS['TEXTURE_OPTIONS'], 'DO_DEDUPLICATE': True}
+    storage = MemoryStorage()
+
+    disk = _run(tmp_path, options, in_memory=False)
+    published = _run(tmp_path, options, in_memory=in_memory, output=storage)
+
+    assert isinstance(disk, Path)
+    assert published.url == 'memory:///java/1.21'
+    assert sorted(storage.files) == sorted(
+        f'java/1.21/{path.relative_to(disk).as_posix()}'
+        for path in disk.rglob('*')
+        if path.is_file()
+    )
+
+
+@pytest.mark.parametrize('in_memory', [True, False])
+def test_options_without_optional_keys(tmp_path: Path, *, in_memory: bool) -> None:
+    options: TextureOptions = {
+        'DO_CROP': True,
+        'DO_MERGE': False,
+        'DO_PARTIALS': True,
+        'DO_REPLICATE': True,
+        'SIMPLIFY_STRUCTURE': True,
+        'SCALE_FACTOR': 1,
+    }
+
+    output = _run(tmp_path, options, in_memory=in_memory)
+
+    assert isinstance(output, Path)
+    assert (output / 'blocks' / 'stone.png').is_file()
+    assert not (output / 'aliases.json').exists()
+
+
+def test_interrupted_in_memory_keeps_previous(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    options: TextureOptions = {**DEFAULTS['TEXTURE_OPTIONS']}
+    previous = _run(tmp_path, options, in_memory=True)
+    assert isinstance(previous, Path)
+    expected = _snapshot(previous)
+
+    write_bytes = Path.write_bytes
+
+    def interrupted(path: Path, data: bytes) -> int:
+        if path.name == 'stone.png':
+            raise KeyboardInterrupt
+        return write_bytes(path, data)
+
+    monkeypatch.setattr(Path, 'write_bytes', interrupted)
+    with pytest.raises(KeyboardInterrupt):
+        _run(tmp_path, options, in_memory=True)
+
+    assert _snapshot(previous) == expected
+    assert not list((tmp_path / 'memory').glob('.staging-*'))
+
+
+def test_bedrock_in_memory_unsupported() -> None:
+    with pytest.raises(ValueError, match='not supported'):
+        Bedrock(in_memory=True)
+
+
+@pytest.mark.parametrize('in_memory', [True, False])
+@pytest.mark.parametrize('overrides', [{}, {'DO_MERGE': True, 'SCALE_FACTOR': 2}])
+def test_iter_textures_matches_disk(tmp_path: Path, overrides: dict, *, in_memory: bool) -> None:
+    options: TextureOptions = {**DEFAULTS['TEXTURE_OPTIONS'], **overrides}  # type: ignore[typeddict-item]
+    disk = _run(tmp_path, options, in_memory=False)
+    assert isinstance(disk, Path)
+
+    streamed = {}
+    with Java(in_memory=in_memory) as edition:
+        for category, name, texture in edition.iter_textures('1.21', options):
+            assert isinstance(texture, bytes)
+            assert (category == '') == options['DO_MERGE']
+            streamed['/'.join(filter(None, (category, name)))] = hash_pixels(BytesIO(texture))
+
+    # the manifest describes the written directory, it is not a texture
+    assert streamed == {name: d for name, d in _snapshot(disk).items() if name != MANIFEST_FILE}
+
+
+def test_iter_textures_decoded() -> None:
+    options: TextureOptions = {**DEFAULTS['TEXTURE_OPTIONS'], 'SCALE_FACTOR': 4}
+
+    with Java(in_memory=True) as edition:
+        textures = {
+            (category, name): texture
+            for category, name, texture in edition.iter_textures('1.21', options, decode=True)
+        }
+
+    assert {category for category, _ in textures} == {'blocks', 'items'}
+    stone = textures[('blocks', 'stone.png')]
+    assert isinstance(stone, Image.Image)
+    assert stone.size == (64, 64)
+    assert textures[('blocks', 'magma.png')].size == (64, 64)  # type: ignore[union-attr]
+
+    with pytest.raises(ValueError, match='Deduplication'):
+        next(edition.iter_textures('1.21', {**options, 'DO_DEDUPLICATE': True}))
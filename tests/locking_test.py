@@ -0,0 +1,67 @@
+import multiprocessing
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+from textureminer import DEFAULTS
+from textureminer.cache import cached_file, cached_json
+from textureminer.file import atomic_path, atomic_write
+
+
+def _create_entry(cache_dir: Path, log: Path) -> None:
+    DEFAULTS['CACHE_DIR'] = cache_dir
+
+    def create() -> dict:
+        with log.open('a') as f:
+            f.write('created\n')
+        time.sleep(0.2)
+        return {'value': 1}
+
+    assert cached_json('shared.json', create) == {'value': 1}
+
+
+@pytest.mark.skipif(not hasattr(os, 'fork'), reason='requires fork')
+def test_concurrent_processes_create_once(tmp_path: Path) -> None:
+    log = tmp_path / 'log.txt'
+    context = multiprocessing.get_context('fork')
+    processes = [
+        context.Process(target=_create_entry, args=(tmp_path / 'cache', log)) for _ in range(4)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join(timeout=30)
+
+    assert [process.exitcode for process in processes] == [0, 0, 0, 0]
+    assert log.read_text().splitlines() == ['created']
+
+
+def test_cached_file(cache_dir: Path) -> None:
+    calls = []
+
+    def create(path: Path) -> None:
+        calls.append(path)
+        path.mkdir()
+        (path / 'file.txt').write_text('content')
+
+    first = cached_file('entry', create)
+    second = cached_file('entry', create)
+
+    assert first == second == cache_dir / 'entry'
+    assert (first / 'file.txt').read_text() == 'content'
+    assert len(calls) == 1
+    assert calls[0] != first  # created under a temporary name
+
+
+def test_atomic_path_failure_keeps_previous(tmp_path: Path) -> None:
+    target = tmp_path / 'data.json'
+    atomic_write(target, b'old')
+
+    with pytest.raises(RuntimeError), atomic_path(target) as temp_path:
+        temp_path.write_bytes(b'partial')
+        raise RuntimeError
+
+    assert target.read_bytes() == b'old'
+    assert [path.name for path in tmp_path.iterdir()] == ['data.json']
@@ -0,0 +1,100 @@
+import json
+import logging
+import sys
+from collections.abc import Callable
+from io import StringIO
+
+import pytest
+
+from textureminer.logger import (
+    STATUS_LINE,
+    get_logger,
+    log_event,
+    log_stage,
+)
+
+
+def test_json_log_format(
+    capsys: pytest.CaptureFixture[str], stop_listener: Callable[[logging.Logger], None]
+) -> None:
+    logger = get_logger('textureminer', level=logging.DEBUG, log_format='json')
+    logger.info('Using %s', '1.21')
+    with log_stage('plan'):
+        log_event('texture', name='blocks/stone.png', bytes=42)
+    try:
+        raise ValueError('broken')  # noqa: TRY301
+    except ValueError:
+        logger.exception('Error: broken')
+    stop_listener(logger)
+
+    events = [json.loads(line) for line in capsys.readouterr().err.splitlines()]
+    assert [(event['level'], event['event']) for event in events] == [
+        ('info', 'message'),
+        ('debug', 'stage'),
+        ('debug', 'texture'),
+        ('debug', 'stage'),
+        ('error', 'message'),
+    ]
+    assert events[0]['message'] == 'Using 1.21'
+    assert events[1]['stage'] == 'plan'
+    assert events[1]['status'] == 'started'
+    assert events[2]['name'] == 'blocks/stone.png'
+    assert events[2]['bytes'] == 42
+    assert events[3]['status'] == 'finished'
+    assert events[3]['seconds'] >= 0
+    assert 'ValueError: broken' in events[4]['exception']
+
+
+def test_text_log_format(
+    capsys: pytest.CaptureFixture[str], stop_listener: Callable[[logging.Logger], None]
+) -> None:
+    logger = get_logger('textureminer', level=logging.INFO)
+    logger.info('Using %s', '1.21')
+    try:
+        raise ValueError('broken')  # noqa: TRY301
+    except ValueError:
+        logger.exception('Error: broken')
+    stop_listener(logger)
+
+    lines = capsys.readouterr().err.splitlines()
+    assert [line.rsplit(' ', 2)[-2:] for line in lines] == [['Using', '1.21'], ['Error:', 'broken']]
+
+
+def test_disabled_event_is_not_formatted(caplog: pytest.LogCaptureFixture) -> None:
+    class Field:
+        def __str__(self) -> str:
+            pytest.fail('a disabled event was formatted')
+
+    get_logger('textureminer', level=logging.INFO)
+    log_event('texture', name=Field())
+    logging.getLogger('textureminer').debug('%s', Field())
+
+    assert not caplog.records
+
+
+def test_records_keep_status_line(
+    capsys: pytest.CaptureFixture[str], stop_listener: Callable[[logging.Logger], None]
+) -> None:
+    logger = get_logger('textureminer', level=logging.INFO)
+    STATUS_LINE.draw('textures 1/2')
+    logger.info('Using %s', '1.21')
+    stop_listener(logger)
+    STATUS_LINE.draw('textures 2/2', final=True)
+
+    err = capsys.readouterr().err
+    # the line is cleared before the record and drawn again below it
+    assert err.startswith('\rtextures 1/2\033[K\r\033[K')
+    assert err.endswith('Using 1.21\n\rtextures 1/2\033[K\rtextures 2/2\033[K\n')
+    assert STATUS_LINE.text is None
+
+
+def test_writes_to_current_stderr(
+    monkeypatch: pytest.MonkeyPatch, stop_listener: Callable[[logging.Logger], None]
+) -> None:
+    logger = get_logger('textureminer', level=logging.INFO)
+    stream = StringIO()
+    monkeypatch.setattr(sys, 'stderr', stream)
+    logger.info('Using %s', '1.21')
+    stop_listener(logger)
+
+    assert stream.getvalue().endswith('Using 1.21\n')
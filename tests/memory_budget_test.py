@@ -0,0 +1,55 @@
+import threading
+import time
+from io import BytesIO
+
+from PIL import Image
+
+from textureminer.imaging import png_size, texture_footprint
+from textureminer.parallel import MemoryBudget, thread_map
+
+
+def test_png_size() -> None:
+    buffer = BytesIO()
+    Image.new('RGBA', (512, 1024)).save(buffer, format='PNG')
+
+    assert png_size(buffer.getvalue()[:24]) == (512, 1024)
+    assert png_size(b'{"animation": {}}') is None
+    assert texture_footprint(buffer.getvalue(), 2) == 4 * 512 * 1024 * 5
+
+
+def test_budget_limits_concurrent_work() -> None:
+    budget = MemoryBudget(100)
+    running: list[int] = []
+    lock = threading.Lock()
+
+    def work(cost: int) -> int:
+        with lock:
+            running.append(cost)
+            assert sum(running) <= budget.limit
+        time.sleep(0.01)
+        with lock:
+            running.remove(cost)
+        return cost
+
+    costs = [40, 40, 40, 30, 30, 60, 10, 10]
+    assert thread_map(work, costs, max_workers=8, budget=budget, cost=lambda c: c) == costs
+    assert budget.peak <= budget.limit
+
+
+def test_oversized_task_runs_alone() -> None:
+    budget = MemoryBudget(100)
+    overlapped: list[bool] = []
+    active = threading.Semaphore(0)
+
+    def work(cost: int) -> None:
+        if cost > budget.limit:
+            overlapped.append(active.acquire(blocking=False))
+        else:
+            active.release()
+            time.sleep(0.01)
+            active.acquire()
+
+    thread_map(work, [10, 500, 10, 10], max_workers=4, budget=budget, cost=lambda c: c)
+
+    assert overlapped == [False]
+    assert budget.peak == budget.limit
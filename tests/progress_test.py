@@ -0,0 +1,71 @@
+import json
+import logging
+import time
+from collections.abc import Callable
+
+import pytest
+
+from textureminer import progress
+from textureminer.logger import get_logger
+from textureminer.progress import Progress, configure_progress, track
+
+
+def test_auto_mode_without_terminal(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(progress, '_mode', 'off')
+
+    configure_progress('auto')
+    assert progress._mode == 'lines'  # noqa: SLF001
+    configure_progress('auto', json_log=True)
+    assert progress._mode == 'lines'  # noqa: SLF001
+
+
+def test_progress_lines_while_stalled(
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture[str],
+    stop_listener: Callable[[logging.Logger], None],
+) -> None:
+    monkeypatch.setattr(progress, '_mode', 'lines')
+    monkeypatch.setattr(progress, 'LINE_INTERVAL', 0.01)
+    logger = get_logger('textureminer', level=logging.INFO, log_format='json')
+
+    with Progress('textures', 4) as task:
+        task.advance(2)
+        # lines keep coming while nothing advances, so a hung task is visible
+        time.sleep(0.2)
+        task.advance(2)
+    stop_listener(logger)
+
+    events = [json.loads(line) for line in capsys.readouterr().err.splitlines()]
+    assert all(event['event'] == 'progress' for event in events)
+    assert sum(1 for event in events if event['done'] == 2) >= 2
+    assert events[-1]['done'] == events[-1]['total'] == 4
+    assert events[-1]['finished'] is True
+    assert events[-1]['rate'] > 0
+    assert events[0]['eta'] is not None
+
+
+def test_progress_bar(monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]) -> None:
+    monkeypatch.setattr(progress, '_mode', 'bar')
+
+    assert list(track(range(3), 'scale')) == [0, 1, 2]
+    with Progress('download', unit='B') as download:
+        download.set_total(2 * 2**20)
+        download.advance(2**20)
+        # a second bar at the same time falls back to lines instead of drawing over the first
+        with Progress('textures') as textures:
+            assert textures._mode == 'lines'  # noqa: SLF001
+
+    err = capsys.readouterr().err
+    assert '\r    * scale [########################] 100% 3 files/3 files' in err
+    assert '\r    * download [############------------]  50% 1.0 MiB/2.0 MiB' in err
+    assert err.endswith('\033[K\n')
+
+
+def test_progress_off(monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]) -> None:
+    monkeypatch.setattr(progress, '_mode', 'off')
+
+    with Progress('textures', 2) as task:
+        task.advance(2)
+
+    assert task.done == 2
+    assert capsys.readouterr().err == ''
@@ -0,0 +1,56 @@
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from tests.helpers import make_jar
+from textureminer import Java
+
+
+@pytest.fixture
+def java() -> Iterator[Java]:
+    with Java() as edition:
+        edition.version = '1.21'
+        edition.jar_sha1 = 'da39a3ee5e6b4b0d3255bfef95601890afd80709'
+        yield edition
+
+
+RECIPES = {
+    'stone_slab': {'key': {'#': 'minecraft:stone'}},
+    'oak_stairs': {'key': {'#': {'item': 'minecraft:oak_planks'}}},
+    'white_carpet': {'ingredients': [{'item': 'minecraft:white_wool'}]},
+    'waxed_cut_copper_slab': {'key': {'#': 'minecraft:waxed_cut_copper'}},
+    'smooth_quartz_slab': {'key': {'#': 'minecraft:smooth_quartz'}},
+    'stone_slab_from_stone_stonecutting': {'ingredient': 'minecraft:stone'},
+    'dye_white_carpet': {'ingredients': ['minecraft:white_dye']},
+    'stone': {'ingredients': ['minecraft:cobblestone']},
+}
+TEXTURES = ('stone', 'oak_planks', 'white_wool', 'cut_copper', 'quartz_block_bottom')
+
+
+def _make_jar(path: Path) -> Path:
+    return make_jar(path, {f'block/{name}.png': b'' for name in TEXTURES}, RECIPES)
+
+
+def test_recipe_index_from_jar(tmp_path: Path, cache_dir: Path, java: Java) -> None:
+    jar = _make_jar(tmp_path / 'client.jar')
+
+    texture_dict = java._get_texture_dict(jar)  # noqa: SLF001
+
+    assert texture_dict == {
+        'stone_slab': 'stone',
+        'oak_stairs': 'oak_planks',
+        'white_carpet': 'white_wool',
+        'waxed_cut_copper_slab': 'cut_copper',
+        'smooth_quartz_slab': 'quartz_block_bottom',
+    }
+    assert len(list((cache_dir / 'recipes').glob(f'{java.jar_sha1}-*.json'))) == 1
+
+
+def test_recipe_index_cached(tmp_path: Path, cache_dir: Path, java: Java) -> None:
+    jar = _make_jar(tmp_path / 'client.jar')
+    expected = java._get_texture_dict(jar)  # noqa: SLF001
+
+    jar.unlink()
+
+    assert java._get_texture_dict(jar) == expected  # noqa: SLF001
@@ -0,0 +1,126 @@
+from collections.abc import Callable
+from io import BytesIO
+from pathlib import Path
+from zipfile import ZipFile
+
+import pytest
+from PIL import Image, ImageCms
+from PIL.PngImagePlugin import PngInfo
+
+from tests.helpers import make_jar, png
+from textureminer import DEFAULTS, Edition, Java
+from textureminer.file import REPRODUCIBLE_MTIME
+from textureminer.imaging import save_png
+from textureminer.storage import ZipStorage
+
+
+def _srgb_profile() -> bytes:
+    return ImageCms.ImageCmsProfile(ImageCms.createProfile('sRGB')).tobytes()
+
+
+def _comment() -> PngInfo:
+    info = PngInfo()
+    info.add_text('Comment', 'made by hand')
+    return info
+
+
+@pytest.fixture
+def jar(tmp_path: Path, client_jar: Callable[[Path], Path]) -> Path:
+    textures = {
+        'block/stone.png': png(
+            (120, 120, 120, 255), icc_profile=_srgb_profile(), pnginfo=_comment()
+        ),
+        'block/magma.png': png((200, 60, 20, 255), (16, 48)),
+        'item/stick.png': png((100, 80, 40, 255)),
+    }
+    return client_jar(make_jar(tmp_path / 'client.jar', textures))
+
+
+def _extract(output: Path) -> Path:
+    options = {**DEFAULTS['TEXTURE_OPTIONS'], 'SCALE_FACTOR': 2, 'REPRODUCIBLE': True}
+    with Java() as edition:
+        result = edition.get_textures('1.21', output, options)  # type: ignore[arg-type]
+    assert isinstance(result, Path)
+    return result
+
+
+def _tree(root: Path) -> dict[str, tuple[bytes, int]]:
+    return {
+        path.relative_to(root).as_posix(): (
+            path.read_bytes() if path.is_file() else b'',
+            path.stat().st_mtime_ns,
+        )
+        for path in sorted(root.rglob('*'))
+    }
+
+
+@pytest.mark.usefixtures('jar')
+def test_reproducible_output(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.delenv('SOURCE_DATE_EPOCH', raising=False)
+
+    first = _extract(tmp_path / 'first')
+    second = _extract(tmp_path / 'second')
+
+    assert _tree(first) == _tree(second)
+    assert {mtime for _data, mtime in _tree(first).values()} == {REPRODUCIBLE_MTIME * 10**9}
+    assert first.stat().st_mtime == REPRODUCIBLE_MTIME
+    with Image.open(first / 'blocks' / 'stone.png') as stone:
+        assert 'icc_profile' not in stone.info
+
+    monkeypatch.setenv('SOURCE_DATE_EPOCH', '1700000000')
+    third = _extract(tmp_path / 'third')
+    assert (third / 'blocks' / 'stone.png').stat().st_mtime == 1700000000
+
+
+@pytest.mark.usefixtures('jar')
+@pytest.mark.parametrize('in_memory', [True, False])
+def test_unchanged_textures_drop_metadata(tmp_path: Path, *, in_memory: bool) -> None:
+    options = {**DEFAULTS['TEXTURE_OPTIONS'], 'DO_CROP': False, 'REPRODUCIBLE': True}
+    with Java(in_memory=in_memory) as edition:
+        output = edition.get_textures('1.21', tmp_path / 'out', options)  # type: ignore[arg-type]
+    assert isinstance(output, Path)
+
+    with Image.open(output / 'blocks' / 'stone.png') as stone:
+        assert 'icc_profile' not in stone.info
+        assert 'Comment' not in stone.info
+
+
+def test_unscaled_textures_drop_metadata(tmp_path: Path) -> None:
+    (tmp_path / 'blocks').mkdir()
+    texture = tmp_path / 'blocks' / 'stone.png'
+    texture.write_bytes(png((120, 120, 120, 255), icc_profile=_srgb_profile(), pnginfo=_comment()))
+
+    Edition.scale_textures(tmp_path, 1, do_crop=False, reencode=True)
+
+    with Image.open(texture) as stone:
+        assert stone.info.keys().isdisjoint({'icc_profile', 'Comment'})
+
+
+def test_scaled_textures_drop_metadata(tmp_path: Path) -> None:
+    plain, tagged = tmp_path / 'plain', tmp_path / 'tagged'
+    for root, params in ((plain, {}), (tagged, {'icc_profile': _srgb_profile()})):
+        (root / 'blocks').mkdir(parents=True)
+        (root / 'blocks' / 'stone.png').write_bytes(png((120, 120, 120, 255), **params))
+        Edition.scale_textures(root, 2)
+
+    assert (plain / 'blocks' / 'stone.png').read_bytes() == (
+        tagged / 'blocks' / 'stone.png'
+    ).read_bytes()
+
+    buffer = BytesIO()
+    with Image.open(plain / 'blocks' / 'stone.png') as img:
+        save_png(img, buffer)
+    assert buffer.getvalue() == (plain / 'blocks' / 'stone.png').read_bytes()
+
+
+def test_zip_storage_is_reproducible(tmp_path: Path) -> None:
+    files = {'items/stick.png': b'stick', 'blocks/stone.png': b'stone', 'aliases.json': b'{}'}
+
+    with ZipStorage(tmp_path / 'first.zip') as archive:
+        archive.write_many(files)
+    with ZipStorage(tmp_path / 'second.zip') as archive:
+        archive.write_many(dict(reversed(files.items())))
+
+    assert (tmp_path / 'first.zip').read_bytes() == (tmp_path / 'second.zip').read_bytes()
+    with ZipFile(tmp_path / 'first.zip') as archive:
+        assert archive.namelist() == sorted(files)
@@ -0,0 +1,95 @@
+from collections.abc import Callable
+from pathlib import Path
+from zipfile import ZipFile
+
+import pytest
+from PIL import Image
+
+from tests.helpers import make_jar, png
+from textureminer import DEFAULTS, Bedrock, EditionType, Java
+from textureminer.options import TextureOptions
+from textureminer.resource_pack import ResourcePack
+
+STONE = (120, 120, 120, 255)
+PLANKS = (160, 130, 80, 255)
+TRANSPARENT = (255, 255, 255, 0)
+SIZE = (32, 32)
+
+
+def _make_java_pack(path: Path) -> Path:
+    with ZipFile(path, 'w') as pack:
+        pack.writestr('HD Pack/pack.mcmeta', '{"pack": {"pack_format": 34}}')
+        pack.writestr('HD Pack/assets/minecraft/textures/block/stone.png', png(STONE, SIZE))
+        pack.writestr('HD Pack/assets/minecraft/textures/block/oak_planks.png', png(PLANKS, SIZE))
+        pack.writestr(
+            'HD Pack/assets/minecraft/textures/block/glass_pane_top.png', png(STONE, SIZE)
+        )
+        pack.writestr('HD Pack/assets/minecraft/textures/item/stick.png', png(PLANKS, SIZE))
+        pack.writestr('HD Pack/assets/minecraft/textures/entity/pig.png', png(PLANKS, SIZE))
+        pack.writestr('HD Pack/assets/extra/textures/block/marble.png', png(STONE, SIZE))
+    return path
+
+
+def _textures(root: Path) -> list[str]:
+    return sorted(path.relative_to(root).as_posix() for path in root.rglob('*.png'))
+
+
+def test_detects_pack_edition(tmp_path: Path) -> None:
+    with ResourcePack(_make_java_pack(tmp_path / 'HD Pack.zip')) as pack:
+        assert pack.name == 'HD Pack'
+        assert pack.edition == EditionType.JAVA
+        assert sorted(pack.textures) == [
+            'blocks/extra/marble.png',
+            'blocks/glass_pane_top.png',
+            'blocks/oak_planks.png',
+            'blocks/stone.png',
+            'items/stick.png',
+        ]
+
+    bedrock = tmp_path / 'bedrock'
+    (bedrock / 'textures' / 'blocks').mkdir(parents=True)
+    (bedrock / 'textures' / 'blocks' / 'stone.png').write_bytes(png(STONE, SIZE))
+    with ResourcePack(bedrock) as pack:
+        assert pack.edition == EditionType.BEDROCK
+        assert pack.textures == {'blocks/stone.png': 'textures/blocks/stone.png'}
+
+    (tmp_path / 'empty').mkdir()
+    with pytest.raises(ValueError, match='No block or item textures'):
+        ResourcePack(tmp_path / 'empty')
+
+
+def test_java_pack_textures(tmp_path: Path, client_jar: Callable[[Path], Path]) -> None:
+    recipes = {
+        'stone_slab': {'key': {'#': 'minecraft:stone'}},
+        'oak_stairs': {'key': {'#': 'minecraft:oak_planks'}},
+    }
+    textures = {'block/stone.png': png(STONE), 'block/oak_planks.png': png(STONE)}
+    client_jar(make_jar(tmp_path / 'client.jar', textures, recipes))
+
+    options: TextureOptions = {**DEFAULTS['TEXTURE_OPTIONS'], 'SCALE_FACTOR': 2}
+    with Java() as edition:
+        output = edition.get_textures(_make_java_pack(tmp_path / 'HD Pack.zip'), tmp_path, options)
+
+    assert output == tmp_path / 'java' / 'HD Pack'
+    assert _textures(output) == [
+        'blocks/glass_pane.png',
+        'blocks/glass_pane_top.png',
+        'blocks/marble.png',
+        'blocks/oak_planks.png',
+        'blocks/oak_stairs.png',
+        'blocks/stone.png',
+        'blocks/stone_slab.png',
+        'items/stick.png',
+    ]
+    with Image.open(output / 'blocks' / 'stone_slab.png') as slab:
+        assert slab.size == (64, 64)
+        assert slab.getpixel((0, 31)) == TRANSPARENT
+        assert slab.getpixel((0, 32)) == STONE
+
+
+def test_pack_edition_mismatch(tmp_path: Path) -> None:
+    with (
+        Bedrock() as edition,
+        pytest.raises(ValueError, match='is for Java Edition'),
+    ):
+        edition.get_pack_textures(_make_java_pack(tmp_path / 'pack.zip'), tmp_path)
@@ -0,0 +1,78 @@
+import json
+from pathlib import Path
+
+import pytest
+from PIL import Image
+
+from textureminer import Edition, EditionType
+from textureminer.exceptions import FileFormatError
+from textureminer.rules import load_rules
+
+
+def test_bundled_rules() -> None:
+    java = load_rules(EditionType.JAVA)
+    bedrock = load_rules(EditionType.BEDROCK)
+
+    assert java.replicate['glass_pane_top'] == 'glass_pane'
+    assert bedrock.replicate['glass_pane_top_red'] == 'red_stained_glass_pane'
+    assert java.texture_exceptions['smooth_stone'] == 'smooth_stone_slab_side'
+    assert bedrock.texture_exceptions == {}
+    # common rules apply to every edition
+    assert java.overwrite == bedrock.overwrite == {'snow': 'snow_block'}
+    assert java.fingerprint != bedrock.fingerprint
+
+
+def test_rules_override(tmp_path: Path) -> None:
+    rules_file = tmp_path / 'rules.json'
+    rules_file.write_text(
+        json.dumps(
+            {
+                'common': {'overwrite': {'snow': None}},
+                'java': {'replicate': {'glass_pane_top': 'clear_pane', 'foo': 'bar'}},
+            }
+        ),
+        encoding='utf-8',
+    )
+
+    rules = load_rules(EditionType.JAVA, rules_file)
+
+    assert rules.replicate['glass_pane_top'] == 'clear_pane'
+    assert rules.replicate['foo'] == 'bar'
+    assert rules.replicate['red_stained_glass_pane_top'] == 'red_stained_glass_pane'
+    assert 'snow' not in rules.overwrite
+    assert rules.fingerprint != load_rules(EditionType.JAVA).fingerprint
+
+
+@pytest.mark.parametrize(
+    'rules',
+    [
+        {'java': {'unknown_table': {}}},
+        {'jav': {'replicate': {'foo': 'bar'}}},
+        {'common': {'replicate': ['foo', 'bar']}},
+        {'bedrock': {'overwrite': {'foo': 1}}},
+    ],
+)
+def test_rules_invalid(tmp_path: Path, rules: dict[str, object]) -> None:
+    rules_file = tmp_path / 'rules.json'
+    rules_file.write_text(json.dumps(rules), encoding='utf-8')
+
+    with pytest.raises(FileFormatError):
+        load_rules(EditionType.JAVA, rules_file)
+
+
+def test_rules_missing(tmp_path: Path) -> None:
+    with pytest.raises(FileFormatError):
+        load_rules(EditionType.JAVA, tmp_path / 'rules.json')
+
+
+def test_replicate_textures(tmp_path: Path) -> None:
+    for name in ('blocks/glass_pane_top.png', 'items/glass_pane_top.png', 'blocks/stone.png'):
+        (tmp_path / name).parent.mkdir(parents=True, exist_ok=True)
+        Image.new('RGBA', (16, 16)).save(tmp_path / name)
+
+    count = Edition.replicate_textures(tmp_path, {'glass_pane_top': 'glass_pane', 'dirt': 'mud'})
+
+    assert count == 2
+    assert (tmp_path / 'blocks' / 'glass_pane.png').is_file()
+    assert (tmp_path / 'items' / 'glass_pane.png').is_file()
+    assert not (tmp_path / 'blocks' / 'mud.png').exists()
@@ -0,0 +1,140 @@
+import threading
+from collections.abc import Iterator
+from io import BytesIO
+from pathlib import Path
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+from zipfile import ZipFile
+
+import pytest
+from PIL import Image
+
+from textureminer import EditionType
+from textureminer.server import ImageCache, TextureHTTPServer, TextureServer
+
+
+@pytest.fixture
+def textures(cache_dir: Path, monkeypatch: pytest.MonkeyPatch) -> TextureServer:  # noqa: ARG001
+    builds = []
+
+    def build(_self: TextureServer, edition: EditionType, version: str, path: Path) -> None:
+        builds.append((edition, version))
+        for name, color in (
+            ('blocks/stone', (120, 120, 120, 255)),
+            ('items/stick', (90, 60, 30, 255)),
+        ):
+            (path / name).parent.mkdir(parents=True, exist_ok=True)
+            Image.new('RGBA', (16, 16), color).save(path / f'{name}.png')
+
+    monkeypatch.setattr(TextureServer, '_build_version', build)
+    server = TextureServer()
+    server.builds = builds  # type: ignore[attr-defined]
+    return server
+
+
+@pytest.fixture
+def base_url(textures: TextureServer) -> Iterator[str]:
+    with TextureHTTPServer(('127.0.0.1', 0), textures) as server:
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        yield f'http://127.0.0.1:{server.server_address[1]}'
+        server.shutdown()
+
+
+def _get(url: str, headers: dict[str, str] | None = None) -> tuple[int, dict[str, str], bytes]:
+    try:
+        with urlopen(Request(url, headers=headers or {})) as response:  # noqa: S310
+            return response.status, dict(response.headers), response.read()
+    except HTTPError as err:
+        return err.code, dict(err.headers), b''
+
+
+def test_serve_texture(base_url: str, textures: TextureServer) -> None:
+    status, headers, body = _get(f'{base_url}/java/1.21/blocks/stone.png')
+    assert status == 200
+    assert headers['Content-Type'] == 'image/png'
+    assert 'immutable' in headers['Cache-Control']
+    assert Image.open(BytesIO(body)).size == (16, 16)
+
+    status, _, body = _get(
+        f'{base_url}/java/1.21/blocks/stone.png', {'If-None-Match': headers['ETag']}
+    )
+    assert status == 304
+    assert body == b''
+
+    assert textures.builds == [(EditionType.JAVA, '1.21')]  # type: ignore[attr-defined]
+
+
+def test_serve_rendered_texture(base_url: str, textures: TextureServer) -> None:
+    status, headers, body = _get(f'{base_url}/java/1.21/blocks/stone.png?scale=4&shape=slab')
+    assert status == 200
+    img = Image.open(BytesIO(body)).convert('RGBA')
+    assert img.size == (64, 64)
+    assert img.getpixel((0, 0))[3] == 0  # top half is cut away
+    assert img.getpixel((0, 63))[3] == 255
+
+    _, again, _ = _get(f'{base_url}/java/1.21/blocks/stone.png?scale=4&shape=slab')
+    _, other, _ = _get(f'{base_url}/java/1.21/blocks/stone.png?scale=2&shape=slab')
+    assert again['ETag'] == headers['ETag'] != other['ETag']
+    assert len(textures.images) == 1
+
+
+def test_serve_archive(base_url: str) -> None:
+    status, headers, body = _get(f'{base_url}/bedrock/1.21.0.3/items.zip')
+    assert status == 200
+    assert headers['Content-Type'] == 'application/zip'
+    with ZipFile(BytesIO(body)) as archive:
+        assert archive.namelist() == ['stick.png']
+
+
+@pytest.mark.parametrize(
+    ('path', 'status'),
+    [
+        ('/java/1.21/blocks/dirt.png', 404),
+        ('/java/1.21/../secret.png', 404),
+        ('/legacy/1.21/blocks/stone.png', 404),
+        ('/java/1.21/blocks/stone.png?scale=100', 400),
+        ('/java/1.21/blocks/stone.png?shape=circle', 400),
+        ('/java/not-a-version/blocks/stone.png', 400),
+    ],
+)
+def test_serve_errors(base_url: str, path: str, status: int) -> None:
+    assert _get(f'{base_url}{path}')[0] == status
+
+
+def test_serve_only_textures(tmp_path: Path, textures: TextureServer) -> None:
+    secret = tmp_path / 'secret' / 'secret.png'
+    secret.parent.mkdir()
+    Image.new('RGBA', (16, 16)).save(secret)
+    escaped = str(secret).replace('/', '%2F')
+
+    for url in (
+        f'/java/1.21/{escaped}',
+        f'/java/1.21/blocks%2F..%2F..%2F{escaped}',
+        '/java/1.21/blocks/..%2F..%2Fsecret.png',
+    ):
+        with pytest.raises(FileNotFoundError):
+            textures.handle(url)
+    with pytest.raises(FileNotFoundError):
+        textures.texture(EditionType.JAVA, '1.21', str(secret))
+
+    root = textures.materialize(EditionType.JAVA, '1.21')
+    (root / 'blocks' / 'link.png').symlink_to(secret)
+    with pytest.raises(FileNotFoundError):
+        textures.handle('/java/1.21/blocks/link.png')
+
+
+def test_image_cache_evicts_least_recently_used(tmp_path: Path) -> None:
+    cache = ImageCache(max_bytes=2 * 16 * 16 * 4)
+    paths = [tmp_path / f'{i}.png' for i in range(3)]
+
+    def load(path: Path) -> Image.Image:
+        return Image.new('RGBA', (16, 16))
+
+    cache.get(paths[0], load)
+    cache.get(paths[1], load)
+    cache.get(paths[0], load)
+    cache.get(paths[2], load)
+
+    assert len(cache) == 2
+    assert paths[1] not in cache._images  # noqa: SLF001
@@ -0,0 +1,75 @@
+from pathlib import Path
+
+import pytest
+from PIL import Image
+
+from textureminer.edition.Edition import BlockShape, Edition
+
+OPAQUE = (10, 20, 30, 255)
+TRANSPARENT = (255, 255, 255, 0)
+
+
+def _transparent_columns(img: Image.Image, row: int) -> list[int]:
+    return [x for x in range(img.width) if img.getpixel((x, row)) == TRANSPARENT]
+
+
+@pytest.mark.parametrize('size', [16, 32, 64, 512])
+def test_shapes_scale_with_resolution(size: int) -> None:
+    img = Image.new('RGBA', (size, size), OPAQUE)
+    unit = size // 16
+
+    slab = Edition.crop_image(img, BlockShape.SLAB)
+    assert slab.getpixel((0, 8 * unit - 1)) == TRANSPARENT
+    assert slab.getpixel((size - 1, 8 * unit)) == OPAQUE
+
+    stair = Edition.crop_image(img, BlockShape.STAIR)
+    assert _transparent_columns(stair, 0) == list(range(8 * unit, size))
+    assert _transparent_columns(stair, 8 * unit) == []
+
+    carpet = Edition.crop_image(img, BlockShape.CARPET)
+    assert carpet.getpixel((0, 15 * unit - 1)) == TRANSPARENT
+    assert carpet.getpixel((0, 15 * unit)) == OPAQUE
+
+    pane = Edition.crop_image(img, BlockShape.GLASS_PANE)
+    assert [x for x in range(size) if x not in _transparent_columns(pane, 0)] == list(
+        range(7 * unit, 9 * unit)
+    )
+
+
+def test_square_crops_first_frame() -> None:
+    img = Image.new('RGBA', (32, 96), OPAQUE)
+    assert Edition.crop_image(img, BlockShape.SQUARE).size == (32, 32)
+
+
+def test_square_crops_wide_texture() -> None:
+    img = Image.new('RGBA', (32, 16), OPAQUE)
+    square = Edition.crop_image(img, BlockShape.SQUARE)
+    assert square.size == (16, 16)
+    assert square.getextrema()[3] == (255, 255)  # nothing is padded with transparent pixels
+
+
+def test_shape_mask_is_cached() -> None:
+    assert Edition.shape_mask(BlockShape.SLAB, 32, 32) is Edition.shape_mask(
+        BlockShape.SLAB, 32, 32
+    )
+    assert Edition.shape_mask(BlockShape.SLAB, 32, 32) is not Edition.shape_mask(
+        BlockShape.SLAB, 64, 64
+    )
+
+
+def test_crop_textures_reads_before_writing(tmp_path: Path) -> None:
+    stone = tmp_path / 'stone.png'
+    Image.new('RGBA', (32, 32), OPAQUE).save(stone)
+
+    Edition.crop_textures(
+        [
+            (stone, BlockShape.SNOW, stone),
+            (stone, BlockShape.SLAB, tmp_path / 'stone_slab.png'),
+        ]
+    )
+
+    with Image.open(tmp_path / 'stone_slab.png') as slab:
+        assert slab.getpixel((0, 16)) == OPAQUE  # cut from the original, not the snow layer
+    with Image.open(stone) as snow:
+        assert snow.getpixel((0, 27)) == TRANSPARENT
+        assert snow.getpixel((0, 28)) == OPAQUE
@@ -0,0 +1,56 @@
+from pathlib import Path
+
+from textureminer import Edition, EditionType
+from textureminer.file import replace_dir
+
+
+def _touch(path: Path, data: bytes = b'') -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+    return path
+
+
+def test_filter_copies_only_png(tmp_path: Path) -> None:
+    textures = tmp_path / 'repo' / 'resource_pack' / 'textures'
+    _touch(textures / 'blocks' / 'stone.png')
+    _touch(textures / 'blocks' / 'stone.texture_set.json')
+    _touch(textures / 'blocks' / 'candles' / 'candle.png')
+    _touch(textures / 'items' / 'stick.png')
+    _touch(textures / 'items' / 'stick.tga')
+
+    output = Edition.filter_unwanted(tmp_path / 'repo', tmp_path / 'out', EditionType.BEDROCK)
+
+    assert sorted(path.relative_to(output).as_posix() for path in output.rglob('*.*')) == [
+        'blocks/candles/candle.png',
+        'blocks/stone.png',
+        'items/stick.png',
+    ]
+
+
+def test_merge_renames_with_item_priority(tmp_path: Path) -> None:
+    block = _touch(tmp_path / 'blocks' / 'stone.png', b'block')
+    candle = _touch(tmp_path / 'blocks' / 'candles' / 'candle.png', b'candle')
+    _touch(tmp_path / 'items' / 'stone.png', b'item')
+    candle_inode = candle.stat().st_ino
+
+    Edition.merge_dirs(tmp_path, tmp_path)
+
+    assert not block.exists()
+    assert not (tmp_path / 'blocks').exists()
+    assert not (tmp_path / 'items').exists()
+    assert (tmp_path / 'stone.png').read_bytes() == b'item'
+    assert (tmp_path / 'candles' / 'candle.png').stat().st_ino == candle_inode
+
+
+def test_replace_dir(tmp_path: Path) -> None:
+    _touch(tmp_path / 'out' / 'old.png')
+    new = _touch(tmp_path / 'out' / '.staging' / 'java' / '1.21' / 'new.png')
+
+    replace_dir(new.parent, tmp_path / 'out' / 'java' / '1.21')
+    _touch(tmp_path / 'out' / '.staging' / 'java' / '1.21' / 'newer.png')
+    replace_dir(tmp_path / 'out' / '.staging' / 'java' / '1.21', tmp_path / 'out' / 'java' / '1.21')
+
+    assert sorted(path.name for path in (tmp_path / 'out' / 'java' / '1.21').iterdir()) == [
+        'newer.png'
+    ]
+    assert (tmp_path / 'out' / 'old.png').exists()
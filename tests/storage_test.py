@@ -0,0 +1,109 @@
+from io import BytesIO
+from pathlib import Path
+from zipfile import ZipFile
+
+import pytest
+
+from textureminer.storage import (
+    LocalStorage,
+    MemoryStorage,
+    S3Storage,
+    ZipStorage,
+    open_storage,
+)
+
+
+class FakeS3Client:
+    """Minimal S3 compatible stand-in, like a local MinIO server, keeping objects in memory."""
+
+    def __init__(self) -> None:
+        self.objects: dict[tuple[str, str], bytes] = {}
+        self.content_types: dict[str, str] = {}
+        self.delete_calls = 0
+
+    def put_object(self, *, Bucket: str, Key: str, Body: bytes, ContentType: str) -> None:  # noqa: N803
+        self.objects[(Bucket, Key)] = Body
+        self.content_types[Key] = ContentType
+
+    def get_object(self, *, Bucket: str, Key: str) -> dict:  # noqa: N803
+        return {'Body': BytesIO(self.objects[(Bucket, Key)])}
+
+    def delete_objects(self, *, Bucket: str, Delete: dict) -> None:  # noqa: N803
+        self.delete_calls += 1
+        for item in Delete['Objects']:
+            del self.objects[(Bucket, item['Key'])]
+
+    def get_paginator(self, _name: str) -> 'FakeS3Client':
+        return self
+
+    def paginate(self, *, Bucket: str, Prefix: str) -> list[dict]:  # noqa: N803
+        keys = sorted(
+            key for bucket, key in self.objects if bucket == Bucket and key.startswith(Prefix)
+        )
+        return [
+            {'Contents': [{'Key': key} for key in keys[i : i + 2]]} for i in range(0, len(keys), 2)
+        ]
+
+
+FILES = {'blocks/stone.png': b'stone', 'items/stick.png': b'stick', 'aliases.json': b'{}'}
+
+
+def test_open_storage(tmp_path: Path) -> None:
+    assert isinstance(open_storage(tmp_path), LocalStorage)
+    assert isinstance(open_storage(tmp_path.as_posix()), LocalStorage)
+    assert open_storage(f'file://{tmp_path.as_posix()}').url == tmp_path.as_posix()
+    with open_storage(tmp_path / 'out.zip') as archive:
+        assert isinstance(archive, ZipStorage)
+    assert isinstance(open_storage('memory://textures'), MemoryStorage)
+    assert open_storage('memory://textures').prefix == 'textures'
+    with pytest.raises(ValueError, match='Unsupported storage'):
+        open_storage('ftp://example.com/textures')
+
+
+@pytest.mark.parametrize('backend', ['local', 'memory', 's3'])
+def test_storage_roundtrip(tmp_path: Path, backend: str) -> None:
+    storage = {
+        'local': lambda: LocalStorage(tmp_path),
+        'memory': MemoryStorage,
+        's3': lambda: S3Storage('bucket', 'prefix', client=FakeS3Client()),
+    }[backend]()
+
+    java = storage / 'java' / '1.21'
+    java.write_many(FILES)
+    (storage / 'bedrock').write('blocks/dirt.png', b'dirt')
+
+    assert java.list() == sorted(FILES)
+    assert java.read('blocks/stone.png') == b'stone'
+
+    java.clear()
+    assert java.list() == []
+    assert (storage / 'bedrock').list() == ['blocks/dirt.png']
+
+
+def test_s3_storage_batches(tmp_path: Path) -> None:
+    client = FakeS3Client()
+    storage = S3Storage('bucket', 'textures', client=client)
+    storage.DELETE_BATCH_SIZE = 2  # type: ignore[misc]
+
+    for name, data in FILES.items():
+        path = tmp_path / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+
+    assert storage.put_tree(tmp_path) == len(FILES)
+    assert client.content_types['textures/blocks/stone.png'] == 'image/png'
+    assert client.content_types['textures/aliases.json'] == 'application/json'
+
+    storage.clear()
+    assert client.objects == {}
+    assert client.delete_calls == 2
+
+
+def test_zip_storage(tmp_path: Path) -> None:
+    archive = tmp_path / 'textures.zip'
+    with open_storage(f'zip://{archive.as_posix()}') as storage:
+        (storage / 'java' / '1.21').write_many(FILES)
+
+    with ZipFile(archive) as zip_file:
+        assert sorted(zip_file.namelist()) == sorted(f'java/1.21/{name}' for name in FILES)
+        assert zip_file.read('java/1.21/items/stick.png') == b'stick'
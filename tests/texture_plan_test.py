@@ -0,0 +1,110 @@
+import logging
+from collections.abc import Callable
+from pathlib import Path
+
+import pytest
+
+from tests.helpers import make_jar, png
+from textureminer import DEFAULTS, BlockShape, cli
+from textureminer.imaging import PNG_HEADER_SIZE
+from textureminer.options import TextureOptions
+from textureminer.textures import TextureOp, TexturePlan
+
+
+class HeaderOnlySource:
+    """Fails if more than the header of a texture is read."""
+
+    def __init__(self, files: dict[str, bytes]) -> None:
+        self.files = files
+
+    def read(self, member: str, size: int = -1) -> bytes:
+        assert size == PNG_HEADER_SIZE
+        return self.files[member][:size]
+
+
+GRAY = (90, 90, 90, 255)
+
+SOURCES = {
+    'blocks/stone.png': 'block/stone.png',
+    'blocks/candles/candle.png': 'block/candles/candle.png',
+    'blocks/glass_pane_top.png': 'block/glass_pane_top.png',
+    'items/stone.png': 'item/stone.png',
+}
+
+
+def test_plan_without_decoding() -> None:
+    options: TextureOptions = {**DEFAULTS['TEXTURE_OPTIONS'], 'SCALE_FACTOR': 2}
+    plan = TexturePlan.from_sources(SOURCES, options)
+
+    plan.replicate({'glass_pane_top': 'glass_pane'})
+    plan.add_partials(
+        [
+            ('blocks/stone.png', BlockShape.SLAB, 'blocks/stone_slab.png'),
+            ('blocks/missing.png', BlockShape.STAIR, 'blocks/missing_stairs.png'),
+        ]
+    )
+    plan.simplify_structure()
+    plan.merge()
+
+    assert plan.textures == {
+        'candle.png': TextureOp('block/candles/candle.png'),
+        'glass_pane.png': TextureOp('block/glass_pane_top.png'),
+        'glass_pane_top.png': TextureOp('block/glass_pane_top.png'),
+        'stone_slab.png': TextureOp('block/stone.png', BlockShape.SLAB),
+        'stone.png': TextureOp('item/stone.png'),
+    }
+
+    source = HeaderOnlySource(
+        {
+            'block/stone.png': png(GRAY, (16, 16)),
+            'block/candles/candle.png': png(GRAY, (16, 16)),
+            'block/glass_pane_top.png': png(GRAY, (16, 48)),
+            'item/stone.png': png(GRAY, (32, 32)),
+        }
+    )
+    estimate = plan.estimate(source, lambda _name: 100)
+
+    assert estimate.textures == 5
+    assert estimate.sources == 4
+    assert estimate.partials == 1
+    assert estimate.source_bytes == 400
+    assert estimate.output_bytes == 5 * 100 * 4
+    # the glass pane strip is cropped to a square before scaling
+    assert estimate.pixel_bytes == 4 * (4 * 32 * 32 + 64 * 64)
+    assert estimate.peak_bytes == 4 * (32 * 32 + 64 * 64)
+
+
+def test_output_size_of_non_square_textures() -> None:
+    plan = TexturePlan(scale_factor=2)
+    assert plan.output_size(png(GRAY, (32, 16))) == (32, 32)
+    assert plan.output_size(png(GRAY, (16, 48))) == (32, 32)
+    assert TexturePlan(do_crop=False).output_size(png(GRAY, (32, 16))) == (32, 16)
+
+
+def test_dry_run(
+    tmp_path: Path, client_jar: Callable[[Path], Path], caplog: pytest.LogCaptureFixture
+) -> None:
+    pack = make_jar(
+        tmp_path / 'pack.zip',
+        {'block/stone.png': png(GRAY, (64, 64)), 'item/stick.png': png(GRAY, (64, 64))},
+    )
+    client_jar(
+        make_jar(
+            tmp_path / 'client.jar',
+            {'block/stone.png': png(GRAY)},
+            {'stone_slab': {'key': {'#': 'stone'}}},
+        )
+    )
+
+    with (
+        caplog.at_level(logging.INFO, logger='textureminer'),
+        pytest.raises(SystemExit) as exit_info,
+    ):
+        cli(['--pack', str(pack), '--dry-run', '--scale', '2', '-o', str(tmp_path / 'out')])
+
+    assert exit_info.value.code == 0
+    assert any(
+        'Planned 3 textures from 2 sources, 1 of them partial.' in message
+        for message in caplog.messages
+    )
+    assert not (tmp_path / 'out').exists()
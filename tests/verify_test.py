@@ -0,0 +1,105 @@
+import json
+from collections.abc import Callable
+from pathlib import Path
+
+import pytest
+from PIL import Image
+
+from tests.helpers import make_jar, png
+from textureminer import DEFAULTS, Java, cli
+from textureminer.manifest import (
+    MANIFEST_FILE,
+    ProblemKind,
+    options_fingerprint,
+    read_manifest,
+    verify_manifest,
+)
+from textureminer.resource_pack import ResourcePack
+
+TEXTURES = {
+    'block/stone.png': png((120, 120, 120, 255)),
+    'block/dirt.png': png((130, 90, 60, 255)),
+    'item/stick.png': png((100, 80, 40, 255)),
+}
+
+
+@pytest.fixture
+def jar(tmp_path: Path, client_jar: Callable[[Path], Path]) -> Path:
+    return client_jar(make_jar(tmp_path / 'client.jar', TEXTURES))
+
+
+def _extract(tmp_path: Path, *, in_memory: bool = False) -> Path:
+    options = {**DEFAULTS['TEXTURE_OPTIONS'], 'SCALE_FACTOR': 2}
+    with Java(in_memory=in_memory) as edition:
+        output = edition.get_textures('1.21', tmp_path / 'out', options)  # type: ignore[arg-type]
+    assert isinstance(output, Path)
+    return output
+
+
+@pytest.mark.parametrize('in_memory', [True, False])
+def test_manifest_records_output(tmp_path: Path, jar: Path, *, in_memory: bool) -> None:
+    output = _extract(tmp_path, in_memory=in_memory)
+
+    manifest = read_manifest(output)
+    assert manifest.edition == 'java'
+    assert manifest.version == '1.21'
+    assert manifest.fingerprint == options_fingerprint(manifest.options)
+    assert manifest.options['SCALE_FACTOR'] == 2
+    stone = manifest.files['blocks/stone.png']
+    assert stone.size == (32, 32)
+    assert stone.source == 'assets/minecraft/textures/block/stone.png'
+    assert MANIFEST_FILE not in manifest.files
+
+    with ResourcePack(jar) as source:
+        assert verify_manifest(output, source=source) == []
+
+
+def test_verify_finds_problems(tmp_path: Path, jar: Path) -> None:
+    output = _extract(tmp_path)
+
+    (output / 'blocks' / 'dirt.png').unlink()
+    Image.new('RGBA', (16, 16), (0, 0, 0, 255)).save(output / 'blocks' / 'stone.png')
+    (output / 'items' / 'stick.png').write_bytes(b'not a png')
+    (output / 'items' / 'extra.png').write_bytes(png((0, 0, 0, 255)))
+    # a different .jar than the one the textures were made from
+    make_jar(jar, {**TEXTURES, 'item/stick.png': png((0, 0, 0, 255))})
+
+    with ResourcePack(jar) as source:
+        problems = verify_manifest(output, source=source, fingerprint='0' * 64)
+
+    assert [(problem.name, problem.kind) for problem in problems] == [
+        (MANIFEST_FILE, ProblemKind.OPTIONS),
+        ('blocks/dirt.png', ProblemKind.MISSING),
+        ('blocks/stone.png', ProblemKind.HASH),
+        ('blocks/stone.png', ProblemKind.SIZE),
+        ('items/stick.png', ProblemKind.HASH),
+        ('items/stick.png', ProblemKind.SIZE),
+        ('items/stick.png', ProblemKind.SOURCE),
+        ('items/extra.png', ProblemKind.UNEXPECTED),
+    ]
+    assert str(problems[3]) == 'size blocks/stone.png expected 32x32 actual 16x16'
+    assert problems[5].actual is None
+
+
+@pytest.mark.usefixtures('jar')
+def test_verify_cli(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    output = _extract(tmp_path)
+
+    with pytest.raises(SystemExit) as exit_info:
+        cli(['verify', str(output)])
+    assert exit_info.value.code == 0
+    assert capsys.readouterr().out == ''
+
+    manifest = json.loads((output / MANIFEST_FILE).read_text())
+    manifest['options']['SCALE_FACTOR'] = 4
+    (output / MANIFEST_FILE).write_text(json.dumps(manifest))
+    (output / 'blocks' / 'dirt.png').unlink()
+
+    with pytest.raises(SystemExit) as exit_info:
+        cli(['verify', str(output), '--json'])
+    assert exit_info.value.code == 1
+    problems = json.loads(capsys.readouterr().out)
+    assert [(problem['name'], problem['kind']) for problem in problems] == [
+        (MANIFEST_FILE, 'options'),
+        ('blocks/dirt.png', 'missing'),
+    ]
@@ -0,0 +1,98 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from textureminer import Java, VersionKind, cli
+from textureminer.version_index import VersionIndex
+
+MANIFEST = {
+    'latest': {'release': '1.21.1', 'snapshot': '1.21.1'},
+    'versions': [
+        {'id': '1.21.1', 'type': 'release', 'releaseTime': '2024-08-08T12:24:45+00:00'},
+        {'id': '1.21', 'type': 'release', 'releaseTime': '2024-06-13T08:24:03+00:00'},
+        {'id': '1.21-rc1', 'type': 'snapshot', 'releaseTime': '2024-06-10T12:30:42+00:00'},
+        {'id': '1.21-pre1', 'type': 'snapshot', 'releaseTime': '2024-05-29T12:10:47+00:00'},
+        {'id': '24w21a', 'type': 'snapshot', 'releaseTime': '2024-05-22T12:45:05+00:00'},
+        {'id': '24w14potato', 'type': 'snapshot', 'releaseTime': '2024-04-01T12:00:00+00:00'},
+        {'id': '24w18a', 'type': 'snapshot', 'releaseTime': '2024-05-03T11:12:44+00:00'},
+        {'id': '1.20.4', 'type': 'release', 'releaseTime': '2023-12-07T12:56:20+00:00'},
+        {'id': 'b1.7.3', 'type': 'old_beta', 'releaseTime': '2011-07-07T22:00:00+00:00'},
+    ],
+}
+
+
+def _ids(entries: list) -> list[str]:
+    return [entry.version.name for entry in entries]
+
+
+def test_java_index_since_version() -> None:
+    index = VersionIndex.from_java_manifest(MANIFEST)
+
+    assert len(index) == 7  # april fools and beta versions are skipped
+    assert _ids(index.query(since='24w21a')) == [
+        '24w21a',
+        '1.21-pre1',
+        '1.21-rc1',
+        '1.21',
+        '1.21.1',
+    ]
+    assert _ids(index.query(since='24w18a', until='1.21-pre1')) == ['24w18a', '24w21a', '1.21-pre1']
+
+
+def test_java_index_time_window() -> None:
+    index = VersionIndex.from_java_manifest(MANIFEST)
+    stable = {VersionKind.RELEASE}
+
+    assert _ids(index.query(since='2024', until='2024', kinds=stable)) == ['1.21', '1.21.1']
+    assert _ids(index.query(since='2023', until='2023')) == ['1.20.4']
+    assert _ids(index.query(since='2024-06', until='2024-06')) == ['1.21-rc1', '1.21']
+    assert _ids(index.query(until='2024-06-13')) == _ids(index.query(until='1.21'))
+
+
+def test_java_index_last() -> None:
+    index = VersionIndex.from_java_manifest(MANIFEST)
+    snapshots = {VersionKind.SNAPSHOT}
+
+    assert _ids(index.query(kinds=snapshots, last=1)) == ['24w21a']
+    assert _ids(index.query(last=2)) == ['1.21', '1.21.1']
+    assert index.query(last=0) == []
+
+
+def test_java_index_unknown_version() -> None:
+    index = VersionIndex.from_java_manifest(MANIFEST)
+
+    with pytest.raises(ValueError, match='not found'):
+        index.query(since='1.19')
+    with pytest.raises(ValueError, match='Invalid version'):
+        index.query(since='foo')
+
+
+def test_bedrock_index() -> None:
+    tags = ['v1.21.0.3', 'v1.21.0.20-preview', 'v1.21.2.2', 'v1.20.80.5', 'not-a-version']
+    index = VersionIndex.from_bedrock_tags(tags)
+
+    assert _ids(index.query()) == ['v1.20.80.5', 'v1.21.0.20-preview', 'v1.21.0.3', 'v1.21.2.2']
+    assert _ids(index.query(since='1.21.0.0')) == ['v1.21.0.3', 'v1.21.2.2']
+    assert _ids(index.query(kinds={VersionKind.PREVIEW}, last=10)) == ['v1.21.0.20-preview']
+    with pytest.raises(ValueError, match='Release times'):
+        index.query(since='2024')
+
+
+def test_versions_cli(
+    cache_dir: Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture
+) -> None:
+    monkeypatch.setattr(Java, 'version_manifest_cache', None)
+    (cache_dir / Java.VERSION_MANIFEST_CACHE).write_text(json.dumps(MANIFEST), encoding='utf-8')
+
+    with pytest.raises(SystemExit) as excinfo:
+        cli(['versions', '--java', '--since', '2024', '--type', 'stable', '--json'])
+    assert excinfo.value.code == 0
+    out, _ = capsys.readouterr()
+    assert [version['id'] for version in json.loads(out)] == ['1.21', '1.21.1']
+
+    with pytest.raises(SystemExit) as excinfo:
+        cli(['versions', '--type', 'pre', '--type', 'rc'])
+    assert excinfo.value.code == 0
+    out, _ = capsys.readouterr()
+    assert out.splitlines() == ['1.21-pre1', '1.21-rc1']
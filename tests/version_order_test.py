@@ -0,0 +1,99 @@
+import pickle
+
+import pytest
+
+from textureminer import EditionType, Version, VersionKind, VersionType
+
+
+@pytest.mark.parametrize(
+    'version, edition, kind',
+    [
+        ('1.21', EditionType.JAVA, VersionKind.RELEASE),
+        ('26.1.1', EditionType.JAVA, VersionKind.RELEASE),
+        ('24w21a', EditionType.JAVA, VersionKind.SNAPSHOT),
+        ('26.1-snapshot-1', EditionType.JAVA, VersionKind.SNAPSHOT),
+        ('1.21-pre1', EditionType.JAVA, VersionKind.PRE),
+        ('26.1-pre-1', EditionType.JAVA, VersionKind.PRE),
+        ('1.21-rc1', EditionType.JAVA, VersionKind.RC),
+        ('26.1-rc-1', EditionType.JAVA, VersionKind.RC),
+        ('v1.21.0.3', EditionType.BEDROCK, VersionKind.RELEASE),
+        ('1.21.0.3', EditionType.BEDROCK, VersionKind.RELEASE),
+        ('v1.21.0.20-preview', EditionType.BEDROCK, VersionKind.PREVIEW),
+    ],
+)
+def test_version_parse(version: str, edition: EditionType, kind: VersionKind) -> None:
+    parsed = Version(version)
+    assert parsed.edition == edition
+    assert parsed.kind == kind
+    assert parsed.version_type == (
+        VersionType.STABLE if kind == VersionKind.RELEASE else VersionType.EXPERIMENTAL
+    )
+
+
+def test_version_invalid() -> None:
+    with pytest.raises(ValueError, match='Invalid version'):
+        Version('invalid.foo')
+    with pytest.raises(ValueError, match='Invalid version'):
+        Version('24w21a', EditionType.BEDROCK)
+    assert Version.try_parse('invalid.foo') is None
+
+
+def test_version_interned() -> None:
+    assert Version('24w21a') is Version('24w21a')
+    assert Version('1.21.0.3').name == 'v1.21.0.3'
+    assert pickle.loads(pickle.dumps(Version('1.21-rc1'))) is Version('1.21-rc1')
+    with pytest.raises(AttributeError):
+        Version('1.21').name = '1.22'  # type: ignore[misc]
+
+
+def test_version_total_order() -> None:
+    ordered = [
+        '1.20.6',
+        '24w18a',
+        '24w21a',
+        '24w21b',
+        '1.21-pre1',
+        '1.21-pre2',
+        '1.21-rc1',
+        '1.21',
+        '1.21.1',
+        '24w33a',
+        '1.21.2',
+        '25w41a',
+        '1.21.11',
+        '26.1-snapshot-1',
+        '26.1-snapshot-2',
+        '26.1-pre-1',
+        '26.1-rc-1',
+        '26.1',
+        '26.1.1',
+        'v1.21.0.20-preview',
+        'v1.21.0.3',
+        'v1.21.10.20-preview',
+        'v1.21.130.3',
+        'v1.26.0.2',
+    ]
+    versions = [Version(version) for version in ordered]
+    assert sorted(reversed(versions)) == versions
+    assert len(set(versions)) == len(versions)
+    assert Version('1.21') == Version('1.21.0')
+    assert hash(Version('1.21')) == hash(Version('1.21.0'))
+
+
+def test_version_old_snapshot_order() -> None:
+    ordered = [
+        '1.0',
+        '11w47a',
+        '1.1',
+        '1.6.4',
+        '13w36a',
+        '1.7.2',
+        '13w47e',
+        '1.7.4',
+        '1.7.10',
+        '14w02a',
+        '1.8',
+    ]
+    versions = [Version(version) for version in ordered]
+    assert sorted(reversed(versions)) == versions
+    assert Version.try_parse('11w46a') is None
@@ -0,0 +1,130 @@
+import json
+import sys
+from pathlib import Path
+
+import pytest
+import requests  # type: ignore[import]
+
+from textureminer import DEFAULTS, EditionType, Java, VersionType
+from textureminer.watch import Watcher
+
+MANIFEST = {
+    'latest': {'release': '1.21', 'snapshot': '1.21-rc1'},
+    'versions': [
+        {'id': '1.21-rc1', 'type': 'snapshot', 'releaseTime': '2024-06-10T12:30:42+00:00'},
+        {'id': '1.21', 'type': 'release', 'releaseTime': '2024-06-13T08:24:03+00:00'},
+        {'id': '1.20.4', 'type': 'release', 'releaseTime': '2023-12-07T12:56:20+00:00'},
+    ],
+}
+
+
+class FakeResponse:
+    def __init__(self, status_code: int, body: dict | None = None, etag: str = '') -> None:
+        self.status_code = status_code
+        self.body = body
+        self.headers = {'ETag': etag} if etag else {}
+
+    def json(self) -> dict | None:
+        return self.body
+
+    def raise_for_status(self) -> None:
+        pass
+
+
+class FakeManifestServer:
+    """Serves a version manifest and answers conditional requests like Mojang's servers."""
+
+    def __init__(self, manifest: dict) -> None:
+        self.requests: list[dict[str, str]] = []
+        self.set_manifest(manifest)
+
+    def set_manifest(self, manifest: dict) -> None:
+        self.manifest = manifest
+        self.etag = f'"{len(json.dumps(manifest))}"'
+
+    def get(self, _url: str, *, headers: dict[str, str], timeout: int) -> FakeResponse:  # noqa: ARG002
+        self.requests.append(headers)
+        if headers.get('If-None-Match') == self.etag:
+            return FakeResponse(304)
+        return FakeResponse(200, json.loads(json.dumps(self.manifest)), self.etag)
+
+
+@pytest.fixture
+def server(
+    tmp_path: Path,
+    cache_dir: Path,  # noqa: ARG001
+    monkeypatch: pytest.MonkeyPatch,
+) -> FakeManifestServer:
+    monkeypatch.setitem(DEFAULTS, 'TEMP_PATH', tmp_path / 'temp')
+    monkeypatch.setattr(Java, 'version_manifest_cache', None)
+    fake = FakeManifestServer(MANIFEST)
+    monkeypatch.setattr(requests, 'get', fake.get)
+    return fake
+
+
+def _watcher(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> list[str]:
+    extracted: list[str] = []
+
+    def extract(_self: Watcher, _edition: EditionType, version: str) -> Path:
+        extracted.append(version)
+        return tmp_path / 'out' / version
+
+    monkeypatch.setattr(Watcher, 'extract', extract)
+    return extracted
+
+
+def test_watch_extracts_new_versions_once(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, server: FakeManifestServer
+) -> None:
+    extracted = _watcher(tmp_path, monkeypatch)
+    watcher = Watcher(
+        [EditionType.JAVA],
+        [VersionType.STABLE, VersionType.EXPERIMENTAL],
+        tmp_path / 'out',
+        state_path=tmp_path / 'state.json',
+    )
+
+    assert [version for _, version, _ in watcher.poll()] == ['1.21', '1.21-rc1']
+    assert watcher.poll() == []
+    assert server.requests[0] == {}
+    assert server.requests[1] == {'If-None-Match': server.etag}
+
+    server.set_manifest(
+        {
+            'latest': {'release': '1.21', 'snapshot': '24w33a'},
+            'versions': [
+                {'id': '24w33a', 'type': 'snapshot', 'releaseTime': '2024-08-15T12:00:00+00:00'},
+                *MANIFEST['versions'],
+            ],
+        }
+    )
+    assert [version for _, version, _ in watcher.poll()] == ['24w33a']
+    assert extracted == ['1.21', '1.21-rc1', '24w33a']
+
+    state = json.loads((tmp_path / 'state.json').read_text())
+    assert state['java']['processed'] == ['1.21', '1.21-rc1', '24w33a']
+    assert state['java']['validators'] == {'etag': server.etag}
+
+
+def test_watch_runs_hook(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    server: FakeManifestServer,  # noqa: ARG001
+) -> None:
+    _watcher(tmp_path, monkeypatch)
+    log = tmp_path / 'hook.txt'
+    script = (
+        'import os, sys; open(sys.argv[1], "a").write('
+        'os.environ["TEXTUREMINER_VERSION"] + " " + sys.argv[2] + "\\n")'
+    )
+    watcher = Watcher(
+        [EditionType.JAVA],
+        [VersionType.STABLE],
+        tmp_path / 'out',
+        state_path=tmp_path / 'state.json',
+        hook=f'"{sys.executable}" -c \'{script}\' "{log.as_posix()}"',
+    )
+
+    watcher.run()
+
+    assert log.read_text() == f'1.21 {(tmp_path / "out" / "1.21").as_posix()}\n'